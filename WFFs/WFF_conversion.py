@@ -1,6 +1,7 @@
 
 from constants import QuantifierType, OperatorType, UnaryOperator, BinaryOperator, ATOMIC_WFF, UNARY_WFF, BINARY_WFF, QUANTIFIER_WFF
-from constants import UNARY_OPERATORS, BINARY_OPERATORS, UNIVERSAL_Q, EXISTENTIAL_Q, AND, OR, NOT, IMPLIES
+from constants import UNARY_OPERATORS, BINARY_OPERATORS, UNIVERSAL_Q, EXISTENTIAL_Q, AND, OR, NOT, IMPLIES, XOR
+from constants import AUTO_ENCODING, DIRECT_ENCODING, DEFINITIONAL_ENCODING, DIRECT_CLAUSE_LIMIT, DEFINITION_PREFIX
 
 from WFFs.strictWFFs import StrictWFF
 from WFFs.cnfWFFs import CnfWFF
@@ -12,35 +13,159 @@ from WFFs.cnfWFFs import CnfWFF
 
 # === Converting Strict WFFs --> CNF WFFS=== #
 
-def strict_to_cnf(wff: StrictWFF) -> CnfWFF:
+def strict_to_cnf(wff: StrictWFF, metrics=None, max_clauses=None,
+                  encoding: str = AUTO_ENCODING, direct_clause_limit: int = DIRECT_CLAUSE_LIMIT,
+                  definition_prefix: str = DEFINITION_PREFIX) -> CnfWFF:
     """
-    Converts a StrictWFF into CNF form:
+    Converts a quantifier-free StrictWFF into CNF.
+
+    encoding:
+      "direct"        distribute ∨ over ∧ (see `direct_to_cnf`); equivalent, possibly exponential
+      "definitional"  Tseitin encoding (see `definitional_clauses`); equisatisfiable, linear
+      "auto"          per top-level conjunct: direct when its exact clause count is at most
+                      `direct_clause_limit`, definitional otherwise
+    Definitional variables are named `<definition_prefix><n>`.
+    Pass an instrumentation.Metrics to time each step.
+    With `max_clauses`, raises cnf_diagnostics.CnfBlowupError before converting
+    if the result would have more clauses than that.
+    """
+    from instrumentation import stage
+    from cnf_diagnostics import check_ceiling, conjuncts, choose_encoding
+
+    if max_clauses is not None:
+        check_ceiling(wff, max_clauses, encoding=encoding, limit=direct_clause_limit)
+
+    if encoding == DIRECT_ENCODING:
+        return direct_to_cnf(wff, metrics)
+
+    with stage(metrics, "cnf.route"):
+        direct, definitional = [], []
+        for conjunct, _ in conjuncts(wff):
+            if choose_encoding(conjunct, encoding=encoding, limit=direct_clause_limit) == DIRECT_ENCODING:
+                direct.append(conjunct)
+            else:
+                definitional.append(conjunct)
+    if metrics is not None:
+        metrics.add_counts({"direct_conjuncts": len(direct), "definitional_conjuncts": len(definitional)})
+
+    # Nothing large: convert as one formula, exactly as the direct encoding would
+    if not definitional:
+        return direct_to_cnf(wff, metrics)
+
+    clauses = []
+    if direct:
+        clauses.extend(direct_to_cnf(_conjoin(direct), metrics).get_clauses())
+    with stage(metrics, "cnf.definitional"):
+        clauses.extend(definitional_clauses(definitional, definition_prefix))
+    return clauses_to_cnf(clauses)
+
+
+def direct_to_cnf(wff: StrictWFF, metrics=None) -> CnfWFF:
+    """
+    Converts a StrictWFF into CNF by rewriting:
     1. Eliminate →
     2. Eliminate ⊕
     3. Eliminate double negations
     4. Push negations inward (De Morgan)
     5. Distribute OR over AND
     """
+    from instrumentation import stage
+
     # --- Normalize before CNF ---
-    wff = eliminate_implications(wff)
-    wff = eliminate_xor(wff)
-    wff = eliminate_double_negation(wff)
-    wff = demorgans(wff)  # push negations inside first
-    wff = distribute_or_over_and(wff)
+    with stage(metrics, "cnf.eliminate_implications"):
+        wff = eliminate_implications(wff)
+    with stage(metrics, "cnf.eliminate_xor"):
+        wff = eliminate_xor(wff)
+    with stage(metrics, "cnf.eliminate_double_negation"):
+        wff = eliminate_double_negation(wff)
+    with stage(metrics, "cnf.demorgans"):
+        wff = demorgans(wff)  # push negations inside first
+    with stage(metrics, "cnf.distribute"):
+        wff = distribute_or_over_and(wff)
 
     # --- Convert to CNF WFF ---
-    cnf_wff = convert_to_cnf_wff(wff)
-    cnf_wff = _normalize_cnf_negations(cnf_wff)
-    if cnf_wff.operator == AND:
-        cnf_wff = CnfWFF(operator=AND, operands=cnf_wff.flatten_conjunctions())
-
-    # --- Extra normalization: ensure all negations are on atoms ---
-    if cnf_wff.type not in ("atomic_wff",):
-        # recursively push negations in CNF too
+    with stage(metrics, "cnf.convert"):
+        cnf_wff = convert_to_cnf_wff(wff)
         cnf_wff = _normalize_cnf_negations(cnf_wff)
+        if cnf_wff.operator == AND:
+            cnf_wff = CnfWFF(operator=AND, operands=cnf_wff.flatten_conjunctions())
+
+        # --- Extra normalization: ensure all negations are on atoms ---
+        if cnf_wff.type not in ("atomic_wff",):
+            # recursively push negations in CNF too
+            cnf_wff = _normalize_cnf_negations(cnf_wff)
 
     return cnf_wff
 
+
+# === Definitional (Tseitin) encoding === #
+
+def definitional_clauses(wffs: list[StrictWFF], prefix: str = DEFINITION_PREFIX) -> list[list[str]]:
+    """
+    Tseitin-encodes the conjunction of `wffs` as clauses of literal strings.
+    Every binary connective gets a fresh variable `<prefix><n>` defined equivalent
+    to it (3 clauses, 4 for ⊕), and each wff is asserted by a unit clause, so the
+    result is linear in the formula size and satisfiable iff the wffs are.
+    Shared (or structurally equal frozen) subformulas are defined once.
+    """
+    clauses: list[list[str]] = []
+    definitions: dict = {}
+
+    def define(wff: StrictWFF) -> str:
+        if wff.type == ATOMIC_WFF:
+            return wff.atom
+        if wff in definitions:
+            return definitions[wff]
+        if wff.type == UNARY_WFF:
+            literal = _negate_literal(define(wff.operand1))
+        elif wff.type == BINARY_WFF:
+            a, b = define(wff.operand1), define(wff.operand2)
+            literal = f"{prefix}{len(definitions) + 1}"
+            clauses.extend(_definition(literal, wff.operator, a, b))
+        else:
+            raise ValueError(f"Cannot encode {wff.type} definitionally; expand quantifiers first.")
+        definitions[wff] = literal
+        return literal
+
+    for wff in wffs:
+        clauses.append([define(wff)])
+    return clauses
+
+
+def _definition(d: str, operator: str, a: str, b: str) -> list[list[str]]:
+    """Clauses for d ↔ (a operator b)."""
+    na, nb, nd = _negate_literal(a), _negate_literal(b), _negate_literal(d)
+    if operator == AND:
+        return [[nd, a], [nd, b], [d, na, nb]]
+    if operator == OR:
+        return [[nd, a, b], [d, na], [d, nb]]
+    if operator == IMPLIES:
+        return [[nd, na, b], [d, a], [d, nb]]
+    if operator == XOR:
+        return [[nd, a, b], [nd, na, nb], [d, na, b], [d, a, nb]]
+    raise ValueError(f"Unexpected binary operator in definitional encoding: {operator}")
+
+
+def _negate_literal(literal: str) -> str:
+    return literal[len(NOT):] if literal.startswith(NOT) else f"{NOT}{literal}"
+
+
+def clauses_to_cnf(clauses: list[list[str]]) -> CnfWFF:
+    """Builds a CnfWFF from clauses of literal strings ("P" or "~P")."""
+    def literal_node(literal: str) -> CnfWFF:
+        if literal.startswith(NOT):
+            return CnfWFF(operator=NOT, operands=[CnfWFF(atom=literal[len(NOT):])])
+        return CnfWFF(atom=literal)
+
+    nodes = [literal_node(c[0]) if len(c) == 1 else CnfWFF(operator=OR, operands=[literal_node(l) for l in c])
+             for c in clauses]
+    return nodes[0] if len(nodes) == 1 else CnfWFF(operator=AND, operands=nodes)
+
+
+def _conjoin(wffs: list[StrictWFF]) -> StrictWFF:
+    from WFFs.strictWFFs import list_to_StrictWFF
+    return list_to_StrictWFF(wffs, AND)
+
 def convert_to_cnf_wff(wff: StrictWFF) -> CnfWFF:
     """
     Converts a StrictWFF into CNF form.
@@ -136,16 +136,36 @@ class CnfWFF:
             assert self.operands[0].type == ATOMIC_WFF, "Negation must apply only to atomic literal."
 
     def __repr__(self) -> str:
-        if self.type == ATOMIC_WFF:
-            return self.atom
-        elif self.type == UNARY_WFF:
-            return f"{NOT}{repr(self.operands[0])}"
-        elif self.type == DISJUNCTIVE_WFF:
-            return "(" + " ∨ ".join(repr(op) for op in self.operands) + ")"
-        elif self.type == CONJUNCTIVE_WFF:
-            return "(" + " ∧ ".join(repr(op) for op in self.operands) + ")"
-        else:
-            TypeError (f"CNF WFF has type {self.type}")
+        return self._serialize(" ∨ ", " ∧ ")
+
+    def canonical_text(self) -> str:
+        """Compact text for hashing and cache keys: the repr without spaces, e.g. "((Pa∨~Qa)∧Rb)"."""
+        return self._serialize("∨", "∧")
+
+    def _serialize(self, or_separator: str, and_separator: str) -> str:
+        """Writes this CNF into a single buffer, walking it with an explicit stack."""
+        out = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                out.append(node)
+            elif node.type == ATOMIC_WFF:
+                out.append(node.atom)
+            elif node.type == UNARY_WFF:
+                out.append(NOT)
+                stack.append(node.operands[0])
+            elif node.type in (DISJUNCTIVE_WFF, CONJUNCTIVE_WFF):
+                separator = or_separator if node.type == DISJUNCTIVE_WFF else and_separator
+                out.append("(")
+                stack.append(")")
+                for i, op in enumerate(reversed(node.operands)):
+                    if i:
+                        stack.append(separator)
+                    stack.append(op)
+            else:
+                raise TypeError(f"CNF WFF has type {node.type}")
+        return "".join(out)
 
     # ==========================================================
     # --- CNF Utilities ---
@@ -2,17 +2,26 @@
 A Type of WFF where 
 - Any operator is allowed
 - WFFs must be binary, unary, atomic, or have a quantifier
+- Symbols are a letter followed by optional digits (P, P2, a, a13): an atom is
+  a predicate symbol (uppercase) followed by its term symbols (lowercase)
 '''
 
 # from __future__ import annotations
 from typing import Optional, Literal, Union
 
+import re
 from copy import deepcopy
+from functools import lru_cache
 
 from constants import QuantifierType, OperatorType, UnaryOperator, BinaryOperator, ATOMIC_WFF, UNARY_WFF, BINARY_WFF, QUANTIFIER_WFF
 from constants import UNARY_OPERATORS, BINARY_OPERATORS, UNIVERSAL_Q, EXISTENTIAL_Q, AND, OR, NOT, IMPLIES, XOR
 
 
+SYMBOL_PATTERN = re.compile(r"[A-Za-z][0-9]*")
+TERM_PATTERN = re.compile(r"[a-z][0-9]*")
+PREDICATE_PATTERN = re.compile(r"[A-Z]+[0-9]*")
+
+
 
 class StrictWFF: pass
 class StrictWFF:
@@ -37,34 +46,15 @@ class StrictWFF:
         self.type = self.assign_and_enforce_type()
         
     def __repr__(self) -> str:
-            """
-            Returns a readable, recursive string representation of this WFF.
-            Handles all four WFF types: atomic, unary, binary, quantified.
-            """
-
-            # assert self.type in [ATOMIC_WFF, UNARY_WFF, BINARY_WFF, QUANTIFIER_WFF], f"Strict WFF has unknown type={self.type}"
-
-            # --- Atomic ---
-            if self.type == ATOMIC_WFF:
-                return self.atom or "EMPTY_ATOM_ERROR"
-
-            # --- Unary ---
-            elif self.type == UNARY_WFF:
-                # ensure proper parentheses for clarity
-                return f"({self.operator}{repr(self.operand1)})"
-
-            # --- Binary ---
-            elif self.type == BINARY_WFF:
-                # fully parenthesized infix representation
-                return f"({repr(self.operand1)} {self.operator} {repr(self.operand2)})"
-
-            # --- Quantified ---
-            elif self.type == QUANTIFIER_WFF:
-                quant, var = self.quantifier
-                return f"{quant}{var}({repr(self.operand1)})"
+        """
+        Readable, fully parenthesized text of this WFF, e.g. "∀x((Px → (~Qx)))".
+        Built iteratively into one buffer (see `serialize`).
+        """
+        return serialize(self)
 
-            # --- Unknown ---
-            return "error"
+    def canonical_text(self) -> str:
+        """Compact canonical text for hashing and cache keys, e.g. "∀x((Px→~Qx))" (see `serialize`)."""
+        return serialize(self, compact=True)
 
     def assign_and_enforce_type(self):
         """
@@ -114,7 +104,7 @@ class StrictWFF:
             return self.domain
 
         if self.type == ATOMIC_WFF:
-            return only_lowercase(repr(self))
+            return atom_terms(self.atom)
 
         domains = []
         if self.operand1:
@@ -123,7 +113,55 @@ class StrictWFF:
             domains += self.operand2.get_domain()
 
         return list(set(domains))
-    
+
+    def has_quantifiers(self) -> bool:
+        """True if any subformula is quantified (i.e. grounding would change this WFF)."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.type == QUANTIFIER_WFF:
+                return True
+            stack.extend(op for op in (node.operand1, node.operand2) if op)
+        return False
+
+    def get_predicates(self) -> set[str]:
+        """Collects the predicate symbols (uppercase heads of atoms) in this WFF."""
+        return set(self.get_predicate_polarities().keys())
+
+    def get_predicate_polarities(self, positive: bool = True) -> dict[str, set[bool]]:
+        """
+        Maps each predicate symbol to the polarities it occurs with
+        (True = positive, False = negated), as it would after pushing
+        negations inward. Implication antecedents flip polarity,
+        both sides of ⊕ occur with both polarities.
+        """
+        if self.type == ATOMIC_WFF:
+            return {atom_predicate(self.atom): {positive}}
+
+        if self.type == UNARY_WFF:
+            return self.operand1.get_predicate_polarities(not positive)
+
+        if self.type == QUANTIFIER_WFF:
+            return self.operand1.get_predicate_polarities(positive)
+
+        if self.operator == IMPLIES:
+            parts = [self.operand1.get_predicate_polarities(not positive),
+                     self.operand2.get_predicate_polarities(positive)]
+        elif self.operator == XOR:
+            parts = [self.operand1.get_predicate_polarities(True),
+                     self.operand1.get_predicate_polarities(False),
+                     self.operand2.get_predicate_polarities(True),
+                     self.operand2.get_predicate_polarities(False)]
+        else:
+            parts = [self.operand1.get_predicate_polarities(positive),
+                     self.operand2.get_predicate_polarities(positive)]
+
+        polarities = {}
+        for part in parts:
+            for pred, signs in part.items():
+                polarities.setdefault(pred, set()).update(signs)
+        return polarities
+
     def expand_quantifiers(self, domain: list[str]) -> "StrictWFF":
         """
         Recursively expands all quantifiers (∀, ∃) in this WFF into
@@ -174,11 +212,54 @@ class StrictWFF:
 
         return self
 
+    def expanded(self, domain: list[str]) -> "StrictWFF":
+        """
+        Non-mutating version of `expand_quantifiers`.
+        Returns a new WFF with every quantifier expanded over the domain;
+        subtrees without quantifiers are shared with this WFF, not copied.
+        """
+        if self.type == ATOMIC_WFF:
+            return self
+
+        operand1 = self.operand1.expanded(domain)
+        operand2 = self.operand2.expanded(domain) if self.operand2 else None
+
+        if self.type != QUANTIFIER_WFF:
+            if operand1 is self.operand1 and operand2 is self.operand2:
+                return self
+            return type(self)(operator=self.operator, operand1=operand1, operand2=operand2)
+
+        symbol, variable = self.quantifier
+
+        if symbol == UNIVERSAL_Q:
+            join_op = AND
+        elif symbol == EXISTENTIAL_Q:
+            join_op = OR
+        else:
+            raise ValueError(f"Unknown quantifier: {symbol}")
+
+        new_wffs = [operand1.substituted(variable, const) for const in domain if const != variable]
+        return list_to_StrictWFF(new_wffs, join_op, cls=type(self))
+
+    def substituted(self, to_replace: str, replacer: str) -> "StrictWFF":
+        """Non-mutating version of `replace`. Unchanged subtrees are shared."""
+        if self.type == ATOMIC_WFF:
+            if self.atom and to_replace in self.atom:
+                return type(self)(atom=substitute_term(self.atom, to_replace, replacer))
+            return self
+
+        operand1 = self.operand1.substituted(to_replace, replacer)
+        operand2 = self.operand2.substituted(to_replace, replacer) if self.operand2 else None
+        if operand1 is self.operand1 and operand2 is self.operand2:
+            return self
+        return type(self)(operator=self.operator, operand1=operand1,
+                          operand2=operand2, quantifier=self.quantifier)
+
     def replace(self, to_replace, replacer):
         """Recursively replace variable names in atomic strings."""
         if self.type == ATOMIC_WFF:
             if self.atom and to_replace in self.atom:
-                self.atom = self.atom.replace(to_replace, replacer)
+                self.atom = substitute_term(self.atom, to_replace, replacer)
 
         elif self.type == UNARY_WFF:
             if self.operand1:
@@ -196,7 +277,7 @@ class StrictWFF:
 
             
 
-def list_to_StrictWFF(wff_list: list[StrictWFF], operator: str) -> StrictWFF:
+def list_to_StrictWFF(wff_list: list[StrictWFF], operator: str, cls: type = StrictWFF) -> StrictWFF:
         """
         Given a list of WFFs and a binary operator, 
         joins them recursively into a single StrictWFF tree.
@@ -207,8 +288,131 @@ def list_to_StrictWFF(wff_list: list[StrictWFF], operator: str) -> StrictWFF:
             return wff_list[0]
 
         head = wff_list[0]
-        rest = list_to_StrictWFF(wff_list[1:], operator)
-        return StrictWFF(operator=operator, operand1=head, operand2=rest)
+        rest = list_to_StrictWFF(wff_list[1:], operator, cls)
+        return cls(operator=operator, operand1=head, operand2=rest)
+
+
+class FrozenStrictWFF(StrictWFF):
+    """
+    An immutable StrictWFF.
+
+    - Attributes cannot be reassigned after construction.
+    - `expand_quantifiers` and `replace` return new nodes instead of mutating,
+      reusing unchanged subtrees, so frozen trees can be cached and shared
+      between arguments and threads.
+    - Equality and hashing are structural (on the compact canonical text).
+    - repr and canonical_text are computed once per node they are called on.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        object.__setattr__(self, "_frozen", True)
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"FrozenStrictWFF is immutable (tried to set '{name}').")
+        object.__setattr__(self, name, value)
+
+    def expand_quantifiers(self, domain: list[str]) -> "FrozenStrictWFF":
+        return self.expanded(domain)
+
+    def replace(self, to_replace, replacer) -> "FrozenStrictWFF":
+        return self.substituted(to_replace, replacer)
+
+    def __repr__(self) -> str:
+        text = self.__dict__.get("_cached_repr")
+        if text is None:
+            text = serialize(self)
+            object.__setattr__(self, "_cached_repr", text)
+        return text
+
+    def canonical_text(self) -> str:
+        text = self.__dict__.get("_cached_text")
+        if text is None:
+            text = serialize(self, compact=True)
+            object.__setattr__(self, "_cached_text", text)
+        return text
+
+    def _key(self) -> str:
+        return self.canonical_text()
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, FrozenStrictWFF):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        h = self.__dict__.get("_cached_hash")
+        if h is None:
+            h = hash(self._key())
+            object.__setattr__(self, "_cached_hash", h)
+        return h
+
+
+def freeze(wff: Optional[StrictWFF]) -> Optional[FrozenStrictWFF]:
+    """Returns an immutable copy of a StrictWFF tree (frozen trees are returned as-is)."""
+    if wff is None or isinstance(wff, FrozenStrictWFF):
+        return wff
+    return FrozenStrictWFF(atom=wff.atom, operator=wff.operator,
+                           operand1=freeze(wff.operand1), operand2=freeze(wff.operand2),
+                           quantifier=wff.quantifier)
+
+
+# ==== Serialization ==== #
+
+def serialize(wff: StrictWFF, compact: bool = False) -> str:
+    """
+    Writes a WFF as text into a single buffer, walking the tree with an explicit
+    stack, so deep chains cost linear time and never hit the recursion limit.
+    Frozen subtrees whose text an earlier call cached are copied in as-is.
+
+    compact=False: the readable __repr__ form, "((~Pa) ∧ ∀x(Qx))"
+    compact=True:  the canonical form, "(~Pa∧∀x(Qx))": no spaces and no parentheses
+                   around negations. Still one text per tree, and string_to_WFF reads it back.
+    """
+    cache_name = "_cached_text" if compact else "_cached_repr"
+    out = []
+    stack = [wff]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            out.append(node)
+            continue
+        cached = node.__dict__.get(cache_name)
+        if cached is not None:
+            out.append(cached)
+
+        elif node.type == ATOMIC_WFF:
+            out.append(node.atom or "EMPTY_ATOM_ERROR")
+
+        elif node.type == UNARY_WFF:
+            if compact:
+                out.append(node.operator)
+            else:
+                out.append("(" + node.operator)
+                stack.append(")")
+            stack.append(node.operand1)
+
+        elif node.type == BINARY_WFF:
+            out.append("(")
+            stack.extend((")", node.operand2, node.operator if compact else f" {node.operator} ", node.operand1))
+
+        elif node.type == QUANTIFIER_WFF:
+            quant, var = node.quantifier
+            out.append(f"{quant}{var}(")
+            stack.extend((")", node.operand1))
+
+        else:
+            out.append("error")
+    return "".join(out)
+
+
+@lru_cache(maxsize=4096)
+def string_to_frozen_WFF(s: str) -> Optional[FrozenStrictWFF]:
+    """Cached parse of a formula string into a shared, immutable WFF."""
+    return freeze(string_to_WFF(s))
 
 # ==== String Parsing Helper Functions ==== #
 
@@ -216,19 +420,95 @@ def string_to_WFF(s: str) -> StrictWFF:
     """
     Parse a logical formula string into a StrictWFF.
     Supports quantifiers, unary and binary operators, and atomic propositions.
+
+    Well-formed input is parsed in linear time over index ranges of the string.
+    Strings with brackets or unbalanced parentheses go through the original
+    substring-based parser, which gives the same trees on well-formed input.
     """
     if not is_valid_wff_string(s): return None
 
+    s = s.replace(" ", "")
+    match = _match_parentheses(s)
+    if match is None:
+        return _string_to_WFF_by_substrings(s)
+    return _parse_range(s, 0, len(s), match)
+
+
+def _match_parentheses(s: str) -> Optional[dict]:
+    """Maps each '(' index to its ')' index, or None if the string has brackets or is unbalanced."""
+    match, stack = {}, []
+    for i, ch in enumerate(s):
+        if ch == "(":
+            stack.append(i)
+        elif ch == ")":
+            if not stack:
+                return None
+            match[stack.pop()] = i
+        elif ch in "[]":
+            return None
+    return None if stack else match
+
+
+def _parse_range(s: str, lo: int, hi: int, match: dict) -> StrictWFF:
+    """Parses s[lo:hi] without copying substrings (see string_to_WFF)."""
+    # --- Strip one layer of wrapping parentheses ---
+    if hi > lo and s[lo] == "(" and match[lo] == hi - 1:
+        lo, hi = lo + 1, hi - 1
+    if lo >= hi:
+        raise ValueError("Cannot parse empty string into WFF.")
+
+    # --- Handle quantifier (body stripped once here and once when parsed) ---
+    if hi - lo >= 2 and s[lo] in ("∀", "∃") and s[lo + 1].isalpha():
+        body_lo = _symbol_end(s, lo + 1, hi)
+        quant = (s[lo], s[lo + 1:body_lo])
+        body_hi = hi
+        if body_hi > body_lo and s[body_lo] == "(" and match[body_lo] == body_hi - 1:
+            body_lo, body_hi = body_lo + 1, body_hi - 1
+        return StrictWFF(quantifier=quant, operand1=_parse_range(s, body_lo, body_hi, match))
+
+    # --- Find main operator: first binary operator at depth 0, else a unary one ---
+    i, unary_at = lo, None
+    while i < hi:
+        ch = s[i]
+        if ch == "(":
+            i = match[i] + 1
+            continue
+        if ch in BINARY_OPERATORS:
+            return StrictWFF(
+                operator=ch,
+                operand1=_parse_range(s, lo, i, match),
+                operand2=_parse_range(s, i + 1, hi, match),
+            )
+        if ch in UNARY_OPERATORS and unary_at is None:
+            unary_at = i
+        i += 1
+
+    # --- Atomic ---
+    if unary_at is None:
+        return StrictWFF(atom=s[lo:hi])
+
+    # --- Unary (operand starts after the first '~', as in the substring parser) ---
+    idx = s.find(NOT, lo, hi)
+    if idx != unary_at:
+        return _string_to_WFF_by_substrings(s[lo:hi])
+    return StrictWFF(operator=NOT, operand1=_parse_range(s, idx + 1, hi, match))
+
+
+def _string_to_WFF_by_substrings(s: str) -> StrictWFF:
+    """The original recursive parser; copies a substring at every level."""
+    if not is_valid_wff_string(s): return None
+
     s = strip_outer_parentheses(s.replace(" ", ""))
     if not s:
         raise ValueError("Cannot parse empty string into WFF.")
 
     # --- Handle quantifier ---
     if len(s) >= 2 and s[0] in ("∀", "∃") and s[1].isalpha():
-        quant = (s[0], s[1])  # e.g. ('∀', 'x')
-        body_str = s[2:]
+        end = _symbol_end(s, 1, len(s))
+        quant = (s[0], s[1:end])  # e.g. ('∀', 'x')
+        body_str = s[end:]
         body_str = strip_outer_parentheses(body_str)
-        return StrictWFF(quantifier=quant, operand1=string_to_WFF(body_str))
+        return StrictWFF(quantifier=quant, operand1=_string_to_WFF_by_substrings(body_str))
 
     # --- Find main operator ---
     main_op = find_main_operator(s)
@@ -241,7 +521,7 @@ def string_to_WFF(s: str) -> StrictWFF:
     if main_op in {f"{NOT}"}:
         idx = s.index(main_op)
         operand_str = s[idx + 1:]
-        return StrictWFF(operator=main_op, operand1=string_to_WFF(operand_str))
+        return StrictWFF(operator=main_op, operand1=_string_to_WFF_by_substrings(operand_str))
 
     # --- Binary ---
     # Find operator index at depth 0 (important for nested parentheses)
@@ -256,8 +536,8 @@ def string_to_WFF(s: str) -> StrictWFF:
             right_str = s[i + 1:]
             return StrictWFF(
                 operator=main_op,
-                operand1=string_to_WFF(left_str),
-                operand2=string_to_WFF(right_str),
+                operand1=_string_to_WFF_by_substrings(left_str),
+                operand2=_string_to_WFF_by_substrings(right_str),
             )
 
     # If we somehow didn’t return earlier:
@@ -316,7 +596,7 @@ def find_main_operator(s: str) -> Optional[str]:
 def is_valid_wff_string(s: str) -> bool:
     """
     Checks whether a string contains only allowed characters:
-      - Alphabetical (predicates, variables, constants)
+      - Alphanumeric (predicates, variables, constants and their digit suffixes)
       - Parentheses, spaces
       - Recognized logical operators from `constants`
     
@@ -333,7 +613,7 @@ def is_valid_wff_string(s: str) -> bool:
     s = s.replace("¬", '~', -1)
 
     for ch in s:
-        if ch.isalpha():
+        if ch.isalpha() or ch.isdigit():
             continue
         if ch in allowed_symbols:
             continue
@@ -342,6 +622,44 @@ def is_valid_wff_string(s: str) -> bool:
 
 # === Random Helpers === #
 
+def symbol_names(letters: str):
+    """Unbounded symbol supply: each letter, then each letter with suffix 1, 2, ..."""
+    yield from letters
+    suffix = 1
+    while True:
+        for letter in letters:
+            yield f"{letter}{suffix}"
+        suffix += 1
+
+
+def _symbol_end(s: str, start: int, hi: int) -> int:
+    """Index just past the symbol starting at s[start] (a letter, then any digits)."""
+    end = start + 1
+    while end < hi and s[end].isdigit():
+        end += 1
+    return end
+
+
+def atom_predicate(atom: str) -> str:
+    """Returns the predicate symbol of an atom, e.g. 'Pab' -> 'P', 'P2a1' -> 'P2'. Propositional atoms are their own predicate."""
+    match = PREDICATE_PATTERN.match(atom)
+    return match.group() if match else atom
+
+
+def atom_terms(atom: str) -> list[str]:
+    """Returns the term symbols of an atom, e.g. 'Pab' -> ['a', 'b'], 'P2a1b' -> ['a1', 'b']."""
+    if atom.isalpha():
+        return [ch for ch in atom if ch.islower()]
+    return TERM_PATTERN.findall(atom)
+
+
+def substitute_term(atom: str, to_replace: str, replacer: str) -> str:
+    """Replaces every whole term symbol `to_replace` of an atom by `replacer` ('Pa1a', 'a', 'b' -> 'Pa1b')."""
+    if atom.isalpha() and len(to_replace) == 1:
+        return atom.replace(to_replace, replacer)
+    return TERM_PATTERN.sub(lambda m: replacer if m.group() == to_replace else m.group(), atom)
+
+
 def only_lowercase(str):
     result = ""
     for char in str:
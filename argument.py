@@ -3,14 +3,20 @@ A class for arguments, the main class interacted with from users
 '''
 
 # argument.py
-from typing import List, Union
-from WFFs.strictWFFs import StrictWFF, string_to_WFF, list_to_StrictWFF
+from typing import List, Optional, Union
+from WFFs.strictWFFs import StrictWFF, FrozenStrictWFF, string_to_WFF, string_to_frozen_WFF, list_to_StrictWFF, freeze
 from WFFs.cnfWFFs import CnfWFF
-from WFFs.WFF_conversion import strict_to_cnf
+from WFFs.WFF_conversion import strict_to_cnf, clauses_to_cnf
 from sat_solving import solve_argument
+from formula_cache import ground_premise, premise_clauses
+from relevance import filter_relevant_premises
+from instrumentation import Metrics, MetricsSink, stage, count_nodes
+from cnf_diagnostics import CnfBlowupError, check_ceiling, diagnose
+from structured_logging import get_logger, lazy
 
-from constants import AND, NOT
+from constants import AND, NOT, AUTO_ENCODING, DIRECT_CLAUSE_LIMIT
 
+logger = get_logger("argument")
 
 
 from typing import List, Union
@@ -20,6 +26,10 @@ from WFFs.cnfWFFs import CnfWFF
 from sat_solving import solve_argument
 
 
+def _format_clauses(cnf: CnfWFF) -> str:
+    return "\n".join(f"  {clause}" for clause in cnf.get_clauses())
+
+
 class Argument:
     """
     Represents a logical argument (premises ⊢ conclusion) in StrictWFF form.
@@ -27,43 +37,99 @@ class Argument:
     - Always built from StrictWFFs or strings (never CNFs).
     - Saves a negated copy of the conclusion before CNF conversion.
     - CNF conversion happens via `.to_cnf()` and returns a CNFArgument.
+    - Premises disconnected from the conclusion (and trivially satisfiable)
+      are left out of the validity WFF unless `filter_premises=False`.
+    - All WFFs are FrozenStrictWFFs: grounding and CNF conversion build new
+      trees, so parsed premises can be cached and shared between arguments.
+    - With `instrument=True` (or a `sink`), stage timings, node/clause counts and
+      solver stats are collected in `self.metrics`; the sink receives them after `solve`.
+    - With `max_clauses`, grounding and CNF conversion raise CnfBlowupError (carrying a
+      ranked cnf_diagnostics.BlowupReport) as soon as the CNF size estimate exceeds it.
+    - `encoding` picks the CNF encoding (see WFF_conversion.strict_to_cnf); by default each
+      premise is distributed directly unless that would exceed `direct_clause_limit` clauses,
+      in which case it is encoded definitionally.
+    - With `cache=True` (the default) premises are grounded and converted one at a time
+      through formula_cache, so premises shared between arguments are only done once;
+      the CNF is the cached premise blocks plus the negated conclusion's clauses.
+    - Propositional arguments (no quantifiers) need no domain: grounding leaves them as they are.
     """
 
-    def __init__(self, premises: List[Union[str, StrictWFF]], conclusion: Union[str, StrictWFF]):
+    def __init__(self, premises: List[Union[str, StrictWFF]], conclusion: Union[str, StrictWFF],
+                 filter_premises: bool = True, instrument: bool = False,
+                 sink: Optional[MetricsSink] = None, label: Optional[str] = None,
+                 max_clauses: Optional[int] = None, encoding: str = AUTO_ENCODING,
+                 direct_clause_limit: int = DIRECT_CLAUSE_LIMIT, cache: bool = True):
         if not premises:
             raise ValueError("Argument must have at least one premise.")
         
         self._solvable = True
+        self.sink = sink
+        self.max_clauses = max_clauses
+        self.encoding = encoding
+        self.direct_clause_limit = direct_clause_limit
+        self.cache = cache
+        self._grounding_domain: Optional[List[str]] = None
+        self.metrics: Optional[Metrics] = Metrics(label) if (instrument or sink is not None) else None
 
         # --- Always normalize to StrictWFFs ---
-        self.premises: List[StrictWFF] = [self._normalize_to_strict(p) for p in premises]
-        self.conclusion: StrictWFF = self._normalize_to_strict(conclusion)
+        with stage(self.metrics, "parse"):
+            self.premises: List[StrictWFF] = [self._normalize_to_strict(p) for p in premises]
+            self.conclusion: StrictWFF = self._normalize_to_strict(conclusion)
 
         # --- Save negated conclusion (in strict form) ---
-        self.negated_conclusion_strict: StrictWFF = StrictWFF(operator=NOT, operand1=self.conclusion)
+        self.negated_conclusion_strict: StrictWFF = FrozenStrictWFF(operator=NOT, operand1=self.conclusion)
 
         # --- Validity WFF: P {AND} {NOT} C
-        premises_WFF = list_to_StrictWFF(self.premises, AND)
-        self.validity_wff = StrictWFF(operator=AND, operand1=premises_WFF, operand2=self.negated_conclusion_strict)
+        self.validity_wff = self._build_validity_wff(self.premises)
+        self._cnf_cache = None
 
         self._form_type = "strict"
 
-        self.domain = self.validity_wff.get_domain()
+        # Domain comes from the full argument so filtering never changes the grounding;
+        # sorted, so arguments over the same constants share cached grounded premises
+        self.domain = sorted(self.validity_wff.get_domain())
+        self.quantified = self.validity_wff.has_quantifiers()
+
+        # --- Drop irrelevant premises before grounding ---
+        self.relevant_premises: List[StrictWFF] = self.premises
+        self.dropped_premises: List[StrictWFF] = []
+        if filter_premises and self._solvable:
+            with stage(self.metrics, "filter"):
+                self.relevant_premises, self.dropped_premises = filter_relevant_premises(
+                    self.premises, self.negated_conclusion_strict)
+                if self.dropped_premises:
+                    self.validity_wff = self._build_validity_wff(self.relevant_premises)
+            if self.metrics is not None:
+                self.metrics.counts["premises"] = len(self.premises)
+                self.metrics.counts["dropped_premises"] = len(self.dropped_premises)
     
     def solvable(self):
-        if len(self.domain) <= 1: return False
+        if self.quantified and len(self.domain) <= 1: return False
         return self._solvable
 
     # ==========================================================
     # --- Solving Interface ---
     # ==========================================================
 
-    def solve(self) -> tuple[bool, dict]:
+    def solve(self, token=None) -> tuple[bool, dict]:
         """
         Converts to CNF and checks argument validity using SAT.
+        An optional sat_solving.CancelToken makes the solve interruptible.
         """
         cnf_argument = self.to_cnf()
-        return solve_argument(cnf_argument)
+        with stage(self.metrics, "solve"):
+            result = solve_argument(cnf_argument, token, self.metrics)
+        if self.sink is not None:
+            self.sink.emit(self.metrics)
+        return result
+
+    async def solve_async(self, executor=None) -> tuple[bool, dict]:
+        """
+        Grounds and solves without blocking the event loop (see async_solving).
+        Cancelling the awaiting task interrupts the solver.
+        """
+        from async_solving import solve_async
+        return await solve_async(self, executor)
 
     # ==========================================================
     # --- Conversion and Expansion ---
@@ -72,35 +138,101 @@ class Argument:
     def expand_quantifiers(self) -> None:
         """
         Expands all quantifiers of the validity argument.
-        Operates in place).
+        Replaces `validity_wff` with a new grounded tree; premises are left untouched.
         """
-        
+        if not self.quantified:
+            return
+
         assert len(self.domain) > 1, f"Can't expand argument with no atoms in domain: domain = {self.domain}"
 
-        self.validity_wff.expand_quantifiers(self.domain)
+        self._check_blowup(self.domain)
+        if self.metrics is not None:
+            self.metrics.counts["domain_size"] = len(self.domain)
+            self.metrics.counts["nodes_before_grounding"] = count_nodes(self.validity_wff)
+        with stage(self.metrics, "expand"):
+            if self.cache:
+                grounded = [ground_premise(p, self.domain) for p in self.relevant_premises]
+                self.validity_wff = self._build_validity_wff(
+                    grounded, ground_premise(self.negated_conclusion_strict, self.domain))
+            else:
+                self.validity_wff = self.validity_wff.expand_quantifiers(self.domain)
+        self._grounding_domain = self.domain
+        if self.metrics is not None:
+            self.metrics.counts["nodes_after_grounding"] = count_nodes(self.validity_wff)
 
     def to_cnf(self, debug: bool = False):
         """
         Returns a CNF form of the argument WFF: (Premises ∧ ¬Conclusion)
+        The result is cached for as long as `validity_wff` is unchanged.
+        With `debug`, its clauses are also logged at DEBUG level.
         """
-        print(self.validity_wff)
-        cnf = strict_to_cnf(self.validity_wff)
+        logger.debug("Validity WFF: %r", self.validity_wff)
+        if self._cnf_cache is not None and self._cnf_cache[0] is self.validity_wff:
+            cnf = self._cnf_cache[1]
+        else:
+            self._check_blowup()
+            with stage(self.metrics, "cnf"):
+                if self.cache:
+                    cnf = self._assemble_cnf()
+                else:
+                    cnf = strict_to_cnf(self.validity_wff, self.metrics,
+                                        encoding=self.encoding, direct_clause_limit=self.direct_clause_limit)
+            self._cnf_cache = (self.validity_wff, cnf)
         if debug:
-            print("CNF conversion result:")
-            for clause in cnf.get_clauses():
-                print(" ", clause)
+            logger.debug("CNF conversion result:\n%s", lazy(_format_clauses, cnf))
         return cnf
 
     # ==========================================================
     # --- Internal Helpers ---
     # ==========================================================
 
+    def diagnose_cnf(self):
+        """Ranked per-premise/quantifier attribution of the estimated CNF size."""
+        return diagnose(self, self.max_clauses, self.encoding, self.direct_clause_limit)
+
+    def _check_blowup(self, domain: Optional[List[str]] = None) -> None:
+        """Raises CnfBlowupError (with a report) if the CNF estimate exceeds `max_clauses`."""
+        if self.max_clauses is None:
+            return
+        try:
+            estimate = check_ceiling(self.validity_wff, self.max_clauses, domain,
+                                     self.encoding, self.direct_clause_limit)
+        except CnfBlowupError as e:
+            e.report = self.diagnose_cnf()
+            raise
+        if self.metrics is not None:
+            self.metrics.counts["estimated_clauses"] = estimate
+
+    def _assemble_cnf(self) -> CnfWFF:
+        """Cached CNF blocks of the (distinct) relevant premises, then the negated conclusion."""
+        domain = self._grounding_domain
+        clauses = []
+        premises = list(dict.fromkeys(self.relevant_premises))
+        for premise in premises:
+            clauses.extend(premise_clauses(premise, domain, self.encoding, self.direct_clause_limit,
+                                           self.metrics))
+        negated_conclusion = ground_premise(self.negated_conclusion_strict, domain)
+        clauses.extend(strict_to_cnf(negated_conclusion, self.metrics, encoding=self.encoding,
+                                     direct_clause_limit=self.direct_clause_limit).get_clauses())
+        if self.metrics is not None:
+            self.metrics.counts["premise_blocks"] = len(premises)
+        return clauses_to_cnf(clauses)
+
+    def _build_validity_wff(self, premises: List[StrictWFF],
+                            negated_conclusion: Optional[StrictWFF] = None) -> StrictWFF:
+        """Builds P {AND} {NOT} C, or just {NOT} C when no premises remain."""
+        negated_conclusion = negated_conclusion or self.negated_conclusion_strict
+        if not premises:
+            return negated_conclusion
+        premises_WFF = list_to_StrictWFF(premises, AND, cls=FrozenStrictWFF)
+        return FrozenStrictWFF(operator=AND, operand1=premises_WFF, operand2=negated_conclusion)
+
     def _normalize_to_strict(self, item: Union[str, StrictWFF]) -> StrictWFF:
-        """Parses strings into StrictWFFs, passes StrictWFFs through."""
+        """Parses strings into (cached) FrozenStrictWFFs, freezes StrictWFFs."""
         if isinstance(item, StrictWFF):
-            return item
+            return freeze(item)
         elif isinstance(item, str):
-            wff = string_to_WFF(item)
+            wff = string_to_frozen_WFF(item)
             if wff: return wff
             else:
                 # No wff was able to be created
@@ -0,0 +1,77 @@
+"""
+async_solving.py
+
+asyncio entry points for argument validation.
+
+- Grounding, CNF conversion and solving run in an executor (threads by default),
+  so the event loop stays responsive.
+- Cancelling the awaiting task cancels the argument's CancelToken: the native
+  solver is interrupted, and grounding/CNF stop at the next stage boundary.
+- `solve_stream` bounds the number of validations in flight.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from typing import AsyncIterator, Iterable, Optional, Tuple
+
+from sat_solving import CancelToken
+
+
+DEFAULT_CONCURRENCY = 8
+
+Result = Tuple[Optional[bool], Optional[dict]]
+
+
+def _ground_and_solve(argument, token: CancelToken) -> Result:
+    """
+    Blocking pipeline run in the executor; checks the token between stages.
+    Solves through Argument.solve (its CNF is cached by then), so the solve is timed
+    in the argument's metrics and its sink is emitted as for a synchronous solve.
+    """
+    if not argument.solvable():
+        return None, None
+    token.check()
+    argument.expand_quantifiers()
+    token.check()
+    argument.to_cnf()
+    token.check()
+    return argument.solve(token)
+
+
+async def solve_async(argument, executor: Optional[Executor] = None) -> Result:
+    """
+    Grounds and solves one Argument without blocking the event loop.
+    Returns (is_valid, counterexample), or (None, None) if the argument is not solvable.
+    """
+    loop = asyncio.get_running_loop()
+    token = CancelToken()
+    future = loop.run_in_executor(executor, _ground_and_solve, argument, token)
+    try:
+        return await future
+    except asyncio.CancelledError:
+        token.cancel()
+        raise
+
+
+async def solve_stream(arguments: Iterable, concurrency: int = DEFAULT_CONCURRENCY,
+                       executor: Optional[Executor] = None) -> AsyncIterator[Result]:
+    """
+    Validates arguments concurrently, yielding results in input order.
+    At most `concurrency` validations are in flight; closing or cancelling
+    the stream cancels (and interrupts) the ones still running.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+
+    pending = deque()
+    try:
+        for argument in arguments:
+            pending.append(asyncio.ensure_future(solve_async(argument, executor)))
+            if len(pending) >= concurrency:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
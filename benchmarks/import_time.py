@@ -0,0 +1,127 @@
+"""
+import_time.py
+
+Start-up cost of the library and CLI entry points.
+
+Each module is imported in a fresh interpreter (`python -c "import <module>"`)
+several times; the median time of a bare interpreter (`python -c pass`) is
+subtracted. It also lists which of the heavy modules (solver backend, dataset
+loaders, SQLite, profilers, ...) each import pulls in: those are loaded on first
+use, and tests/test_import_time.py keeps them that way, checking every module the
+entry points load at start-up (`startup_imports`, from `python -X importtime`).
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --repeat 20 --max-ms 80 --output imports.json
+exits 1 if any module takes longer than --max-ms to import.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, Iterable, List, Optional
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ["WFFs.strictWFFs", "WFFs.WFF_conversion", "argument", "pipeline", "init"]
+
+# Modules that only some runs need; entry points should not import them up front
+HEAVY_MODULES = ["pysat", "get_data", "snapshot", "result_cache", "sqlite3", "tracemalloc",
+                 "cProfile", "pstats", "concurrent.futures", "json", "ast"]
+
+
+def _python(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+def loaded_modules(module: str, code: str = "", heavy: List[str] = HEAVY_MODULES) -> List[str]:
+    """The `heavy` modules present in a fresh interpreter after `import module` (and running `code`)."""
+    script = f"import sys\nimport {module}\n{code}\nprint(' '.join(m for m in {heavy!r} if m in sys.modules))"
+    return _python(script).stdout.split()
+
+
+def startup_imports(module: str, code: str = "") -> Dict[str, int]:
+    """
+    Every module a fresh interpreter imports for `import module` (and running `code`),
+    directly or indirectly, with its cumulative import time in µs, from `python -X importtime`.
+    """
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}\n{code}"],
+                             cwd=ROOT, capture_output=True, text=True, check=True)
+    imports = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            imports[name.strip()] = int(cumulative)
+    return imports
+
+
+def heavy_imports(imports: Iterable[str], heavy: List[str] = HEAVY_MODULES) -> List[str]:
+    """The names in `imports` that are, or are inside, one of the `heavy` modules."""
+    return sorted(name for name in imports if any(name == h or name.startswith(h + ".") for h in heavy))
+
+
+def _median_seconds(code: str, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _python(code)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def run_benchmarks(modules: List[str] = MODULES, repeat: int = 10) -> Dict:
+    """Median import time (ms, interpreter start-up subtracted) and heavy modules loaded, per module."""
+    baseline = _median_seconds("pass", repeat)
+    results = {
+        "meta": {"python": platform.python_version(), "repeat": repeat, "interpreter_ms": 1000 * baseline},
+        "modules": {},
+    }
+    for module in modules:
+        seconds = _median_seconds(f"import {module}", repeat)
+        results["modules"][module] = {
+            "ms": max(0.0, 1000 * (seconds - baseline)),
+            "loads": loaded_modules(module),
+        }
+    return results
+
+
+def format_results(results: Dict) -> str:
+    lines = [f"Interpreter start-up: {results['meta']['interpreter_ms']:.1f} ms "
+             f"(median of {results['meta']['repeat']}, subtracted below)",
+             f"{'module':<22}{'import ms':>10}  heavy modules loaded"]
+    for module, row in results["modules"].items():
+        lines.append(f"{module:<22}{row['ms']:>10.1f}  {', '.join(row['loads']) or '-'}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time benchmark for the library and CLI.")
+    parser.add_argument("--repeat", type=int, default=10, help="fresh interpreters per module")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if any import takes longer")
+    parser.add_argument("--output", help="JSON file to write")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.modules, args.repeat)
+    print(format_results(results))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.max_ms is not None:
+        slow = [m for m, row in results["modules"].items() if row["ms"] > args.max_ms]
+        if slow:
+            print(f"Slower than {args.max_ms:.0f} ms: {', '.join(slow)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
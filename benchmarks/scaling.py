@@ -0,0 +1,297 @@
+"""
+scaling.py
+
+Asymptotic scaling harness for the hot paths.
+
+Sweeps one parameter at a time (formula length, domain size, nesting depth)
+through parsing, StrictWFF.expand_quantifiers, distribute_or_over_and,
+strict_to_cnf (direct and definitional) and solve_cnf, and records time, peak memory and output size
+(nodes or clauses) per point. Each series is fitted both as a power law
+(y ~ x^k, slope on log-log) and as an exponential (y ~ b^x, slope on semi-log),
+so quadratic or exponential regressions show up as a changed exponent.
+
+Usage:
+    python -m benchmarks.scaling --output-dir scaling_results
+writes scaling.json, scaling.md and, when matplotlib is installed, one PNG per sweep.
+"""
+
+import argparse
+import gc
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence
+
+from constants import AND, ATOMIC_WFF
+from instrumentation import count_nodes
+from sat_solving import solve_cnf
+from synthetic import ground_atom, nested_quantifiers, or_of_ands, implication_chain, random_kcnf, as_argument
+from WFFs.strictWFFs import string_to_WFF, list_to_StrictWFF
+from WFFs.WFF_conversion import (
+    strict_to_cnf, distribute_or_over_and, eliminate_implications, eliminate_xor, demorgans,
+)
+
+
+# ==========================================================
+# --- Curve fitting ---
+# ==========================================================
+
+def _linear_fit(xs: Sequence[float], ys: Sequence[float]):
+    """Least squares y = a + b x; returns (a, b, r2)."""
+    n = len(xs)
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    slope = sxy / sxx if sxx else 0.0
+    intercept = mean_y - slope * mean_x
+    ss_tot = sum((y - mean_y) ** 2 for y in ys)
+    ss_res = sum((y - intercept - slope * x) ** 2 for x, y in zip(xs, ys))
+    return intercept, slope, (1 - ss_res / ss_tot) if ss_tot else 1.0
+
+
+def fit_growth(xs: Sequence[float], ys: Sequence[float]) -> Dict[str, float]:
+    """
+    Fits y ~ x^k (power) and y ~ b^x (exponential).
+    Returns the power exponent k, the exponential base b, their r² and the better model.
+    """
+    points = [(x, y) for x, y in zip(xs, ys) if x > 0 and y > 0]
+    if len(points) < 2:
+        raise ValueError("Need at least two positive points to fit growth.")
+    px, py = zip(*points)
+    _, k, power_r2 = _linear_fit([math.log(x) for x in px], [math.log(y) for y in py])
+    _, log_b, exp_r2 = _linear_fit(list(px), [math.log(y) for y in py])
+    return {
+        "power_exponent": k,
+        "power_r2": power_r2,
+        "exp_base": math.exp(log_b),
+        "exp_r2": exp_r2,
+        "best": "power" if power_r2 >= exp_r2 else "exponential",
+    }
+
+
+# ==========================================================
+# --- Measurement ---
+# ==========================================================
+
+def time_call(fn: Callable, repeat: int = 5):
+    """Best-of-`repeat` wall time with the GC paused (as timeit does); returns (seconds, result)."""
+    best, result = float("inf"), None
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if was_enabled:
+            gc.enable()
+    return best, result
+
+
+def peak_memory(fn: Callable) -> int:
+    """Peak traced bytes allocated while running fn once."""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def count_conjuncts(wff) -> int:
+    """Number of top-level ∧ operands of a StrictWFF (= clauses after distribution)."""
+    count, stack = 0, [wff]
+    while stack:
+        node = stack.pop()
+        if node.type != ATOMIC_WFF and node.operator == AND and node.operand2 is not None:
+            stack.extend([node.operand1, node.operand2])
+        else:
+            count += 1
+    return count
+
+
+# ==========================================================
+# --- Sweeps ---
+# ==========================================================
+# Each sweep: param name, default values, prepare(x) -> input (untimed),
+# run(input) -> output (timed), size(output) -> int.
+
+def _chain_string(n: int) -> str:
+    return AND.join(ground_atom(i % 400) for i in range(n))
+
+
+def _grounding_input(case: Dict):
+    argument = as_argument(case, filter_premises=False)
+    return argument.validity_wff, argument.domain
+
+
+def _nnf(wff):
+    return demorgans(eliminate_xor(eliminate_implications(wff)))
+
+
+def _grounded(case: Dict):
+    argument = as_argument(case, filter_premises=False)
+    argument.expand_quantifiers()
+    return argument.validity_wff
+
+
+SWEEPS = {
+    "parse_length": {
+        "param": "atoms",
+        "values": [50, 100, 200, 400, 800],
+        "prepare": _chain_string,
+        "run": string_to_WFF,
+        "size": count_nodes,
+    },
+    "ground_domain": {
+        "param": "domain_size",
+        "values": [2, 4, 8, 16],
+        "prepare": lambda n: _grounding_input(nested_quantifiers(depth=2, domain_size=n)),
+        "run": lambda inp: inp[0].expand_quantifiers(inp[1]),
+        "size": count_nodes,
+    },
+    "ground_depth": {
+        "param": "depth",
+        "values": [1, 2, 3, 4],
+        "prepare": lambda d: _grounding_input(nested_quantifiers(depth=d, domain_size=3)),
+        "run": lambda inp: inp[0].expand_quantifiers(inp[1]),
+        "size": count_nodes,
+    },
+    "distribute_terms": {
+        "param": "terms",
+        "values": [2, 4, 6, 8, 10],
+        "prepare": lambda t: _nnf(string_to_WFF(or_of_ands(terms=t, width=2)["premises"][0])),
+        "run": distribute_or_over_and,
+        "size": count_conjuncts,
+    },
+    "definitional_terms": {
+        "param": "terms",
+        "values": [4, 8, 16, 24],
+        "prepare": lambda t: string_to_WFF(or_of_ands(terms=t, width=2)["premises"][0]),
+        "run": lambda wff: strict_to_cnf(wff, encoding="definitional"),
+        "size": lambda cnf: len(cnf.get_clauses()),
+    },
+    "cnf_length": {
+        "param": "premises",
+        "values": [4, 8, 16, 24],
+        "prepare": lambda n: _grounded(implication_chain(premises=n, domain_size=3)),
+        "run": strict_to_cnf,
+        "size": lambda cnf: len(cnf.get_clauses()),
+    },
+    "solve_variables": {
+        "param": "variables",
+        "values": [20, 40, 80, 160],
+        "prepare": lambda n: strict_to_cnf(list_to_StrictWFF(
+            [string_to_WFF(p) for p in random_kcnf(variables=n, ratio=2.0, seed=n)["premises"]], AND)),
+        "run": solve_cnf,
+        "size": lambda result: int(result[0]),
+    },
+}
+
+
+def run_sweep(name: str, values: Optional[List[int]] = None, repeat: int = 5, memory: bool = True) -> Dict:
+    """Runs one sweep and fits time, memory and size growth against its parameter."""
+    sweep = SWEEPS[name]
+    values = values or sweep["values"]
+    points = []
+    for x in values:
+        inp = sweep["prepare"](x)
+        seconds, output = time_call(lambda: sweep["run"](inp), repeat)
+        points.append({
+            sweep["param"]: x,
+            "seconds": seconds,
+            "peak_bytes": peak_memory(lambda: sweep["run"](inp)) if memory else None,
+            "size": sweep["size"](output),
+        })
+
+    xs = [p[sweep["param"]] for p in points]
+    fits = {"time": fit_growth(xs, [p["seconds"] for p in points])}
+    if memory:
+        fits["memory"] = fit_growth(xs, [p["peak_bytes"] for p in points])
+    sizes = [p["size"] for p in points]
+    if len(set(sizes)) > 1:
+        fits["size"] = fit_growth(xs, sizes)
+    return {"sweep": name, "param": sweep["param"], "points": points, "fits": fits}
+
+
+def run_all(repeat: int = 5, memory: bool = True) -> List[Dict]:
+    return [run_sweep(name, repeat=repeat, memory=memory) for name in SWEEPS]
+
+
+# ==========================================================
+# --- Output ---
+# ==========================================================
+
+def format_markdown(results: List[Dict]) -> str:
+    lines = []
+    for result in results:
+        param = result["param"]
+        lines.append(f"## {result['sweep']}\n")
+        lines.append(f"| {param} | time (ms) | peak KiB | size |")
+        lines.append("|---:|---:|---:|---:|")
+        for p in result["points"]:
+            peak = f"{p['peak_bytes'] / 1024:.1f}" if p["peak_bytes"] is not None else "-"
+            lines.append(f"| {p[param]} | {1000 * p['seconds']:.3f} | {peak} | {p['size']} |")
+        lines.append("")
+        for metric, fit in result["fits"].items():
+            lines.append(f"- {metric}: x^{fit['power_exponent']:.2f} (r²={fit['power_r2']:.3f}), "
+                         f"{fit['exp_base']:.2f}^x (r²={fit['exp_r2']:.3f}) → {fit['best']}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def write_plots(results: List[Dict], output_dir: str) -> List[str]:
+    """One log-log PNG per sweep; skipped when matplotlib isn't installed."""
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return []
+
+    paths = []
+    for result in results:
+        xs = [p[result["param"]] for p in result["points"]]
+        fig, ax = plt.subplots()
+        ax.loglog(xs, [p["seconds"] for p in result["points"]], "o-", label="time (s)")
+        ax.loglog(xs, [max(p["size"], 1) for p in result["points"]], "s--", label="size")
+        ax.set_xlabel(result["param"])
+        ax.set_title(result["sweep"])
+        ax.legend()
+        path = os.path.join(output_dir, f"{result['sweep']}.png")
+        fig.savefig(path)
+        plt.close(fig)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Scaling sweeps for grounding, CNF and solving.")
+    parser.add_argument("--output-dir", default="scaling_results")
+    parser.add_argument("--sweep", action="append", choices=sorted(SWEEPS),
+                        help="sweep to run (repeatable; default all)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    args = parser.parse_args(argv)
+
+    names = args.sweep or list(SWEEPS)
+    results = [run_sweep(name, repeat=args.repeat, memory=not args.no_memory) for name in names]
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    with open(os.path.join(args.output_dir, "scaling.json"), "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    markdown = format_markdown(results)
+    with open(os.path.join(args.output_dir, "scaling.md"), "w", encoding="utf-8") as f:
+        f.write(markdown)
+    write_plots(results, args.output_dir)
+    print(markdown)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
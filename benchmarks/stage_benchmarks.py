@@ -0,0 +1,247 @@
+"""
+stage_benchmarks.py
+
+Times each pipeline stage separately:
+    parse   (string_to_WFF on every premise and the conclusion)
+    expand  (Argument.expand_quantifiers)
+    cnf     (strict_to_cnf on the grounded validity WFF)
+    clauses (cnf_to_clauses)
+    solve   (solve_cnf)
+
+Reports throughput, p50/p95/p99 latency and peak allocations per stage,
+and saves them as JSON so runs can be compared.
+
+Usage:
+    python -m benchmarks.stage_benchmarks run --dataset synthetic --output new.json
+    python -m benchmarks.stage_benchmarks run --dataset folio --limit 100 --output new.json
+    python -m benchmarks.stage_benchmarks compare base.json new.json --threshold 0.10
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from argument import Argument
+from sat_solving import cnf_to_clauses, solve_cnf
+from WFFs.strictWFFs import string_to_WFF
+from WFFs.WFF_conversion import strict_to_cnf
+
+
+STAGES = ["parse", "expand", "cnf", "clauses", "solve"]
+
+# Metrics where a larger value in the new run is a regression
+COMPARED_METRICS = ["p50_ms", "p95_ms", "peak_alloc_kib"]
+
+
+# ==========================================================
+# --- Inputs ---
+# ==========================================================
+
+def folio_inputs(limit: Optional[int] = None, file_path: Optional[str] = None) -> List[Tuple[List[str], str]]:
+    """(premises, conclusion) pairs from the FOLIO split."""
+    from itertools import islice
+    from pipeline import records_from_folio
+    return [(r["premises"], r["conclusion"]) for r in islice(records_from_folio(file_path), limit)]
+
+
+def synthetic_inputs(count: int = 50, chain_length: int = 6, domain_size: int = 4) -> List[Tuple[List[str], str]]:
+    """
+    Implication chains over a small domain:
+        ∀x(Ax→Bx), ∀x(Bx→Cx), ..., Aa, Ab, ...  ⊢  <last>a
+    Chain length and domain size vary with the index for some spread.
+    """
+    predicates = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    constants = "abcdefghijklmnopqrstuvw"
+    inputs = []
+    for i in range(count):
+        length = 2 + i % chain_length
+        size = 1 + i % domain_size
+        premises = [f"∀x({predicates[j]}x→{predicates[j + 1]}x)" for j in range(length)]
+        premises += [f"{predicates[0]}{c}" for c in constants[:size]]
+        inputs.append((premises, f"{predicates[length]}{constants[0]}"))
+    return inputs
+
+
+# ==========================================================
+# --- Measurement ---
+# ==========================================================
+
+def _run_stages(premises: List[str], conclusion: str, record: Callable[[str, Callable], object]) -> None:
+    """Runs every stage once on one argument, handing each stage to `record`."""
+    record("parse", lambda: [string_to_WFF(s) for s in premises + [conclusion]])
+
+    # Without the formula caches, so every repeat (and the tracemalloc pass) really grounds
+    try:
+        argument = Argument(premises, conclusion, cache=False)
+    except (ValueError, AssertionError, TypeError):
+        return
+    if not argument.solvable():
+        return
+    record("expand", argument.expand_quantifiers)
+    cnf = record("cnf", lambda: strict_to_cnf(argument.validity_wff))
+    record("clauses", lambda: cnf_to_clauses(cnf))
+    record("solve", lambda: solve_cnf(cnf))
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def _summarize(times: List[float], peaks: List[int]) -> Dict[str, float]:
+    times = sorted(times)
+    total = sum(times)
+    return {
+        "count": len(times),
+        "total_s": total,
+        "throughput_per_s": len(times) / total if total else 0.0,
+        "mean_ms": 1000 * total / len(times) if times else 0.0,
+        "p50_ms": 1000 * _percentile(times, 50),
+        "p95_ms": 1000 * _percentile(times, 95),
+        "p99_ms": 1000 * _percentile(times, 99),
+        "peak_alloc_kib": max(peaks) / 1024 if peaks else 0.0,
+        "mean_peak_alloc_kib": sum(peaks) / len(peaks) / 1024 if peaks else 0.0,
+    }
+
+
+def run_benchmarks(inputs: List[Tuple[List[str], str]], repeat: int = 3, allocations: bool = True) -> Dict:
+    """
+    Times every stage on every input `repeat` times.
+    Allocations are measured in a separate tracemalloc pass so they don't skew timings.
+    """
+    times = {stage: [] for stage in STAGES}
+    peaks = {stage: [] for stage in STAGES}
+
+    def timed(stage, fn):
+        start = time.perf_counter()
+        result = fn()
+        times[stage].append(time.perf_counter() - start)
+        return result
+
+    def traced(stage, fn):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        peaks[stage].append(peak - before)
+        return result
+
+    for _ in range(repeat):
+        for premises, conclusion in inputs:
+            _run_stages(premises, conclusion, timed)
+
+    if allocations:
+        tracemalloc.start()
+        try:
+            for premises, conclusion in inputs:
+                _run_stages(premises, conclusion, traced)
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "meta": {
+            "inputs": len(inputs),
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "stages": {stage: _summarize(times[stage], peaks[stage]) for stage in STAGES},
+    }
+
+
+# ==========================================================
+# --- Comparison ---
+# ==========================================================
+
+def compare_results(base: Dict, new: Dict, threshold: float = 0.10) -> List[Dict]:
+    """
+    Returns one row per (stage, metric) with the relative change.
+    `regression` is set when the new value is worse than base by more than `threshold`.
+    """
+    rows = []
+    for stage in STAGES:
+        if stage not in base["stages"] or stage not in new["stages"]:
+            continue
+        for metric in COMPARED_METRICS:
+            old_value = base["stages"][stage][metric]
+            new_value = new["stages"][stage][metric]
+            change = (new_value - old_value) / old_value if old_value else 0.0
+            rows.append({
+                "stage": stage, "metric": metric,
+                "base": old_value, "new": new_value,
+                "change": change, "regression": change > threshold,
+            })
+    return rows
+
+
+def format_results(results: Dict) -> str:
+    header = f"{'stage':8s} {'count':>6s} {'ops/s':>10s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'peak KiB':>9s}"
+    lines = [header, "-" * len(header)]
+    for stage, s in results["stages"].items():
+        lines.append(f"{stage:8s} {s['count']:6d} {s['throughput_per_s']:10.1f} {s['p50_ms']:9.3f} "
+                     f"{s['p95_ms']:9.3f} {s['p99_ms']:9.3f} {s['peak_alloc_kib']:9.1f}")
+    return "\n".join(lines)
+
+
+def format_comparison(rows: List[Dict]) -> str:
+    lines = []
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        lines.append(f"{row['stage']:8s} {row['metric']:15s} {row['base']:10.3f} -> {row['new']:10.3f} "
+                     f"({row['change']:+.1%}) {flag}")
+    return "\n".join(lines)
+
+
+# ==========================================================
+# --- CLI ---
+# ==========================================================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Stage-level benchmarks for the SAT pipeline.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="benchmark every stage and save JSON")
+    run.add_argument("--dataset", choices=["synthetic", "folio"], default="synthetic")
+    run.add_argument("--limit", type=int, default=None, help="FOLIO rows to use")
+    run.add_argument("--count", type=int, default=50, help="synthetic arguments to generate")
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--no-alloc", action="store_true", help="skip the tracemalloc pass")
+    run.add_argument("--output", help="JSON file to write")
+
+    cmp = sub.add_parser("compare", help="compare two JSON result files")
+    cmp.add_argument("base")
+    cmp.add_argument("new")
+    cmp.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown (0.10 = 10%%)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        inputs = folio_inputs(args.limit) if args.dataset == "folio" else synthetic_inputs(args.count)
+        results = run_benchmarks(inputs, repeat=args.repeat, allocations=not args.no_alloc)
+        results["meta"]["dataset"] = args.dataset
+        print(format_results(results))
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+        return 0
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+    rows = compare_results(base, new, args.threshold)
+    print(format_comparison(rows))
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+canonical.py
+
+Alpha-equivalence canonicalization of arguments.
+
+compress_fol names predicates and terms in first-seen order, so the same
+argument shape in two stories gets different symbols. `canonicalize` renames
+every predicate symbol (A, B2, ...) and every term symbol (a, b2, ...: constants
+and bound variables alike, since both belong to the domain) into an order
+derived from the formula structure, and sorts the premises, so isomorphic
+arguments get the same canonical text and fingerprint.
+
+Symbol order comes from colour refinement: a symbol starts with the multiset of
+places it occurs at (formula skeleton with letters blanked, position, premise or
+conclusion) and is refined by the colours of the symbols it occurs next to.
+Remaining ties are broken by first appearance. The canonical form is always an
+actual renaming of the argument, so equal fingerprints imply isomorphic
+arguments (with the same validity); rare symmetric arguments may still get
+different fingerprints for isomorphic inputs.
+"""
+
+import hashlib
+import json
+import re
+from string import ascii_lowercase, ascii_uppercase
+from typing import Dict, List, Optional, Tuple
+
+from result_cache import canonical_formula as _normal_text
+from WFFs.strictWFFs import SYMBOL_PATTERN, symbol_names
+
+
+MAX_REFINEMENT_ROUNDS = 6
+
+
+_TOKEN = re.compile(r"[A-Za-z][0-9]*|.", re.DOTALL)
+
+
+def _is_symbol(token: str) -> bool:
+    return token[0] in ascii_uppercase or token[0] in ascii_lowercase
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN.findall(text)
+
+
+def _rename(text: str, renaming: Dict[str, str]) -> str:
+    return SYMBOL_PATTERN.sub(lambda m: renaming.get(m.group(), m.group()), text)
+
+
+class CanonicalArgument:
+    """
+    An argument under a canonical renaming.
+
+    premises, conclusion:  canonical formula strings (premises in canonical order)
+    fingerprint:           SHA-256 of the canonical argument
+    renaming:              original symbol -> canonical symbol
+    """
+
+    def __init__(self, premises: List[str], conclusion: str, renaming: Dict[str, str]):
+        self.premises = premises
+        self.conclusion = conclusion
+        self.renaming = renaming
+        self._inverse = {v: k for k, v in renaming.items()}
+        payload = json.dumps([[_normal_text(p) for p in premises], _normal_text(conclusion)], ensure_ascii=False)
+        self.fingerprint = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def to_canonical(self, text: str) -> str:
+        return _rename(text, self.renaming)
+
+    def to_original(self, text: str) -> str:
+        return _rename(text, self._inverse)
+
+    def canonical_model(self, model: Optional[Dict[str, bool]]) -> Optional[Dict[str, bool]]:
+        """Renames the atoms of a model (e.g. a counterexample) into canonical symbols."""
+        return None if model is None else {self.to_canonical(atom): v for atom, v in model.items()}
+
+    def original_model(self, model: Optional[Dict[str, bool]]) -> Optional[Dict[str, bool]]:
+        """Renames the atoms of a canonical model back into the original symbols."""
+        return None if model is None else {self.to_original(atom): v for atom, v in model.items()}
+
+    def __repr__(self) -> str:
+        return f"CanonicalArgument({', '.join(self.premises)} ⊢ {self.conclusion}; {self.fingerprint[:12]})"
+
+
+def _rank(values: Dict[str, tuple]) -> Dict[str, int]:
+    """Replaces each symbol's (comparable, name-free) signature by its rank among all signatures."""
+    order = {sig: i for i, sig in enumerate(sorted(set(values.values())))}
+    return {sym: order[sig] for sym, sig in values.items()}
+
+
+def _coloured(tokens: List[str], colours: Dict[str, int]) -> tuple:
+    return tuple((1, tok[0].isupper(), colours[tok]) if _is_symbol(tok) else (0, tok) for tok in tokens)
+
+
+def canonicalize(premises: List[str], conclusion: str) -> CanonicalArgument:
+    """Canonical renaming and premise order for an argument given as formula strings."""
+    texts = [_tokens(_normal_text(p)) for p in premises]
+    conclusion_text = _tokens(_normal_text(conclusion))
+    formulas: List[Tuple[str, List[str]]] = [("c", conclusion_text)] + [("p", t) for t in texts]
+
+    # --- Initial colours: where each symbol occurs, ignoring names ---
+    occurrences: Dict[str, list] = {}
+    for role, text in formulas:
+        skeleton = "".join(("P" if tok[0].isupper() else "x") if _is_symbol(tok) else tok for tok in text)
+        for pos, tok in enumerate(text):
+            if _is_symbol(tok):
+                occurrences.setdefault(tok, []).append((role, skeleton, pos))
+    colours = _rank({sym: (sym[0].isupper(), tuple(sorted(occ))) for sym, occ in occurrences.items()})
+
+    # --- Refine by the colours of co-occurring symbols ---
+    for _ in range(MAX_REFINEMENT_ROUNDS):
+        signatures: Dict[str, list] = {sym: [] for sym in colours}
+        for role, text in formulas:
+            coloured = _coloured(text, colours)
+            for pos, tok in enumerate(text):
+                if _is_symbol(tok):
+                    signatures[tok].append((role, coloured, pos))
+        refined = _rank({sym: (colours[sym], tuple(sorted(sig))) for sym, sig in signatures.items()})
+        if len(set(refined.values())) == len(set(colours.values())):
+            break
+        colours = refined
+
+    # --- Canonical premise order, then names by (colour, first appearance) ---
+    order = sorted(range(len(texts)), key=lambda i: _coloured(texts[i], colours))
+    first_seen: Dict[str, int] = {}
+    for text in [conclusion_text] + [texts[i] for i in order]:
+        for tok in text:
+            if _is_symbol(tok) and tok not in first_seen:
+                first_seen[tok] = len(first_seen)
+
+    renaming = {}
+    for kind, letters in ((True, ascii_uppercase), (False, ascii_lowercase)):
+        symbols = sorted((s for s in colours if s[0].isupper() == kind), key=lambda s: (colours[s], first_seen[s]))
+        renaming.update(zip(symbols, symbol_names(letters)))
+
+    return CanonicalArgument([_rename(premises[i], renaming) for i in order], _rename(conclusion, renaming), renaming)
+
+
+def fingerprint(premises: List[str], conclusion: str) -> str:
+    return canonicalize(premises, conclusion).fingerprint
@@ -0,0 +1,260 @@
+"""
+cnf_diagnostics.py
+
+Finds where CNF conversion blows up before it happens.
+
+Naive CNF (distribute ∨ over ∧) has an exactly predictable clause count:
+walking the formula with both polarities,
+    atom        (1, 1)
+    ¬A          (neg A, pos A)
+    A ∧ B       (pos A + pos B,   neg A * neg B)
+    A ∨ B       (pos A * pos B,   neg A + neg B)
+    A → B       (neg A * pos B,   pos A + neg B)
+    A ⊕ B       (pos A * pos B + neg A * neg B,   (neg A + neg B) * (pos A + pos B))
+    ∀x A        (n * pos A,  neg A ** n)      over n domain constants
+    ∃x A        (pos A ** n,  n * neg A)
+so the size can be checked against a ceiling before grounding or distributing,
+and attributed to the premise and quantifier responsible.
+
+The definitional (Tseitin) encoding costs 3 clauses per ∧ ∨ → and 4 per ⊕, plus
+one unit clause per conjunct. `choose_encoding` uses both counts to route each
+top-level conjunct of a formula in the "auto" encoding.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from constants import (
+    ATOMIC_WFF, UNARY_WFF, QUANTIFIER_WFF, AND, OR, IMPLIES, XOR, UNIVERSAL_Q,
+    AUTO_ENCODING, DIRECT_ENCODING, DEFINITIONAL_ENCODING, DIRECT_CLAUSE_LIMIT,
+)
+
+
+class CnfBlowupError(ValueError):
+    """Raised when the estimated CNF size exceeds the configured ceiling."""
+
+    def __init__(self, estimate: int, ceiling: int, report: Optional["BlowupReport"] = None):
+        self.estimate = estimate
+        self.ceiling = ceiling
+        self.report = report
+        super().__init__(f"CNF would have {estimate:,} clauses (ceiling {ceiling:,})")
+
+
+# ==========================================================
+# --- Estimates ---
+# ==========================================================
+
+def _instances(variable: str, domain: Optional[List[str]]) -> int:
+    """Number of copies expand_quantifiers makes (it skips the variable itself)."""
+    if domain is None:
+        return 1
+    return max(1, sum(1 for const in domain if const != variable))
+
+
+def clause_counts(wff, domain: Optional[List[str]] = None) -> Tuple[int, int]:
+    """
+    (clauses of wff, clauses of ¬wff) after naive CNF conversion.
+    Quantifiers count as expanded over `domain`; with no domain they count as their body.
+    """
+    if wff.type == ATOMIC_WFF:
+        return 1, 1
+    if wff.type == UNARY_WFF:
+        pos, neg = clause_counts(wff.operand1, domain)
+        return neg, pos
+    if wff.type == QUANTIFIER_WFF:
+        symbol, variable = wff.quantifier
+        n = _instances(variable, domain)
+        pos, neg = clause_counts(wff.operand1, domain)
+        if symbol == UNIVERSAL_Q:
+            return n * pos, neg ** n
+        return pos ** n, n * neg
+
+    a_pos, a_neg = clause_counts(wff.operand1, domain)
+    b_pos, b_neg = clause_counts(wff.operand2, domain)
+    if wff.operator == AND:
+        return a_pos + b_pos, a_neg * b_neg
+    if wff.operator == OR:
+        return a_pos * b_pos, a_neg + b_neg
+    if wff.operator == IMPLIES:
+        return a_neg * b_pos, a_pos + b_neg
+    if wff.operator == XOR:
+        return a_pos * b_pos + a_neg * b_neg, (a_neg + b_neg) * (a_pos + b_pos)
+    raise ValueError(f"Unknown operator: {wff.operator}")
+
+
+def estimate_clauses(wff, domain: Optional[List[str]] = None) -> int:
+    """Exact clause count naive CNF conversion of `wff` would produce."""
+    return clause_counts(wff, domain)[0]
+
+
+def grounded_nodes(wff, domain: Optional[List[str]] = None) -> int:
+    """Node count of `wff` after expand_quantifiers over `domain`, without expanding."""
+    if wff.type == ATOMIC_WFF:
+        return 1
+    if wff.type == UNARY_WFF:
+        return 1 + grounded_nodes(wff.operand1, domain)
+    if wff.type == QUANTIFIER_WFF:
+        n = _instances(wff.quantifier[1], domain)
+        return n * grounded_nodes(wff.operand1, domain) + (n - 1)
+    return 1 + grounded_nodes(wff.operand1, domain) + grounded_nodes(wff.operand2, domain)
+
+
+def definitional_clauses(wff, domain: Optional[List[str]] = None) -> int:
+    """Clauses the definitional encoding of `wff` takes (including its unit clause), at most."""
+    return _definitions(wff, domain) + 1
+
+
+def _definitions(wff, domain) -> int:
+    if wff.type == ATOMIC_WFF:
+        return 0
+    if wff.type == UNARY_WFF:
+        return _definitions(wff.operand1, domain)
+    if wff.type == QUANTIFIER_WFF:
+        n = _instances(wff.quantifier[1], domain)
+        return n * _definitions(wff.operand1, domain) + 3 * (n - 1)
+    own = 4 if wff.operator == XOR else 3
+    return own + _definitions(wff.operand1, domain) + _definitions(wff.operand2, domain)
+
+
+def conjuncts(wff, domain: Optional[List[str]] = None) -> List[Tuple[object, int]]:
+    """
+    Top-level conjuncts of `wff` as (subformula, copies) pairs.
+    A top-level ∀ counts as `copies` instances of its body, as it will after grounding.
+    """
+    found, stack = [], [(wff, 1)]
+    while stack:
+        node, copies = stack.pop()
+        if node.type == QUANTIFIER_WFF and node.quantifier[0] == UNIVERSAL_Q:
+            stack.append((node.operand1, copies * _instances(node.quantifier[1], domain)))
+        elif node.type not in (ATOMIC_WFF, UNARY_WFF, QUANTIFIER_WFF) and node.operator == AND:
+            stack.append((node.operand2, copies))
+            stack.append((node.operand1, copies))
+        else:
+            found.append((node, copies))
+    return found
+
+
+def choose_encoding(wff, domain: Optional[List[str]] = None, encoding: str = AUTO_ENCODING,
+                    limit: int = DIRECT_CLAUSE_LIMIT) -> str:
+    """DIRECT_ENCODING or DEFINITIONAL_ENCODING for one conjunct."""
+    if encoding != AUTO_ENCODING:
+        return encoding
+    return DIRECT_ENCODING if estimate_clauses(wff, domain) <= limit else DEFINITIONAL_ENCODING
+
+
+def encoded_clauses(wff, domain: Optional[List[str]] = None, encoding: str = DIRECT_ENCODING,
+                    limit: int = DIRECT_CLAUSE_LIMIT) -> int:
+    """Clause count (an upper bound for definitional parts) under the given encoding."""
+    if encoding == DIRECT_ENCODING:
+        return estimate_clauses(wff, domain)
+    total = 0
+    for conjunct, copies in conjuncts(wff, domain):
+        if choose_encoding(conjunct, domain, encoding, limit) == DIRECT_ENCODING:
+            total += copies * estimate_clauses(conjunct, domain)
+        else:
+            total += copies * definitional_clauses(conjunct, domain)
+    return total
+
+
+def check_ceiling(wff, ceiling: Optional[int], domain: Optional[List[str]] = None,
+                  encoding: str = DIRECT_ENCODING, limit: int = DIRECT_CLAUSE_LIMIT) -> int:
+    """Returns the clause estimate, raising CnfBlowupError if it exceeds `ceiling`."""
+    estimate = encoded_clauses(wff, domain, encoding, limit)
+    if ceiling is not None and estimate > ceiling:
+        raise CnfBlowupError(estimate, ceiling)
+    return estimate
+
+
+# ==========================================================
+# --- Attribution ---
+# ==========================================================
+
+def _quantifier_contributions(wff, domain, positive=True, found=None) -> List[Dict]:
+    """Every quantified subformula with the clauses it yields in its own polarity."""
+    found = [] if found is None else found
+    if wff.type == ATOMIC_WFF:
+        return found
+    if wff.type == QUANTIFIER_WFF:
+        pos, neg = clause_counts(wff, domain)
+        found.append({
+            "formula": wff,
+            "quantifier": "".join(wff.quantifier),
+            "clauses": pos if positive else neg,
+            "grounded_nodes": grounded_nodes(wff, domain),
+        })
+        _quantifier_contributions(wff.operand1, domain, positive, found)
+    elif wff.type == UNARY_WFF:
+        _quantifier_contributions(wff.operand1, domain, not positive, found)
+    elif wff.operator == XOR:
+        # Both polarities of each side end up in the CNF; attribute the larger
+        for polarity in (True, False):
+            _quantifier_contributions(wff.operand1, domain, polarity, found)
+            _quantifier_contributions(wff.operand2, domain, polarity, found)
+    else:
+        _quantifier_contributions(wff.operand1, domain, positive != (wff.operator == IMPLIES), found)
+        _quantifier_contributions(wff.operand2, domain, positive, found)
+    return found
+
+
+class BlowupReport:
+    """
+    Per-premise CNF size attribution for one argument, ranked by clause count.
+    Each entry: source ("premise N" or "conclusion"), formula, clauses (direct CNF),
+    share, encoded_clauses (under the argument's encoding), grounded_nodes and
+    its quantifiers (ranked the same way).
+    """
+
+    def __init__(self, entries: List[Dict], ceiling: Optional[int] = None):
+        self.entries = sorted(entries, key=lambda e: e["clauses"], reverse=True)
+        self.total = sum(e["clauses"] for e in entries)
+        self.encoded_total = sum(e.get("encoded_clauses", e["clauses"]) for e in entries)
+        self.ceiling = ceiling
+        for entry in self.entries:
+            entry["share"] = entry["clauses"] / self.total if self.total else 0.0
+
+    @property
+    def exceeded(self) -> bool:
+        return self.ceiling is not None and self.encoded_total > self.ceiling
+
+    def worst(self) -> Optional[Dict]:
+        return self.entries[0] if self.entries else None
+
+    def format(self, top: int = 5) -> str:
+        ceiling = f" (ceiling {self.ceiling:,})" if self.ceiling is not None else ""
+        lines = [f"CNF size estimate: {self.total:,} clauses direct, {self.encoded_total:,} as encoded{ceiling}"]
+        for rank, entry in enumerate(self.entries[:top], start=1):
+            lines.append(f"  #{rank} {entry['source']}: {entry['share']:.0%} of clauses "
+                         f"({entry['clauses']:,}, {entry.get('encoded_clauses', entry['clauses']):,} as encoded), "
+                         f"{entry['grounded_nodes']:,} nodes grounded  {entry['formula']!r}")
+            for q in entry["quantifiers"][:top]:
+                lines.append(f"       {q['quantifier']}: {q['clauses']:,} clauses, "
+                             f"{q['grounded_nodes']:,} nodes grounded  {q['formula']!r}")
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.format()
+
+
+def diagnose(argument, ceiling: Optional[int] = None, encoding: str = DIRECT_ENCODING,
+             limit: int = DIRECT_CLAUSE_LIMIT) -> BlowupReport:
+    """
+    Attributes the argument's estimated CNF size to its premises (numbered from 1,
+    as given) and the negated conclusion, and within each to its quantifiers.
+    Nothing is grounded or converted, so this is safe on arguments that would blow up.
+    """
+    sources = [(f"premise {i}", wff) for i, wff in enumerate(argument.premises, start=1)
+               if any(wff is kept for kept in argument.relevant_premises)]
+    sources.append(("conclusion", argument.negated_conclusion_strict))
+
+    entries = []
+    for source, wff in sources:
+        quantifiers = _quantifier_contributions(wff, argument.domain)
+        quantifiers.sort(key=lambda q: q["clauses"], reverse=True)
+        entries.append({
+            "source": source,
+            "formula": wff,
+            "clauses": estimate_clauses(wff, argument.domain),
+            "encoded_clauses": encoded_clauses(wff, argument.domain, encoding, limit),
+            "grounded_nodes": grounded_nodes(wff, argument.domain),
+            "quantifiers": quantifiers,
+        })
+    return BlowupReport(entries, ceiling)
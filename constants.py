@@ -33,4 +33,26 @@ QUANTIFIER_WFF = "quantifier_wff"
 
 # Argument Classifications
 VALID = "valid" # conlusion must be true if premises are all true
-INVALID = "invalid" # conclusion can be false when the premises are true
\ No newline at end of file
+INVALID = "invalid" # conclusion can be false when the premises are true
+
+# CNF encodings
+DIRECT_ENCODING = "direct"              # distribute ∨ over ∧ (can grow exponentially)
+DEFINITIONAL_ENCODING = "definitional"  # Tseitin: one fresh variable per connective, linear size
+AUTO_ENCODING = "auto"                  # direct per conjunct unless its clause estimate is too large
+ENCODINGS = [AUTO_ENCODING, DIRECT_ENCODING, DEFINITIONAL_ENCODING]
+
+# Conjuncts whose direct CNF would exceed this many clauses are encoded definitionally
+DIRECT_CLAUSE_LIMIT = 64
+
+# Prefix of definitional (Tseitin) variables; parsed atoms never start with it
+DEFINITION_PREFIX = "_d"
+
+# Bump whenever grounding, CNF encoding or solving can change a stored result
+# (invalidates result_cache entries)
+CNF_ENCODING_VERSION = 1
+
+# Default locations of files written by dataset runs (relative to the working directory).
+# Kept here so the CLI can build its parser without importing the modules that use them.
+DEFAULT_CACHE_PATH = ".sat_cache/results.sqlite"
+DEFAULT_SNAPSHOT_PATH = ".sat_cache/folio.snapshot"
+DEFAULT_PROFILE_DIR = "profile"
@@ -0,0 +1,151 @@
+"""
+formula_cache.py
+
+Process-wide memoization of per-premise grounding and CNF conversion.
+
+Premises recur across arguments (FOLIO stories share most of their premises),
+so grounding and CNF conversion are cached per premise rather than per argument:
+    grounding:  (premise, domain)                      -> grounded FrozenStrictWFF
+    cnf:        (premise, domain, encoding, limit)     -> list of clauses
+Keys use FrozenStrictWFF's structural hash, so equal premises parsed separately
+share entries. Both caches are bounded LRUs with hit statistics and are safe
+to use from several threads; each worker process keeps its own.
+"""
+
+from collections import OrderedDict
+from itertools import count
+from threading import Lock
+from typing import Callable, Dict, Hashable, List, Optional
+
+from constants import DEFINITION_PREFIX
+
+
+DEFAULT_MAXSIZE = 4096
+
+_MISSING = object()
+
+
+class FormulaCache:
+    """A bounded, thread-safe LRU cache with hit/miss/eviction counts."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, compute: Callable[[], object]):
+        """Returns the cached value for `key`, computing (outside the lock) and storing it on a miss."""
+        value = self.lookup(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.store(key, value)
+        return value
+
+    def lookup(self, key: Hashable, default=None):
+        """The cached value for `key` (counted as a hit or a miss), or `default`."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return default
+
+    def store(self, key: Hashable, value) -> None:
+        """Caches `value` under `key`, evicting the least recently used entries beyond maxsize."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        s = self.stats()
+        return f"FormulaCache({s['size']}/{s['maxsize']}, hits={s['hits']}, misses={s['misses']})"
+
+
+GROUNDING_CACHE = FormulaCache()
+CNF_CACHE = FormulaCache()
+
+# Each cached CNF block gets its own definitional-variable prefix (_d<block>.<n>),
+# so blocks can be concatenated without renaming
+_block_ids = count(1)
+
+
+def _domain_key(domain: Optional[List[str]]) -> Optional[tuple]:
+    return tuple(domain) if domain is not None else None
+
+
+def ground_premise(wff, domain: Optional[List[str]]):
+    """`wff` with its quantifiers expanded over `domain` (unchanged when domain is None)."""
+    if domain is None:
+        return wff
+    return GROUNDING_CACHE.get((wff, _domain_key(domain)), lambda: wff.expand_quantifiers(domain))
+
+
+def premise_clauses(wff, domain: Optional[List[str]], encoding: str, limit: int,
+                    metrics=None) -> List[List[str]]:
+    """
+    CNF clauses of `wff` grounded over `domain`. The returned lists are shared
+    between callers and must not be mutated.
+
+    With an instrumentation.Metrics, a conversion (cache miss) adds its cnf.* timings,
+    and the block's conjunct counts are added on hits too, so counts do not depend on
+    the cache. Lookups are counted as cnf_cache_hits / cnf_cache_misses.
+    """
+    from instrumentation import Metrics
+    from WFFs.WFF_conversion import strict_to_cnf
+
+    key = (wff, _domain_key(domain), encoding, limit)
+    entry = CNF_CACHE.lookup(key, _MISSING)
+    hit = entry is not _MISSING
+    if not hit:
+        conversion = Metrics()
+        prefix = f"{DEFINITION_PREFIX}{next(_block_ids)}."
+        clauses = strict_to_cnf(ground_premise(wff, domain), conversion, encoding=encoding,
+                                direct_clause_limit=limit, definition_prefix=prefix).get_clauses()
+        entry = (clauses, dict(conversion.counts))
+        CNF_CACHE.store(key, entry)
+
+    if metrics is not None:
+        if hit:
+            metrics.add_counts(entry[1])
+        else:
+            metrics.merge(conversion)
+        metrics.add_counts({"cnf_cache_hits" if hit else "cnf_cache_misses": 1})
+    return entry[0]
+
+
+def cache_stats() -> Dict[str, Dict[str, float]]:
+    return {"grounding": GROUNDING_CACHE.stats(), "cnf": CNF_CACHE.stats()}
+
+
+def clear_caches() -> None:
+    GROUNDING_CACHE.clear()
+    CNF_CACHE.clear()
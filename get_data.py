@@ -1,6 +1,8 @@
 
 from constants import *
 import ast
+import string
+from functools import lru_cache
 
 
 SYMBOL_SET = {
@@ -45,50 +47,18 @@ def load_data(file_path):
 
 
 
-def swap_symbols(string, original_symbols, new_symbols):
-    result = ""
-
-    # Invert dict so the symbols point to the name of the operation 
-    inverted_original_symbols = {value : key for key, value in original_symbols.items()}
-
-
-    for char in string:
-
-        if char in inverted_original_symbols.keys():
-            operator = inverted_original_symbols[char]
-            swapped_symbol = new_symbols[operator]
-        
-            result += swapped_symbol
-        
-        else:
-            result += char
-    
-    return result
-
-
+@lru_cache(maxsize=None)
+def _swap_table(original_items, new_items):
+    new_symbols = dict(new_items)
+    return str.maketrans({symbol: new_symbols[operator] for operator, symbol in original_items})
 
-def get_logical_entailment_data():
-    path = LOGICAL_ENTAILMENT_DATA_PATH
-
-    # Their symbols
-    le_and = "&"
-    le_or = "|"
-    le_implies = ">"
-    le_not = "~"
-
-    le_symbol_set = {
-    "AND" : le_and,
-    "OR" : le_or,
-    "NOT" : le_not,
-    "IMPLIES" : le_implies
-    }
 
+def swap_symbols(string, original_symbols, new_symbols):
+    """Replaces each operator symbol of `original_symbols` by the same operator's symbol in `new_symbols`."""
+    return string.translate(_swap_table(tuple(original_symbols.items()), tuple(new_symbols.items())))
 
-    with open(path) as file:
-        arguments = file.readlines()
 
-    # print(arguments[0])
-    return arguments
+# ===== Logical entailment ===== #
 
 # Their symbols
 le_and = "&"
@@ -103,12 +73,53 @@ le_symbol_set = {
     "IMPLIES" : le_implies
     }
 
-# arguments = get_logical_entailment_data()
-# first = arguments[0]
+# Their connectives to ours, and their propositional variables (a-z) to 0-ary predicates (A-Z)
+LE_TRANSLATION = str.maketrans({
+    **{le_symbol_set[operator]: symbol for operator, symbol in SYMBOL_SET.items()},
+    **dict(zip(string.ascii_lowercase, string.ascii_uppercase)),
+})
+
+# Bytes of lines read and translated per str.translate call
+LE_BLOCK_SIZE = 1 << 20
+
+
+def get_logical_entailment_data(file_path=None):
+    """The raw lines of the dataset (`A,B,E,H1,H2,H3`: premise, conclusion, A ⊨ B, heuristics)."""
+    with open(file_path or LOGICAL_ENTAILMENT_DATA_PATH) as file:
+        return file.readlines()
+
+
+def count_logical_entailment_records(file_path=None):
+    """Number of rows in the dataset, without parsing them."""
+    with open(file_path or LOGICAL_ENTAILMENT_DATA_PATH, "r", encoding="utf-8") as f:
+        return sum(1 for line in f if line.strip())
+
+
+def iter_logical_entailment_data(file_path=None, start=1, stop=None):
+    """
+    Lazily yields (id, premises, conclusion, label) for every row with id in [start, stop),
+    ids being 1-based line numbers (blank lines not counted) and labels VALID/INVALID.
+    Rows are read and translated to our symbols a block at a time.
+    """
+    record_id = 0
+    with open(file_path or LOGICAL_ENTAILMENT_DATA_PATH, "r", encoding="utf-8") as f:
+        while stop is None or record_id + 1 < stop:
+            block = f.readlines(LE_BLOCK_SIZE)
+            if not block:
+                return
+            lines = [line for line in block if line.strip()]
+            first = record_id + 1
+            record_id += len(lines)
+            lo = max(start - first, 0)
+            hi = len(lines) if stop is None else max(min(stop - first, len(lines)), 0)
+            if lo >= hi:
+                continue
+            translated = "".join(lines[lo:hi]).translate(LE_TRANSLATION).splitlines()
+            for offset, line in enumerate(translated):
+                premise, conclusion, entails = line.split(",")[:3]
+                yield first + lo + offset, [premise], conclusion, VALID if entails.strip() == "1" else INVALID
 
 
-# print(first)
-# print(swap_symbols(first, le_symbol_set, SYMBOL_SET))
 import ast
 
 # ===== FOLIO ===== #
@@ -116,33 +127,33 @@ import ast
 FOLIO_FILE_PATH = "FOLIO-main/data/v0.0/folio-validation.txt"  # constant file path
 
 
+def _parse_folio_line(line):
+    """Parses one TSV line of the FOLIO file into its raw fields."""
+    parts = line.strip().split("\t")
+
+    # unpack the line into variables
+    premises, premises_fol, conclusion, conclusion_fol, label = parts
+
+    # parse the lists
+    premises = ast.literal_eval(premises)
+    premises_fol = ast.literal_eval(premises_fol)
+
+    return {
+        "premises": premises,
+        "premises-FOL": premises_fol,
+        "conclusion": conclusion,
+        "conclusion-FOL": conclusion_fol,
+        "label": label
+    }
+
+
 def load_folio_data():
     data_dict = {}
     with open(FOLIO_FILE_PATH, "r", encoding="utf-8") as f:
         header = f.readline().strip().split("\t")  # read header
         for line_num, line in enumerate(f, start=1):  # start=1 so first data line is key=1
-            parts = line.strip().split("\t")
-
-            # unpack the line into variables
-            premises, premises_fol, conclusion, conclusion_fol, label = parts
-
-            # parse the lists
-            premises = ast.literal_eval(premises)
-            premises_fol = ast.literal_eval(premises_fol)
-
             # use line number as key
-            key = line_num
-
-            # build dictionary entry
-            value = {
-                "premises": premises,
-                "premises-FOL": premises_fol,
-                "conclusion": conclusion,
-                "conclusion-FOL": conclusion_fol,
-                "label": label
-            }
-
-            data_dict[key] = value
+            data_dict[line_num] = _parse_folio_line(line)
 
     return data_dict
 
@@ -156,6 +167,117 @@ def reshape_data(dataset):
 
 
 
+def compress_folio_entry(value):
+    """
+    Compresses the FOL premises and conclusion of one FOLIO entry
+    with a fresh abbreviation map.
+    """
+    fol_premises = value.get("premises-FOL", []) or []
+    fol_conclusion = value.get("conclusion-FOL", "") or ""
+    label = value.get("label")
+
+    # fresh mapping per example
+    compressor = SymbolCompressor()
+    compressed_premises = [compressor.compress(prem) for prem in fol_premises]
+    compressed_conclusion = compressor.compress(fol_conclusion) if fol_conclusion else ""
+
+    return {
+        "premises": compressed_premises,
+        "conclusion": compressed_conclusion,
+        "label": label,
+        "map": compressor.map
+    }
+
+
+class FolioRecord:
+    """
+    One compressed FOLIO example.
+    id is its 1-based data line number (blank lines not counted), the key
+    load_folio_data and snapshot.Snapshot use.
+    """
+
+    __slots__ = ("id", "premises", "conclusion", "label", "map")
+
+    def __init__(self, id, premises, conclusion, label, map):
+        self.id = id
+        self.premises = premises
+        self.conclusion = conclusion
+        self.label = label
+        self.map = map
+
+    @classmethod
+    def from_dict(cls, id, entry):
+        return cls(id, entry["premises"], entry["conclusion"], entry["label"], entry["map"])
+
+    def as_dict(self):
+        """The dict compress_folio_entry returns."""
+        return {"premises": self.premises, "conclusion": self.conclusion, "label": self.label, "map": self.map}
+
+    def __eq__(self, other):
+        return isinstance(other, FolioRecord) and all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+
+    def __repr__(self):
+        return f"FolioRecord({self.id}: {', '.join(self.premises)} ⊢ {self.conclusion}; {self.label})"
+
+
+def _parse_folio_fol_fields(line):
+    """Like _parse_folio_line, but only evaluates the FOL columns (the only ones compressed)."""
+    _, premises_fol, _, conclusion_fol, label = line.strip().split("\t")
+    return {
+        "premises-FOL": ast.literal_eval(premises_fol),
+        "conclusion-FOL": conclusion_fol,
+        "label": label
+    }
+
+
+def stream_folio(file_path=None, start=1, stop=None):
+    """
+    Lazily yields a FolioRecord per example with id in [start, stop) (stop=None: to the end).
+    Lines outside the range are only counted, never parsed, so a split can be
+    sharded by line range (see folio_shards).
+    """
+    with open(file_path or FOLIO_FILE_PATH, "r", encoding="utf-8") as f:
+        f.readline()  # skip header
+        record_id = 0
+        for line in f:
+            if not line.strip():
+                continue
+            record_id += 1
+            if record_id < start:
+                continue
+            if stop is not None and record_id >= stop:
+                break
+            entry = compress_folio_entry(_parse_folio_fol_fields(line))
+            yield FolioRecord.from_dict(record_id, entry)
+
+
+def count_folio_records(file_path=None):
+    """Number of examples in the split, without parsing them."""
+    with open(file_path or FOLIO_FILE_PATH, "r", encoding="utf-8") as f:
+        f.readline()  # skip header
+        return sum(1 for line in f if line.strip())
+
+
+def shard_ranges(total, shards):
+    """Splits ids 1..total into `shards` contiguous (start, stop) ranges."""
+    bounds = [1 + total * i // shards for i in range(shards + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+
+def folio_shards(shards, file_path=None):
+    """Splits the split's ids into `shards` contiguous (start, stop) ranges for stream_folio."""
+    return shard_ranges(count_folio_records(file_path), shards)
+
+
+def iter_folio_data(file_path=None):
+    """
+    Lazily yields the same dicts as `get_folio_data`, one line at a time,
+    so a whole split can be streamed without holding it in memory.
+    """
+    for record in stream_folio(file_path):
+        yield record.as_dict()
+
+
 '''
 API function called to get the data in a good, clean format.
 '''
@@ -170,136 +292,97 @@ def get_folio_data():
         "map": {<abbreviation>: <original symbol>}
       }
     """
-    result = []
+    return list(iter_folio_data())
 
-    # Get the data into a dictionary (assumes this is defined elsewhere)
-    data_dict = load_folio_data()
 
-    for _, value in data_dict.items():
-        fol_premises = value.get("premises-FOL", []) or []
-        fol_conclusion = value.get("conclusion-FOL", "") or ""
-        label = value.get("label")
+import re
+import string
+from WFFs.strictWFFs import TERM_PATTERN, symbol_names
 
-        # fresh mapping per example
-        abbr_map = None
-        compressed_premises = []
-        for prem in fol_premises:
-            comp, abbr_map = compress_fol(prem, abbr_map)
-            compressed_premises.append(comp)
 
-        compressed_conclusion = ""
-        if fol_conclusion:
-            compressed_conclusion, abbr_map = compress_fol(fol_conclusion, abbr_map)
+# Quantified variables, and predicate applications with their comma-separated arguments
+_QUANTIFIED_VARIABLE = re.compile(r"[∀∃]\s*([a-z]\w*)")
+_COMPRESSIBLE = re.compile(r"([∀∃])\s*([a-z]\w*)|(\w+)\(([^()]*)\)")
 
-        result.append({
-            "premises": compressed_premises,
-            "conclusion": compressed_conclusion,
-            "label": label,
-            "map": abbr_map or {}
-        })
 
-    return result
+class SymbolCompressor:
+    """
+    Abbreviates the predicates and terms of one example's formulas, consistently
+    across calls. Symbols come from strictWFFs.symbol_names, so there is no limit
+    on how many an example can have (A..Z, A1..Z1, ...; a..z, a1..z1, ...).
+    Bound variables are kept as written unless that would clash with a constant's
+    abbreviation (or isn't a valid symbol), in which case they get a fresh one.
+    """
 
+    def __init__(self, existing_map=None):
+        self.predicates = {}   # original -> abbreviation
+        self.terms = {}
+        self._used = set()     # every abbreviation and bound variable name handed out
+        self._term_symbols = set()
+        self._pred_names = symbol_names(string.ascii_uppercase)
+        self._term_names = symbol_names(string.ascii_lowercase)
+        for abbr, original in (existing_map or {}).items():
+            if abbr[0].isupper():
+                self.predicates[original] = abbr
+            else:
+                self.terms[original] = abbr
+                self._term_symbols.add(abbr)
+            self._used.add(abbr)
+
+    def _fresh(self, names):
+        for name in names:
+            if name not in self._used:
+                self._used.add(name)
+                return name
+
+    def _predicate(self, name):
+        if name not in self.predicates:
+            self.predicates[name] = self._fresh(self._pred_names)
+        return self.predicates[name]
+
+    def _term(self, name, bound):
+        if name in bound:
+            return bound[name]
+        if name not in self.terms:
+            abbr = self._fresh(self._term_names)
+            self.terms[name] = abbr
+            self._term_symbols.add(abbr)
+        return self.terms[name]
+
+    def _bound_variables(self, expression):
+        bound = {}
+        for variable in _QUANTIFIED_VARIABLE.findall(expression):
+            if variable in bound:
+                continue
+            if TERM_PATTERN.fullmatch(variable) and variable not in self._term_symbols:
+                self._used.add(variable)
+                bound[variable] = variable
+            else:
+                bound[variable] = self._fresh(self._term_names)
+        return bound
 
-import re
-import string
+    def compress(self, expression):
+        bound = self._bound_variables(expression)
 
-# def compress_fol(expression, existing_map=None):
-#     # Fresh pools for each call
-#     pred_pool = iter(string.ascii_uppercase)  # A, B, C...
-#     term_pool = iter(string.ascii_lowercase)  # a, b, c...
-
-#     # Split existing map into predicate + term mappings
-#     pred_map, term_map = {}, {}
-#     if existing_map:
-#         for k, v in existing_map.items():
-#             if k[0].isupper():   # predicates
-#                 pred_map[v] = k
-#             else:                # terms
-#                 term_map[v] = k
-
-#     # Functions to get or assign new symbols
-#     def get_pred(sym):
-#         if sym not in pred_map:
-#             nxt = next(pred_pool)
-#             # Skip symbols already used
-#             while nxt in pred_map.values():
-#                 nxt = next(pred_pool)
-#             pred_map[sym] = nxt
-#         return pred_map[sym]
-
-#     def get_term(sym):
-#         if sym not in term_map:
-#             nxt = next(term_pool)
-#             while nxt in term_map.values():
-#                 nxt = next(term_pool)
-#             term_map[sym] = nxt
-#         return term_map[sym]
-
-#     # Regex to find predicates with arguments
-#     pattern = re.compile(r'(\w+)\(([^()]*)\)')
-
-#     def replacer(match):
-#         pred = match.group(1)
-#         args = [arg.strip() for arg in match.group(2).split(",")]
-#         return get_pred(pred) + "".join(get_term(a) for a in args)
-
-#     compressed_expr = pattern.sub(replacer, expression)
-
-#     # Build combined map (inverse of pred_map/term_map)
-#     full_map = {v: k for k, v in pred_map.items()}
-#     full_map.update({v: k for k, v in term_map.items()})
-
-#     return compressed_expr, full_map
+        def replacer(match):
+            quantifier, variable, pred, args = match.groups()
+            if quantifier:
+                return quantifier + bound[variable]
+            return self._predicate(pred) + "".join(self._term(arg.strip(), bound) for arg in args.split(","))
 
-def compress_fol(expression, existing_map=None):
-    pred_pool = iter(string.ascii_uppercase)
-    term_pool = iter(string.ascii_lowercase)
+        return _COMPRESSIBLE.sub(replacer, expression)
 
-    pred_map, term_map = {}, {}
-    bound_vars = set()
+    @property
+    def map(self):
+        """Abbreviation -> original symbol."""
+        full_map = {v: k for k, v in self.predicates.items()}
+        full_map.update({v: k for k, v in self.terms.items()})
+        return full_map
 
-    if existing_map:
-        for k, v in existing_map.items():
-            if k[0].isupper():
-                pred_map[v] = k
-            else:
-                term_map[v] = k
-
-    def get_pred(sym):
-        if sym not in pred_map:
-            nxt = next(pred_pool)
-            while nxt in pred_map.values():
-                nxt = next(pred_pool)
-            pred_map[sym] = nxt
-        return pred_map[sym]
-
-    def get_term(sym):
-        if sym in bound_vars:
-            return sym  # keep bound variables as-is
-        if sym not in term_map:
-            nxt = next(term_pool)
-            while nxt in term_map.values():
-                nxt = next(term_pool)
-            term_map[sym] = nxt
-        return term_map[sym]
-
-    # Detect bound variables (quantifiers)
-    for match in re.finditer(r'[∀∃]\s*([a-z])', expression):
-        bound_vars.add(match.group(1))
-
-    pattern = re.compile(r'(\w+)\(([^()]*)\)')
-    def replacer(match):
-        pred = match.group(1)
-        args = [arg.strip() for arg in match.group(2).split(",")]
-        return get_pred(pred) + "".join(get_term(a) for a in args)
-
-    compressed_expr = pattern.sub(replacer, expression)
-
-    full_map = {v: k for k, v in pred_map.items()}
-    full_map.update({v: k for k, v in term_map.items()})
-
-    return compressed_expr, full_map
+
+def compress_fol(expression, existing_map=None):
+    compressor = SymbolCompressor(existing_map)
+    return compressor.compress(expression), compressor.map
 
 
 def relabel_folio_data(labels):
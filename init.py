@@ -1,76 +1,201 @@
-from itertools import chain
-from get_data import get_folio_data, reshape_data, relabel_folio_data
-from argument import Argument
-from WFFs.WFF_conversion import strict_to_cnf 
-from constants import VALID, INVALID
+import argparse
+from functools import partial
+from itertools import islice
+from pipeline import (Pipeline, Stage, default_stages, records_from_folio, records_from_logical_entailment,
+                      canonicalize_stage, restore_stage, deduplicated)
+from instrumentation import ChromeTraceSink, MemorySummary, allocation_sites, format_bytes
+from constants import VALID, INVALID, ENCODINGS, AUTO_ENCODING, DEFAULT_CACHE_PATH, DEFAULT_SNAPSHOT_PATH, DEFAULT_PROFILE_DIR
+from structured_logging import get_logger, configure, lazy, fields, DEBUG, INFO, WARNING
+
+logger = get_logger("init")
 
 # Toggle verbosity here
 VERBOSE_MODE = True
 
-
-def main():
-    # === 1. Load and prepare dataset ===
-    f_data = get_folio_data()
-    arguments, labels, maps = reshape_data(f_data)
-    labels = relabel_folio_data(labels)
-
-    # === 2. Process and evaluate arguments ===
-    total, correct = 0, 0
-
-    for i, (premises_raw, conclusion_raw) in enumerate(arguments[:20]):  # limit for sanity
+DATASETS = ["folio", "logical-entailment"]
+
+# Number of arguments evaluated (None for the whole split)
+ARGUMENT_LIMIT = 20
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate the FOLIO split with the SAT pipeline.")
+    parser.add_argument("--dataset", choices=DATASETS, default="folio",
+                        help="FOLIO (first-order) or the propositional logical-entailment dataset")
+    parser.add_argument("--data", metavar="PATH", default=None,
+                        help="dataset file (default: the dataset's standard path)")
+    parser.add_argument("--limit", type=int, default=ARGUMENT_LIMIT,
+                        help=f"number of arguments to evaluate (default {ARGUMENT_LIMIT})")
+    parser.add_argument("--all", action="store_true", help="evaluate the whole split (overrides --limit)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="evaluate in a process pool with this many workers (0 = one per core)")
+    parser.add_argument("--chunksize", type=int, default=8, help="arguments per worker task")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="collect per-argument metrics and write a Chrome trace (chrome://tracing) to PATH")
+    parser.add_argument("--max-clauses", type=int, default=None,
+                        help="skip arguments whose CNF would exceed this many clauses and report why")
+    parser.add_argument("--encoding", choices=ENCODINGS, default=AUTO_ENCODING,
+                        help="CNF encoding: direct distribution, definitional (Tseitin), or auto per premise")
+    parser.add_argument("--cache", nargs="?", const=DEFAULT_CACHE_PATH, metavar="PATH",
+                        help=f"reuse results stored in a SQLite cache (default {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--snapshot", nargs="?", const=DEFAULT_SNAPSHOT_PATH, metavar="PATH",
+                        help=f"load the split from a precompiled snapshot, rebuilt when the TSV changes "
+                             f"(default {DEFAULT_SNAPSHOT_PATH})")
+    parser.add_argument("--shard", metavar="I/N", default=None,
+                        help="evaluate only the I-th of N contiguous line ranges of the split (1-based)")
+    parser.add_argument("--prefetch", type=int, default=0, metavar="N",
+                        help="load up to N arguments ahead in a background thread")
+    parser.add_argument("--results", metavar="PATH",
+                        help="write one JSON line per argument (labels, timings, counts, counterexample) to PATH")
+    parser.add_argument("--results-max-bytes", type=int, default=None, metavar="N",
+                        help="rotate the results file once it reaches N bytes")
+    parser.add_argument("--quiet", action="store_true", help="print only the summary")
+    parser.add_argument("--log-json", action="store_true",
+                        help="write per-argument log records as JSON lines with structured fields")
+    parser.add_argument("--dedupe", action="store_true",
+                        help="solve each argument up to renaming of predicates and constants only once")
+    parser.add_argument("--profile", nargs="?", const=DEFAULT_PROFILE_DIR, metavar="DIR",
+                        help=f"profile each stage with cProfile and write .pstats files and collapsed stacks "
+                             f"to DIR (default {DEFAULT_PROFILE_DIR})")
+    parser.add_argument("--memory", action="store_true",
+                        help="trace memory with tracemalloc: peak and retained bytes of grounding, CNF and "
+                             "solving per argument, a per-stage table and the top allocation sites")
+    args = parser.parse_args(argv)
+    if args.profile and args.workers is not None:
+        parser.error("--profile runs the pipeline in this process; drop --workers")
+    if args.memory and args.workers is not None:
+        parser.error("--memory traces this process only; drop --workers")
+    if args.snapshot and args.dataset != "folio":
+        parser.error("--snapshot is only available for the FOLIO dataset")
+    if args.shard is not None:
+        try:
+            index, count = (int(part) for part in args.shard.split("/"))
+        except ValueError:
+            parser.error("--shard must look like I/N, e.g. 2/4")
+        if not 1 <= index <= count:
+            parser.error("--shard index must be between 1 and N")
+        args.shard = (index, count)
+    return args
+
+
+def _shard_range(args):
+    from get_data import shard_ranges, count_folio_records, count_logical_entailment_records
+    index, count = args.shard
+    count_records = count_folio_records if args.dataset == "folio" else count_logical_entailment_records
+    return shard_ranges(count_records(args.data), count)[index - 1]
+
+
+def _format_clauses(cnf_wff) -> str:
+    return "\n".join(str(clause) for clause in cnf_wff.get_clauses())
+
+
+def _format_model(model) -> str:
+    return "\n".join(f"  {var} = {val}" for var, val in model.items())
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    limit = None if args.all else args.limit
+    configure(WARNING if args.quiet else DEBUG if VERBOSE_MODE else INFO, json_format=args.log_json)
+
+    # === 1. Stream the dataset through parse → ground → CNF → solve ===
+    start, stop = 1, None
+    if args.shard is not None:
+        start, stop = _shard_range(args)
+    if args.memory:
+        import tracemalloc
+        tracemalloc.start()
+        memory_baseline = tracemalloc.take_snapshot()
+    # Stage timings are stored with cached results, so caching turns metrics on
+    options = dict(instrument=bool(args.trace or args.cache or args.results or args.memory),
+                   max_clauses=args.max_clauses,
+                   encoding=args.encoding, start=start, stop=stop, prefetch=args.prefetch)
+    if args.dataset == "folio":
+        records = records_from_folio(args.data, snapshot=args.snapshot, **options)
+    else:
+        records = records_from_logical_entailment(args.data, **options)
+    records = islice(records, limit)
+    profiler = None
+    if args.profile:
+        from profiling import StageProfiler
+        profiler = StageProfiler()
+        records = profiler.iterate("load", records)
+    if args.dedupe:
+        records = Stage("canonicalize", canonicalize_stage).run(records)
+    result_cache = None
+    if args.cache:
+        from result_cache import ResultCache, lookup_stage
+        result_cache = ResultCache(args.cache)
+        records = Stage("lookup", partial(lookup_stage, result_cache)).run(records)
+
+    def evaluate(records):
+        if args.workers is None:
+            return Pipeline(default_stages(profiler=profiler)).run(records)
+        from parallel import evaluate_parallel
+        return evaluate_parallel(records, workers=args.workers or None,
+                                 chunksize=args.chunksize, keep_cnf=logger.isEnabledFor(DEBUG))
+
+    results = deduplicated(records, evaluate) if args.dedupe else evaluate(records)
+    if result_cache is not None:
+        from result_cache import store_stage
+        results = Stage("store", partial(store_stage, result_cache)).run(results)
+    if args.dedupe:
+        results = Stage("restore", restore_stage).run(results)
+    result_log = None
+    if args.results:
+        from result_log import ResultLog, log_stage
+        result_log = ResultLog(args.results, max_bytes=args.results_max_bytes)
+        results = Stage("log", partial(log_stage, result_log)).run(results)
+
+    # === 2. Evaluate arguments as they come out of the pipeline ===
+    total, correct, duplicates = 0, 0, 0
+    trace_sink = ChromeTraceSink() if args.trace else None
+    memory_summary = MemorySummary() if args.memory else None
+
+    for record in results:
+        i = record["index"]
         total += 1
-        expected = labels[i] if i < len(labels) else None
-
-        if VERBOSE_MODE:
-            print("\n" + "=" * 80)
-            print(f"ARGUMENT #{i+1}")
-            print("=" * 80)
-
-        # --- Create argument ---
-        argument = Argument(premises_raw, conclusion_raw)
-
-        if not argument.solvable(): continue
-
-        if VERBOSE_MODE:
-            print("\n--- Original Argument ---")
-            print(argument)
-
-        # --- Step 1: Quantifier Expansion ---
-        result = argument.expand_quantifiers()
-
-
-        # --- Step 2: Convert to CNF ---
-        cnf_wff = argument.to_cnf()
-
-        if VERBOSE_MODE:
-            print("\n--- CNF Form ---")
-            print(cnf_wff)
-            print("\nCNF Clauses:")
-            for clause in cnf_wff.get_clauses():
-                print(clause)
+        expected = record["label"]
+        duplicates += bool(record.get("duplicate"))
+
+        if trace_sink is not None and record.get("metrics") is not None:
+            trace_sink.emit(record["metrics"])
+        if memory_summary is not None and record.get("metrics") is not None:
+            memory_summary.emit(record["metrics"], label=f"#{i + 1}")
+
+        logger.debug("\n%s\nARGUMENT #%d\n%s", "=" * 80, i + 1, "=" * 80)
+
+        if record.get("blowup") is not None:
+            logger.warning("Argument #%d: skipped, %s\n%s", i + 1, record["error"], record["blowup"],
+                           extra=fields(id=i + 1, error=record["error"]))
+        if not record["solvable"]: continue
+
+        logger.debug("\n--- Original Argument ---\n%s ⊢ %s", lazy(", ".join, record["premises"]), record["conclusion"])
+        cnf_wff = record.get("cnf")
+        if record.get("duplicate"):
+            logger.debug("\n(result shared with an earlier argument of the same shape)")
+        elif cnf_wff is None:
+            logger.debug("\n(result loaded from cache)")
+        else:
+            logger.debug("\n--- CNF Form ---\n%s\n\nCNF Clauses:\n%s", cnf_wff, lazy(_format_clauses, cnf_wff))
 
-        # --- Step 3: Solve with PySAT ---
-        is_valid, counterexample = argument.solve()
-        computed_label = VALID if is_valid else INVALID
+        is_valid, counterexample = record["is_valid"], record["counterexample"]
+        computed_label = record["computed_label"]
         matches = expected is None or computed_label == expected
 
-        if VERBOSE_MODE:
-            print("\n--- SAT Evaluation ---")
-            print(f"Expected: {expected}")
-            print(f"Computed: {computed_label}")
+        if logger.isEnabledFor(DEBUG):
+            logger.debug("\n--- SAT Evaluation ---\nExpected: %s\nComputed: %s", expected, computed_label)
             if not is_valid and counterexample:
-                print("Counterexample model:")
-                for var, val in counterexample.items():
-                    print(f"  {var} = {val}")
-            print(f"✅ Match: {matches}")
-            print("=" * 80 + "\n")
+                logger.debug("Counterexample model:\n%s", lazy(_format_model, counterexample))
+            logger.debug("✅ Match: %s", matches)
+            if record.get("metrics") is not None:
+                logger.debug("%r", record["metrics"])
+            logger.debug("%s\n", "=" * 80)
         else:
-            status_icon = "✅" if matches else "❌"
-            print(
-                f"{status_icon}  Argument #{i+1:02d}: "
-                f"Expected={expected:7s}  |  Solved={computed_label:7s}  "
-                f"{'(Counterexample found)' if not is_valid else ''}"
-            )
+            logger.info("%s  Argument #%02d: Expected=%-7s  |  Solved=%-7s  %s",
+                        "✅" if matches else "❌", i + 1, expected, computed_label,
+                        "(Counterexample found)" if not is_valid else "",
+                        extra=fields(id=i + 1, expected=expected, computed=computed_label, match=matches))
 
         if matches:
             correct += 1
@@ -82,8 +207,43 @@ def main():
     print(f"Total arguments evaluated: {total}")
     print(f"Correctly matched labels:   {correct}")
     print(f"Accuracy:                   {correct / total:.2%}")
+    if args.dedupe:
+        print(f"Isomorphic duplicates:     {duplicates} reused, {total - duplicates} solved")
+    if args.workers is None:
+        from formula_cache import cache_stats
+        stats = cache_stats()
+        for title, name in [("Grounding cache:", "grounding"), ("CNF cache:", "cnf")]:
+            print(f"{title:27s}{stats[name]['hits']} hits, {stats[name]['misses']} misses "
+                  f"({stats[name]['hit_rate']:.0%})")
     print("=" * 80)
 
+    if result_cache is not None:
+        stats = result_cache.stats()
+        print(f"Result cache:              {stats['hits']} reused, {stats['misses']} solved, "
+              f"{stats['entries']} stored")
+        result_cache.close()
+
+    if result_log is not None:
+        result_log.close()
+        print(f"{result_log.rows_written} results written to {args.results}")
+
+    if trace_sink is not None:
+        trace_sink.write(args.trace)
+        print(f"Trace written to {args.trace}")
+
+    if memory_summary is not None:
+        print("Memory per stage (Python heap via tracemalloc; native = growth of max RSS while solving):")
+        print(memory_summary.table())
+        print("Top allocation sites still live at the end of the run:")
+        for site, size, blocks in allocation_sites(memory_baseline):
+            print(f"  {format_bytes(size):>10}  {blocks:>8} blocks  {site}")
+        tracemalloc.stop()
+
+    if profiler is not None:
+        profiler.write(args.profile)
+        print(profiler.summary())
+        print(f"Profiles written to {args.profile}")
+
 
 if __name__ == "__main__":
     main()
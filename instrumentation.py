@@ -0,0 +1,263 @@
+"""
+instrumentation.py
+
+Opt-in per-argument metrics for the parse → ground → CNF → solve pipeline.
+
+- `Metrics` collects stage timings, counts (nodes, clauses, variables) and solver stats.
+- Instrumented code takes `metrics=None` and uses `stage(metrics, name)`, which is
+  a no-op when metrics are off.
+- Sinks receive finished Metrics; `ChromeTraceSink` writes a chrome://tracing
+  (or Perfetto) timeline of a whole dataset run.
+- While tracemalloc is tracing, the MEMORY_STAGES also record peak and retained
+  Python heap bytes in `Metrics.memory`, and the SAT call records how far it pushed
+  the process's maximum RSS (the solver's native memory is invisible to tracemalloc).
+  tracemalloc is process-wide, so figures are only per-stage when stages run one at a
+  time in a single thread. `MemorySummary` aggregates them over a run.
+"""
+
+import os
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional, Tuple
+
+from constants import ATOMIC_WFF
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+# Stages whose memory is accounted; they must not nest inside each other
+MEMORY_STAGES = ("expand", "cnf", "solve")
+
+
+class Metrics:
+    """Metrics for one argument. Plain data, so it pickles across process pools."""
+
+    def __init__(self, label: Optional[str] = None):
+        self.label = label
+        self.stages: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.solver: Dict[str, int] = {}
+        self.memory: Dict[str, Dict[str, int]] = {}
+        self.events: List[Dict] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Times a block, accumulating into `stages[name]` and recording a trace event.
+        For MEMORY_STAGES while tracemalloc is tracing, also accounts its memory.
+        """
+        memory = name in MEMORY_STAGES and _tracemalloc().is_tracing()
+        if memory:
+            tracemalloc = _tracemalloc()
+            heap_start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            end = time.perf_counter()
+            self.stages[name] = self.stages.get(name, 0.0) + (end - start)
+            self.events.append({
+                "name": name, "start": start, "duration": end - start,
+                "pid": os.getpid(), "tid": threading.get_ident(),
+            })
+            if memory:
+                heap_end, heap_peak = tracemalloc.get_traced_memory()
+                entry = self.memory.setdefault(name, {})
+                entry["peak"] = max(entry.get("peak", 0), heap_peak - heap_start)
+                entry["retained"] = entry.get("retained", 0) + heap_end - heap_start
+
+    @contextmanager
+    def native_memory(self, name: str):
+        """Records under `memory[name]["native"]` how much a block raised the process's maximum RSS."""
+        if resource is None or not _tracemalloc().is_tracing():
+            yield self
+            return
+        before = max_rss_bytes()
+        try:
+            yield self
+        finally:
+            entry = self.memory.setdefault(name, {})
+            entry["native"] = max(entry.get("native", 0), max_rss_bytes() - before)
+
+    def add_counts(self, counts: Dict[str, int]) -> None:
+        """Adds `counts` to the running counts."""
+        for name, n in counts.items():
+            self.counts[name] = self.counts.get(name, 0) + n
+
+    def merge(self, other: "Metrics") -> None:
+        """Adds another Metrics' stage times, counts and trace events to these."""
+        for name, seconds in other.stages.items():
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+        self.add_counts(other.counts)
+        self.events.extend(other.events)
+
+    def to_dict(self) -> Dict:
+        return {
+            "label": self.label,
+            "stages": dict(self.stages),
+            "counts": dict(self.counts),
+            "solver": dict(self.solver),
+            "memory": {name: dict(entry) for name, entry in self.memory.items()},
+        }
+
+    def __repr__(self) -> str:
+        timings = ", ".join(f"{k}={1000 * v:.2f}ms" for k, v in self.stages.items())
+        memory = "".join(f"; {name} memory {entry}" for name, entry in self.memory.items())
+        return f"Metrics({self.label}: {timings}; {self.counts}; {self.solver}{memory})"
+
+
+def stage(metrics: Optional[Metrics], name: str):
+    """`metrics.stage(name)` if metrics are on, otherwise a no-op context."""
+    return metrics.stage(name) if metrics is not None else nullcontext()
+
+
+def _tracemalloc():
+    import tracemalloc  # only needed once memory is accounted
+    return tracemalloc
+
+
+def native_memory(metrics: Optional[Metrics], name: str):
+    """`metrics.native_memory(name)` if metrics are on, otherwise a no-op context."""
+    return metrics.native_memory(name) if metrics is not None else nullcontext()
+
+
+def max_rss_bytes() -> int:
+    """The process's maximum resident set size so far (0 where `resource` is unavailable)."""
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def count_nodes(wff) -> int:
+    """Number of nodes in a StrictWFF tree (shared subtrees counted once per occurrence)."""
+    count, stack = 0, [wff]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if node.type != ATOMIC_WFF:
+            if node.operand1 is not None:
+                stack.append(node.operand1)
+            if node.operand2 is not None:
+                stack.append(node.operand2)
+    return count
+
+
+# ==========================================================
+# --- Sinks ---
+# ==========================================================
+
+class MetricsSink(ABC):
+    """Receives finished Metrics. Subclasses implement `emit`."""
+
+    @abstractmethod
+    def emit(self, metrics: Metrics) -> None:
+        """Called once per finished argument."""
+
+
+class ListSink(MetricsSink):
+    """Keeps every Metrics in memory."""
+
+    def __init__(self):
+        self.metrics: List[Metrics] = []
+
+    def emit(self, metrics: Metrics) -> None:
+        self.metrics.append(metrics)
+
+
+class ChromeTraceSink(MetricsSink):
+    """
+    Collects stage events in the Chrome trace event format.
+    Each argument gets its own row (tid) so a dataset run reads as a timeline.
+    """
+
+    def __init__(self):
+        self.events: List[Dict] = []
+        self._rows = 0
+
+    def emit(self, metrics: Metrics) -> None:
+        self._rows += 1
+        row = self._rows
+        name = metrics.label if metrics.label is not None else f"argument {row}"
+        self.events.append({"name": "thread_name", "ph": "M", "pid": 0, "tid": row,
+                            "args": {"name": str(name)}})
+        for event in metrics.events:
+            self.events.append({
+                "name": event["name"], "ph": "X", "pid": 0, "tid": row,
+                "ts": event["start"] * 1e6, "dur": event["duration"] * 1e6,
+                "args": {"os_pid": event["pid"], "os_tid": event["tid"]},
+            })
+        self.events.append({"name": "metrics", "ph": "i", "s": "t", "pid": 0, "tid": row,
+                            "ts": (metrics.events[-1]["start"] if metrics.events else 0) * 1e6,
+                            "args": {**metrics.counts, **metrics.solver}})
+
+    def write(self, path: str) -> None:
+        import json
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+
+
+class MemorySummary(MetricsSink):
+    """
+    Aggregates `Metrics.memory` over a run: per stage, the largest and mean peak,
+    the mean retained bytes, the largest native growth, and which argument peaked.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Dict] = {}
+
+    def emit(self, metrics: Metrics, label=None) -> None:
+        """Adds one argument's figures; `label` (default metrics.label) names it in the table."""
+        label = metrics.label if label is None else label
+        for name, entry in metrics.memory.items():
+            row = self.stages.setdefault(name, {"arguments": 0, "peak_max": 0, "peak_total": 0,
+                                                "retained_total": 0, "native_max": 0, "peak_label": None})
+            row["arguments"] += 1
+            peak = entry.get("peak", 0)
+            if row["arguments"] == 1 or peak > row["peak_max"]:
+                row["peak_max"], row["peak_label"] = peak, label
+            row["peak_total"] += peak
+            row["retained_total"] += entry.get("retained", 0)
+            row["native_max"] = max(row["native_max"], entry.get("native", 0))
+
+    def table(self) -> str:
+        lines = [f"  {'stage':<10}{'args':>6}  {'max peak':>10}  {'mean peak':>10}  {'mean kept':>10}"
+                 f"  {'native':>10}  peak argument"]
+        for name, row in self.stages.items():
+            n = row["arguments"]
+            lines.append(f"  {name:<10}{n:>6}  {format_bytes(row['peak_max']):>10}  "
+                         f"{format_bytes(row['peak_total'] / n):>10}  {format_bytes(row['retained_total'] / n):>10}"
+                         f"  {format_bytes(row['native_max']):>10}  {row['peak_label']}")
+        return "\n".join(lines)
+
+
+def allocation_sites(baseline: "tracemalloc.Snapshot", n: int = 10) -> List[Tuple[str, int, int]]:
+    """
+    The `n` source lines whose live allocations grew most since `baseline`:
+    (file:line, bytes, blocks). Needs tracemalloc tracing.
+    """
+    tracemalloc = _tracemalloc()
+    ignored = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+    snapshot = tracemalloc.take_snapshot().filter_traces(ignored)
+    sites = []
+    for stat in snapshot.compare_to(baseline.filter_traces(ignored), "lineno")[:n]:
+        if stat.size_diff <= 0:
+            break
+        frame = stat.traceback[0]
+        sites.append((f"{os.path.basename(frame.filename)}:{frame.lineno}", stat.size_diff, stat.count_diff))
+    return sites
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
@@ -0,0 +1,116 @@
+"""
+parallel.py
+
+Process-pool evaluation of whole datasets.
+
+- Each worker imports the solver backend once at start-up (`_init_worker`).
+- Records are sent to workers in chunks and come back in input order, so
+  accuracy and any printed report are deterministic regardless of worker count.
+- `solve_many` is the library-level batch API for lists of Arguments.
+"""
+
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from argument import Argument
+from instrumentation import Metrics
+from pipeline import Record, Stage, parse_stage, ground_stage, cnf_stage, solve_stage
+
+
+DEFAULT_CHUNKSIZE = 8
+
+
+# ==========================================================
+# --- Worker side ---
+# ==========================================================
+
+def _init_worker() -> None:
+    """Warm up a worker: load the native SAT solver once instead of per task."""
+    from pysat.solvers import Glucose3
+    Glucose3().delete()
+
+
+def evaluate_record(record: Record, keep_cnf: bool = False) -> Record:
+    """
+    Runs parse → ground → CNF → solve on one record.
+    The Argument (and the CNF unless `keep_cnf`) is dropped so only
+    the result is sent back to the parent process.
+    """
+    for stage in (parse_stage, ground_stage, cnf_stage, solve_stage):
+        record = stage(record)
+    record.pop("argument", None)
+    if not keep_cnf:
+        record.pop("cnf", None)
+    return record
+
+
+def _solve_argument_task(argument: Argument) -> Tuple[Tuple[Optional[bool], Optional[dict]], Optional[Metrics]]:
+    """The result of one argument and its (worker-side) metrics; sinks are emitted by the parent."""
+    if not argument.solvable():
+        return (None, None), argument.metrics
+    argument.expand_quantifiers()
+    return argument.solve(), argument.metrics
+
+
+# ==========================================================
+# --- Parent side ---
+# ==========================================================
+
+def make_executor(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """A process pool with warm workers (defaults to one per core)."""
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker)
+
+
+def evaluate_parallel(records: Iterable[Record], workers: Optional[int] = None,
+                      chunksize: int = DEFAULT_CHUNKSIZE, keep_cnf: bool = False) -> Iterator[Record]:
+    """
+    Evaluates records across a process pool, yielding results in input order.
+    At most two chunks per worker are in flight, so the input is streamed.
+    """
+    workers = workers or os.cpu_count()
+    with make_executor(workers) as executor:
+        stage = Stage("evaluate", partial(evaluate_record, keep_cnf=keep_cnf),
+                      executor=executor, batch_size=chunksize, max_pending=2 * workers)
+        yield from stage.run(records)
+
+
+def solve_many(arguments: Iterable[Argument], workers: Optional[int] = None,
+               chunksize: int = DEFAULT_CHUNKSIZE) -> List[Tuple[Optional[bool], Optional[dict]]]:
+    """
+    Grounds and solves many Arguments in parallel.
+    Returns (is_valid, counterexample) per argument, in input order;
+    arguments that are not solvable give (None, None).
+    Instrumented arguments get the metrics their worker collected in `argument.metrics`,
+    and their sinks receive them here, in the parent, as after a sequential solve.
+    """
+    arguments = list(arguments)
+    if not arguments:
+        return []
+    workers = min(workers or os.cpu_count(), len(arguments))
+    # Sinks stay in the parent: they may hold files or collect results
+    tasks = [copy.copy(argument) for argument in arguments]
+    for task in tasks:
+        task.sink = None
+    results = []
+    with make_executor(workers) as executor:
+        for argument, (result, metrics) in zip(arguments, executor.map(_solve_argument_task, tasks,
+                                                                        chunksize=chunksize)):
+            argument.metrics = metrics
+            if argument.sink is not None and result != (None, None):
+                argument.sink.emit(metrics)
+            results.append(result)
+    return results
+
+
+def summarize(records: Iterable[Record]) -> dict:
+    """Ordered aggregation of results: total, correct and accuracy."""
+    total, correct = 0, 0
+    for record in records:
+        total += 1
+        expected = record.get("label")
+        if record.get("solvable") and (expected is None or record["computed_label"] == expected):
+            correct += 1
+    return {"total": total, "correct": correct, "accuracy": correct / total if total else 0.0}
@@ -0,0 +1,399 @@
+"""
+pipeline.py
+
+A streaming pipeline of generator stages: load → parse → ground → CNF → solve.
+
+- Each stage maps one record (a dict) to the same record with new keys filled in.
+- Stages are chained lazily, so a dataset streams through with bounded memory.
+- A stage may be given an executor (thread or process pool) and a batch size;
+  at most `max_pending` batches are in flight per stage, and results keep input order.
+- Records with `"instrument": True` carry an instrumentation.Metrics under "metrics".
+- Records with `"max_clauses"` stop before grounding/CNF if the CNF would be larger;
+  they come out unsolvable with a cnf_diagnostics.BlowupReport under "blowup".
+- `"encoding"` selects the CNF encoding (default "auto", see WFF_conversion.strict_to_cnf).
+- Records marked `"cached"` (see result_cache.lookup_stage) already carry a result
+  and pass through every stage untouched.
+- A sat_solving.CancelToken under `"cancel"` makes the solve interruptible (inline and
+  thread pools only: tokens do not pickle).
+- `prefetched` runs a record source in a background thread with a bounded buffer.
+- `canonicalize_stage` / `restore_stage` solve arguments under their canonical renaming
+  (see canonical.py), and `deduplicated` solves each isomorphism class only once.
+"""
+
+import queue
+from collections import deque
+from itertools import islice
+from threading import Event, Thread
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional
+
+from argument import Argument
+from sat_solving import solve_argument
+from instrumentation import stage
+from cnf_diagnostics import CnfBlowupError
+from constants import VALID, INVALID, AUTO_ENCODING, DIRECT_CLAUSE_LIMIT
+
+if TYPE_CHECKING:  # executors come from the caller; importing concurrent.futures here only slows startup
+    from concurrent.futures import Executor
+
+
+Record = Dict
+
+
+# ==========================================================
+# --- Stage functions ---
+# ==========================================================
+
+def parse_stage(record: Record) -> Record:
+    """Builds the Argument from raw premise/conclusion strings."""
+    if record.get("cached"):
+        return record
+    try:
+        argument = Argument(record["premises"], record["conclusion"],
+                            instrument=record.get("instrument", False), label=record.get("index"),
+                            max_clauses=record.get("max_clauses"),
+                            encoding=record.get("encoding") or AUTO_ENCODING,
+                            direct_clause_limit=record.get("direct_clause_limit") or DIRECT_CLAUSE_LIMIT)
+    except (ValueError, AssertionError, TypeError) as e:
+        record["argument"] = None
+        record["solvable"] = False
+        record["error"] = f"parse: {e}"
+        return record
+
+    record["argument"] = argument
+    record["solvable"] = argument.solvable()
+    if argument.metrics is not None:
+        record["metrics"] = argument.metrics
+    return record
+
+
+def ground_stage(record: Record) -> Record:
+    """Expands quantifiers over the argument's domain."""
+    if _pending(record):
+        try:
+            record["argument"].expand_quantifiers()
+        except CnfBlowupError as e:
+            _record_blowup(record, "ground", e)
+        except (ValueError, AssertionError) as e:
+            record["solvable"] = False
+            record["error"] = f"ground: {e}"
+    return record
+
+
+def cnf_stage(record: Record) -> Record:
+    """Converts the grounded validity WFF to CNF."""
+    if _pending(record):
+        try:
+            record["cnf"] = record["argument"].to_cnf()
+        except CnfBlowupError as e:
+            _record_blowup(record, "cnf", e)
+    return record
+
+
+def solve_stage(record: Record) -> Record:
+    """Solves the CNF and labels the argument valid/invalid."""
+    if _pending(record):
+        metrics = record.get("metrics")
+        with stage(metrics, "solve"):
+            is_valid, counterexample = solve_argument(record["cnf"], record.get("cancel"), metrics=metrics)
+        record["is_valid"] = is_valid
+        record["counterexample"] = counterexample
+        record["computed_label"] = VALID if is_valid else INVALID
+    return record
+
+
+def canonicalize_stage(record: Record) -> Record:
+    """
+    Replaces premises and conclusion by their canonical renaming, so every cache layer
+    keys on it; the originals and the renaming are kept for `restore_stage`.
+    """
+    from canonical import canonicalize
+    canonical = canonicalize(record["premises"], record["conclusion"])
+    record["original_premises"] = record["premises"]
+    record["original_conclusion"] = record["conclusion"]
+    record["premises"] = canonical.premises
+    record["conclusion"] = canonical.conclusion
+    record["canonical"] = canonical
+    record["fingerprint"] = canonical.fingerprint
+    return record
+
+
+def restore_stage(record: Record) -> Record:
+    """Undoes `canonicalize_stage`: original formulas, counterexample in original letters."""
+    canonical = record.pop("canonical", None)
+    if canonical is None:
+        return record
+    record["premises"] = record.pop("original_premises")
+    record["conclusion"] = record.pop("original_conclusion")
+    if record.get("counterexample"):
+        record["counterexample"] = canonical.original_model(record["counterexample"])
+    return record
+
+
+# Result fields copied from a solved record to its isomorphic duplicates
+RESULT_KEYS = ["solvable", "is_valid", "counterexample", "computed_label", "error", "blowup", "timings"]
+
+
+def deduplicated(records: Iterable[Record], run: Callable[[Iterator[Record]], Iterator[Record]]) -> Iterator[Record]:
+    """
+    Passes only the first record of each `fingerprint` through `run` (any ordered
+    record → record evaluator, inline or parallel); later records with the same
+    fingerprint copy its result. Output keeps input order.
+    Counterexamples are copied as-is, so records should still be in canonical form.
+    """
+    queue = deque()
+    seen, solved = set(), {}
+
+    def firsts():
+        for record in records:
+            queue.append(record)
+            if record["fingerprint"] in seen:
+                record["duplicate"] = True
+            else:
+                seen.add(record["fingerprint"])
+                yield record
+
+    def copy_result(record: Record) -> Record:
+        original = solved[record["fingerprint"]]
+        record.update({key: original[key] for key in RESULT_KEYS if key in original})
+        return record
+
+    for result in run(firsts()):
+        solved[result["fingerprint"]] = result
+        while queue:
+            record = queue.popleft()
+            if record.get("duplicate"):
+                yield copy_result(record)
+            else:
+                yield result
+                break
+    while queue:
+        yield copy_result(queue.popleft())
+
+
+def _pending(record: Record) -> bool:
+    return bool(record.get("solvable")) and not record.get("cached")
+
+
+def _record_blowup(record: Record, stage_name: str, error: CnfBlowupError) -> None:
+    record["solvable"] = False
+    record["error"] = f"{stage_name}: {error}"
+    record["blowup"] = error.report
+
+
+# ==========================================================
+# --- Stage plumbing ---
+# ==========================================================
+
+class Stage:
+    """
+    One pipeline stage.
+
+    fn:          record -> record
+    executor:    optional concurrent.futures Executor; None runs inline
+    batch_size:  records per task submitted to the executor
+    max_pending: bound on batches in flight for this stage
+    """
+
+    def __init__(self, name: str, fn: Callable[[Record], Record],
+                 executor: Optional["Executor"] = None, batch_size: int = 1, max_pending: int = 4):
+        if batch_size < 1 or max_pending < 1:
+            raise ValueError("batch_size and max_pending must be at least 1.")
+        self.name = name
+        self.fn = fn
+        self.executor = executor
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+
+    def run(self, records: Iterable[Record]) -> Iterator[Record]:
+        """Lazily applies this stage to a stream of records, preserving order."""
+        if self.executor is None:
+            for record in records:
+                yield self.fn(record)
+            return
+
+        pending = deque()
+        batches = _batched(records, self.batch_size)
+        for batch in batches:
+            pending.append(self.executor.submit(_run_batch, self.fn, batch))
+            if len(pending) >= self.max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    def __repr__(self) -> str:
+        mode = type(self.executor).__name__ if self.executor else "inline"
+        return f"Stage({self.name}, {mode}, batch={self.batch_size})"
+
+
+def _run_batch(fn: Callable[[Record], Record], batch: List[Record]) -> List[Record]:
+    """Top-level so it can be pickled into process pools."""
+    return [fn(record) for record in batch]
+
+
+def _batched(records: Iterable[Record], size: int) -> Iterator[List[Record]]:
+    it = iter(records)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def prefetched(items: Iterable, size: int) -> Iterator:
+    """
+    Iterates `items` in a background thread, staying at most `size` items ahead of
+    the consumer, so loading overlaps with solving. Producer errors are re-raised
+    here; closing the generator early stops the thread.
+    """
+    if size < 1:
+        raise ValueError("size must be at least 1.")
+    source = iter(items)
+    buffer = queue.Queue(maxsize=size)
+    stop = Event()
+
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.05)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in source:
+                if not put((True, item)):
+                    return
+        except BaseException as e:
+            put((False, e))
+        else:
+            put((False, None))
+
+    thread = Thread(target=produce, name="prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            is_item, value = buffer.get()
+            if not is_item:
+                if value is not None:
+                    raise value
+                return
+            yield value
+    finally:
+        stop.set()
+        thread.join()
+        if hasattr(source, "close"):
+            source.close()
+
+
+class Pipeline:
+    """A chain of stages applied lazily to a record source."""
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = stages
+
+    def run(self, source: Iterable[Record]) -> Iterator[Record]:
+        stream = iter(source)
+        for step in self.stages:
+            stream = step.run(stream)
+        return stream
+
+
+def default_stages(executors: Optional[Dict[str, "Executor"]] = None,
+                   batch_sizes: Optional[Dict[str, int]] = None, profiler=None) -> List[Stage]:
+    """
+    The standard parse → ground → CNF → solve stages.
+    `executors` and `batch_sizes` are keyed by stage name. With a
+    profiling.StageProfiler, each stage function is profiled under its name
+    (inline stages only: wrapped functions do not pickle into process pools).
+    """
+    executors = executors or {}
+    batch_sizes = batch_sizes or {}
+    return [
+        Stage(name, profiler.wrap(name, fn) if profiler is not None else fn,
+              executor=executors.get(name), batch_size=batch_sizes.get(name, 1))
+        for name, fn in [("parse", parse_stage), ("ground", ground_stage),
+                         ("cnf", cnf_stage), ("solve", solve_stage)]
+    ]
+
+
+def records_from_arguments(arguments: Iterable[tuple], labels: Optional[Iterable] = None,
+                           instrument: bool = False, max_clauses: Optional[int] = None, encoding: str = AUTO_ENCODING) -> Iterator[Record]:
+    """Load stage for in-memory (premises, conclusion) pairs."""
+    labels = iter(labels) if labels is not None else None
+    for i, (premises, conclusion) in enumerate(arguments):
+        yield {
+            "index": i,
+            "premises": premises,
+            "conclusion": conclusion,
+            "label": next(labels, None) if labels is not None else None,
+            "instrument": instrument,
+            "max_clauses": max_clauses,
+            "encoding": encoding,
+        }
+
+
+def records_from_folio(file_path: Optional[str] = None, instrument: bool = False,
+                       max_clauses: Optional[int] = None, encoding: str = AUTO_ENCODING,
+                       snapshot: Optional[str] = None, start: int = 1, stop: Optional[int] = None,
+                       prefetch: int = 0) -> Iterator[Record]:
+    """
+    Load stage streaming the FOLIO split line by line, or, with a `snapshot` path,
+    from a precompiled snapshot of it (built or refreshed on demand, see snapshot.py).
+    Only examples with id in [start, stop) are loaded (see get_data.folio_shards);
+    with `prefetch`, up to that many are loaded ahead in a background thread.
+    Record "index" is the example id - 1.
+    """
+    from get_data import stream_folio, relabel_folio_data
+
+    if snapshot is None:
+        entries = stream_folio(file_path, start, stop)
+    else:
+        from snapshot import open_snapshot
+        entries = _iter_snapshot(open_snapshot(file_path, snapshot), start, stop)
+    if prefetch:
+        entries = prefetched(entries, prefetch)
+
+    for entry in entries:
+        yield {
+            "index": entry.id - 1,
+            "premises": entry.premises,
+            "conclusion": entry.conclusion,
+            "label": relabel_folio_data([entry.label])[0],
+            "map": entry.map,
+            "instrument": instrument,
+            "max_clauses": max_clauses,
+            "encoding": encoding,
+        }
+
+
+def records_from_logical_entailment(file_path: Optional[str] = None, instrument: bool = False,
+                                    max_clauses: Optional[int] = None, encoding: str = AUTO_ENCODING,
+                                    start: int = 1, stop: Optional[int] = None,
+                                    prefetch: int = 0) -> Iterator[Record]:
+    """
+    Load stage streaming the propositional logical-entailment dataset
+    (see get_data.iter_logical_entailment_data); arguments as records_from_folio.
+    """
+    from get_data import iter_logical_entailment_data
+
+    rows = iter_logical_entailment_data(file_path, start, stop)
+    if prefetch:
+        rows = prefetched(rows, prefetch)
+
+    for row_id, premises, conclusion, label in rows:
+        yield {
+            "index": row_id - 1,
+            "premises": premises,
+            "conclusion": conclusion,
+            "label": label,
+            "instrument": instrument,
+            "max_clauses": max_clauses,
+            "encoding": encoding,
+        }
+
+
+def _iter_snapshot(snapshot, start: int, stop: Optional[int]) -> Iterator:
+    with snapshot:
+        yield from snapshot.records(start, stop)
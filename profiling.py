@@ -0,0 +1,219 @@
+"""
+profiling.py
+
+cProfile sections per pipeline stage, for finding where a dataset run spends its time
+(init.py --profile).
+
+- `StageProfiler.section(name)` profiles a block into that stage's profile. Sections
+  nest: an inner section pauses the outer one, so every call is counted in one stage.
+- `wrap(name, fn)` and `iterate(name, items)` profile stage functions and record sources;
+  pipeline.default_stages(profiler=...) wraps the standard stages.
+- `write(directory)` dumps `<stage>.pstats` per stage (pstats, snakeviz, ...) and
+  `stacks.collapsed`, folded stacks for flamegraph.pl or speedscope.
+- `top_functions(n)` ranks functions by self time across all stages.
+
+cProfile records caller → callee edges, not whole stacks, so the collapsed stacks
+are rebuilt from the call graph: a function's time on a path is split between its
+callees in proportion to the time each call edge accounts for. Recursive calls fold
+into the outermost frame.
+"""
+
+import cProfile
+import os
+import pstats
+from collections import defaultdict
+from functools import wraps
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from constants import DEFAULT_PROFILE_DIR
+
+
+COLLAPSED_FILE = "stacks.collapsed"
+
+# Collapsed stacks stop at this depth, and paths with less than this share of
+# their stage's time are folded into the caller
+MAX_STACK_DEPTH = 64
+MIN_PATH_SHARE = 1e-4
+
+_DISABLE = "<method 'disable' of '_lsprof.Profiler' objects>"
+
+
+class StageProfiler:
+    """One cProfile.Profile per stage name. Profiles the calling thread only."""
+
+    def __init__(self):
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self._active: List[cProfile.Profile] = []
+
+    def section(self, name: str) -> "_Section":
+        """Context manager profiling a block into stage `name`."""
+        return _Section(self, name)
+
+    def wrap(self, name: str, fn: Callable) -> Callable:
+        """`fn` with every call profiled into stage `name`."""
+        @wraps(fn)
+        def profiled(*args, **kwargs):
+            self._push(name)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._pop()
+        return profiled
+
+    def iterate(self, name: str, items: Iterable) -> Iterator:
+        """Iterates `items`, profiling the work of producing each item into stage `name`."""
+        it = iter(items)
+        while True:
+            self._push(name)
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            finally:
+                self._pop()
+            yield item
+
+    def _push(self, name: str) -> None:
+        profile = self.profiles.get(name)
+        if profile is None:
+            profile = self.profiles[name] = cProfile.Profile()
+        if self._active:
+            self._active[-1].disable()
+        self._active.append(profile)
+        profile.enable()
+
+    def _pop(self) -> None:
+        self._active.pop().disable()
+        if self._active:
+            self._active[-1].enable()
+
+    # ==========================================================
+    # --- Results ---
+    # ==========================================================
+
+    def stats(self, name: Optional[str] = None) -> Optional[pstats.Stats]:
+        """Stats of one stage, or of all stages merged; None if nothing was profiled."""
+        names = [name] if name is not None else list(self.profiles)
+        stats = None
+        for profile in (self.profiles[n] for n in names if n in self.profiles):
+            profile.create_stats()
+            if not profile.stats:
+                continue
+            if stats is None:
+                stats = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+        if stats is not None:
+            _drop_profiler_frames(stats)
+        return stats
+
+    def totals(self) -> Dict[str, float]:
+        """Profiled seconds per stage."""
+        totals = {}
+        for name in self.profiles:
+            stats = self.stats(name)
+            totals[name] = stats.total_tt if stats is not None else 0.0
+        return totals
+
+    def top_functions(self, n: int = 15) -> List[Tuple[str, int, float, float]]:
+        """The `n` functions with the most self time: (function, calls, self seconds, cumulative seconds)."""
+        stats = self.stats()
+        if stats is None:
+            return []
+        rows = [(frame_name(func), nc, tt, ct) for func, (cc, nc, tt, ct, callers) in stats.stats.items()]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows[:n]
+
+    def write(self, directory: str = DEFAULT_PROFILE_DIR) -> List[str]:
+        """Writes `<stage>.pstats` per stage and the collapsed stacks of all stages. Returns the paths."""
+        os.makedirs(directory, exist_ok=True)
+        paths, lines = [], []
+        for name in self.profiles:
+            stats = self.stats(name)
+            if stats is None:
+                continue
+            path = os.path.join(directory, f"{name}.pstats")
+            stats.dump_stats(path)
+            paths.append(path)
+            for stack, seconds in collapsed_stacks(stats, name).items():
+                micros = round(seconds * 1e6)
+                if micros:
+                    lines.append(f"{stack} {micros}\n")
+        path = os.path.join(directory, COLLAPSED_FILE)
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        paths.append(path)
+        return paths
+
+    def summary(self, n: int = 15) -> str:
+        """Per-stage totals and the top functions by self time, as a printable table."""
+        lines = ["Profiled time per stage:  " + ", ".join(f"{name} {seconds:.3f}s"
+                                                      for name, seconds in self.totals().items())]
+        lines.append(f"Top {n} functions by self time:")
+        lines.append(f"  {'calls':>9}  {'self s':>8}  {'cum s':>8}  function")
+        for name, calls, self_time, cumulative in self.top_functions(n):
+            lines.append(f"  {calls:>9}  {self_time:>8.3f}  {cumulative:>8.3f}  {name}")
+        return "\n".join(lines)
+
+
+class _Section:
+    __slots__ = ("profiler", "name")
+
+    def __init__(self, profiler: StageProfiler, name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> StageProfiler:
+        self.profiler._push(self.name)
+        return self.profiler
+
+    def __exit__(self, *exc) -> None:
+        self.profiler._pop()
+
+
+def _drop_profiler_frames(stats: pstats.Stats) -> None:
+    """Removes this module's own enable/disable bookkeeping from `stats`."""
+    own = [func for func in stats.stats if func[0] == __file__ or func[2] == _DISABLE]
+    for func in own:
+        del stats.stats[func]
+    for cc, nc, tt, ct, callers in stats.stats.values():
+        for func in own:
+            callers.pop(func, None)
+    stats.total_tt = sum(entry[2] for entry in stats.stats.values())
+
+
+def frame_name(func: tuple) -> str:
+    """'name (file.py:line)' for a pstats function key; built-ins keep their own name."""
+    filename, line, name = func
+    if filename == "~":
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def collapsed_stacks(stats: pstats.Stats, root: str) -> Dict[str, float]:
+    """
+    Folded stacks ("root;caller;callee" -> self seconds) rebuilt from the call graph in
+    `stats`, under a `root` frame. See the module docstring for how time is split.
+    """
+    callees = defaultdict(list)
+    for func, (cc, nc, tt, ct, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees[caller].append((func, edge[3]))
+
+    min_time = stats.total_tt * MIN_PATH_SHARE
+    stacks: Dict[str, float] = defaultdict(float)
+    pending = [(func, entry[3], (root,), ()) for func, entry in stats.stats.items() if not entry[4]]
+    while pending:
+        func, seconds, names, funcs = pending.pop()
+        cc, nc, tt, ct, callers = stats.stats[func]
+        names, funcs = names + (frame_name(func).replace(";", ","),), funcs + (func,)
+        scale = seconds / ct if ct else 0.0
+        self_time = tt * scale
+        for callee, edge_time in callees[func]:
+            share = edge_time * scale
+            if callee in funcs or share < min_time or len(names) >= MAX_STACK_DEPTH:
+                self_time += share if callee not in funcs else 0.0
+                continue
+            pending.append((callee, share, names, funcs))
+        stacks[";".join(names)] += self_time
+    return dict(stacks)
@@ -0,0 +1,135 @@
+"""
+query_client.py
+
+Blocking client for query_server.py.
+
+    with QueryClient.connect("/tmp/fol_sat.sock") as client:
+        client.check(["∀x(Px→Qx)", "Pa"], "Qa")["valid"]        # True
+        client.check_many([(premises, conclusion), ...])          # pipelined, results in input order
+
+    with QueryClient.spawn() as client:                           # a private server on stdin/stdout
+        ...
+
+Responses are the server's JSON objects; argument-level problems (unparsable
+formulas, CNF ceiling, ...) come back in their "error" field. A client may be
+shared between threads: calls take turns on the connection.
+"""
+
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# Requests sent ahead of the responses read back in check_many
+DEFAULT_WINDOW = 64
+
+
+class QueryClient:
+    """A connection to a query server, over any pair of text streams."""
+
+    def __init__(self, rfile, wfile, closer: Optional[Callable[[], None]] = None):
+        self._rfile = rfile
+        self._wfile = wfile
+        self._closer = closer
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def connect(cls, path: str, timeout: Optional[float] = None) -> "QueryClient":
+        """Connects to a server listening on the Unix socket at `path`."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(path)
+        rfile = sock.makefile("r", encoding="utf-8", newline="\n")
+        wfile = sock.makefile("w", encoding="utf-8", newline="\n")
+
+        def close():
+            wfile.close()
+            rfile.close()
+            sock.close()
+        return cls(rfile, wfile, close)
+
+    @classmethod
+    def spawn(cls, args: Sequence[str] = (), python: str = sys.executable) -> "QueryClient":
+        """Starts `python -m query_server --stdio [args]` and talks to it over its stdin/stdout."""
+        process = subprocess.Popen([python, "-m", "query_server", "--stdio", *args],
+                                   cwd=os.path.dirname(os.path.abspath(__file__)),
+                                   stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                   text=True, encoding="utf-8", bufsize=1)
+
+        def close():
+            process.stdin.close()
+            process.wait()
+            process.stdout.close()
+        return cls(process.stdout, process.stdin, close)
+
+    # ==========================================================
+    # --- Requests ---
+    # ==========================================================
+
+    def check(self, premises: List[str], conclusion: str, **options) -> Dict:
+        """Validity of one argument: {"valid", "label", "solvable", "counterexample", "error", ...}."""
+        return self.request({"premises": list(premises), "conclusion": conclusion, **options})
+
+    def check_many(self, arguments: Iterable[Tuple[List[str], str]], window: int = DEFAULT_WINDOW,
+                   **options) -> List[Dict]:
+        """
+        Validates many (premises, conclusion) pairs, keeping up to `window` requests in
+        flight so the server works on them concurrently. Results are in input order.
+        """
+        return self.request_many(({"premises": list(p), "conclusion": c, **options} for p, c in arguments), window)
+
+    def ping(self) -> bool:
+        return bool(self.request({"op": "ping"}).get("ok"))
+
+    def stats(self) -> Dict:
+        return self.request({"op": "stats"})["stats"]
+
+    def request(self, payload: Dict) -> Dict:
+        """Sends one request and returns its response."""
+        return self.request_many([payload], window=1)[0]
+
+    def request_many(self, payloads: Iterable[Dict], window: int = DEFAULT_WINDOW) -> List[Dict]:
+        """Sends requests with up to `window` awaiting a response; responses in request order."""
+        if window < 1:
+            raise ValueError("window must be at least 1.")
+        with self._lock:
+            ids, responses, in_flight = [], {}, set()
+            for payload in payloads:
+                if len(in_flight) >= window:
+                    self._receive(in_flight, responses)
+                request_id = next(self._ids)
+                self._wfile.write(json.dumps(dict(payload, id=request_id), ensure_ascii=False) + "\n")
+                self._wfile.flush()
+                ids.append(request_id)
+                in_flight.add(request_id)
+            while in_flight:
+                self._receive(in_flight, responses)
+            return [responses[request_id] for request_id in ids]
+
+    def _receive(self, in_flight: set, responses: Dict[int, Dict]) -> None:
+        line = self._rfile.readline()
+        if not line:
+            raise ConnectionError("query server closed the connection")
+        response = json.loads(line)
+        request_id = response.get("id")
+        if request_id not in in_flight:
+            raise ConnectionError(f"unexpected response from query server: {line.strip()}")
+        in_flight.discard(request_id)
+        responses[request_id] = response
+
+    def close(self) -> None:
+        if self._closer is not None:
+            self._closer()
+            self._closer = None
+
+    def __enter__(self) -> "QueryClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,316 @@
+"""
+query_server.py
+
+Long-lived validation server speaking JSON lines over a Unix socket or stdin/stdout.
+
+Spawning a process per validation throws away the parsed formulas, the per-premise
+grounding and CNF caches (formula_cache) and the loaded solver backend. The server
+keeps all of them warm for its whole life, plus an LRU of finished answers, so a
+repeated query is answered without grounding or solving.
+
+Requests, one JSON object per line:
+    {"id": 1, "premises": ["∀x(Px→Qx)", "Pa"], "conclusion": "Qa"}
+    optional: "encoding", "max_clauses", "counterexample" (default true)
+    {"id": 2, "op": "stats"}      cache and request counters
+    {"id": 3, "op": "ping"}
+Responses, one per request, written as soon as each finishes (so not necessarily
+in request order; match them by "id"):
+    {"id": 1, "valid": true, "label": "valid", "solvable": true,
+     "counterexample": null, "error": null, "cached": false, "ms": 0.42}
+
+- Requests run concurrently on a thread pool: parse → ground → CNF → solve with the
+  pipeline's stage functions. The native solver releases the GIL while it searches.
+- At most `concurrency` requests per connection are in flight; reading pauses beyond that.
+- A socket client that disconnects (end of input or a connection error) cancels its
+  unanswered requests: the native solver is interrupted. On --stdio, end of input
+  instead waits for the requests in flight and writes their answers.
+- The socket file is created with mode 0600: only its owner can connect.
+
+Usage:
+    python -m query_server --socket /tmp/fol_sat.sock
+    python -m query_server --stdio
+query_client.py is the matching client library.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Optional
+
+from constants import AUTO_ENCODING, ENCODINGS
+from formula_cache import FormulaCache, cache_stats
+from pipeline import parse_stage, ground_stage, cnf_stage, solve_stage
+from sat_solving import CancelToken
+from structured_logging import get_logger
+
+logger = get_logger("query_server")
+
+
+DEFAULT_WORKERS = 4
+DEFAULT_CONCURRENCY = 32
+DEFAULT_RESULT_CACHE_SIZE = 65536
+
+# Request keys that change the answer
+OPTION_KEYS = ["encoding", "max_clauses"]
+
+
+class BadRequest(ValueError):
+    """A request line that is not a valid query."""
+
+
+def _evaluate(record: Dict, token: CancelToken) -> Dict:
+    """Runs one query record through the pipeline stages, checking the token between them."""
+    for stage in (parse_stage, ground_stage, cnf_stage, solve_stage):
+        token.check()
+        record = stage(record)
+    return record
+
+
+class QueryServer:
+    """
+    Answers validity queries with warm caches. Serve with `serve_unix` or `serve_stdio`,
+    or call `handle_line` / `handle` directly; `close()` stops the worker threads.
+
+    workers:            solver threads
+    concurrency:        requests in flight per connection
+    result_cache_size:  finished answers kept (LRU)
+    max_clauses:        default CNF ceiling for requests that do not set one
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, concurrency: int = DEFAULT_CONCURRENCY,
+                 result_cache_size: int = DEFAULT_RESULT_CACHE_SIZE, max_clauses: Optional[int] = None,
+                 encoding: str = AUTO_ENCODING):
+        if workers < 1 or concurrency < 1:
+            raise ValueError("workers and concurrency must be at least 1.")
+        self.concurrency = concurrency
+        self.defaults = {"encoding": encoding, "max_clauses": max_clauses}
+        self.results = FormulaCache(result_cache_size)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="query")
+        self.requests = 0
+        self.errors = 0
+        self._warm_up()
+
+    def _warm_up(self) -> None:
+        """Loads the solver backend and runs every stage once, before the first request."""
+        record = {"index": 0, "premises": ["∀x(Px→Qx)", "Pa", "Pb"], "conclusion": "Qa"}
+        self.executor.submit(_evaluate, record, CancelToken()).result()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict:
+        return {"requests": self.requests, "errors": self.errors,
+                "results": self.results.stats(), **cache_stats()}
+
+    # ==========================================================
+    # --- Requests ---
+    # ==========================================================
+
+    async def handle_line(self, line: str) -> Dict:
+        """The response to one request line (errors included, never raised)."""
+        start = time.perf_counter()
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return self._finish(None, {"error": f"bad request: {e}"}, start)
+        if not isinstance(request, dict):
+            return self._finish(None, {"error": "bad request: expected a JSON object"}, start)
+        return await self.handle(request)
+
+    async def handle(self, request: Dict) -> Dict:
+        """The response to one decoded request."""
+        start = time.perf_counter()
+        try:
+            response = await self._answer(request)
+        except BadRequest as e:
+            response = {"error": f"bad request: {e}"}
+        except Exception as e:
+            logger.exception("Request %r failed", request.get("id"))
+            response = {"error": f"internal: {type(e).__name__}: {e}"}
+        return self._finish(request.get("id"), response, start)
+
+    def _finish(self, request_id, response: Dict, start: float) -> Dict:
+        self.requests += 1
+        if response.get("error"):
+            self.errors += 1
+        response["id"] = request_id
+        response["ms"] = 1000 * (time.perf_counter() - start)
+        return response
+
+    async def _answer(self, request: Dict) -> Dict:
+        op = request.get("op", "check")
+        if op == "ping":
+            return {"ok": True}
+        if op == "stats":
+            return {"stats": self.stats()}
+        if op != "check":
+            raise BadRequest(f"unknown op {op!r}")
+
+        premises, conclusion = request.get("premises"), request.get("conclusion")
+        if not isinstance(premises, list) or not premises or not all(isinstance(p, str) for p in premises):
+            raise BadRequest("'premises' must be a non-empty list of formula strings")
+        if not isinstance(conclusion, str):
+            raise BadRequest("'conclusion' must be a formula string")
+        options = {key: request.get(key, self.defaults[key]) for key in OPTION_KEYS}
+        if options["encoding"] not in ENCODINGS:
+            raise BadRequest(f"'encoding' must be one of {ENCODINGS}")
+
+        key = (tuple(premises), conclusion, options["encoding"], options["max_clauses"])
+        answer = self.results.lookup(key)
+        cached = answer is not None
+        if not cached:
+            answer = await self._solve(premises, conclusion, options)
+            self.results.store(key, answer)
+        response = dict(answer, cached=cached)
+        if not request.get("counterexample", True):
+            response["counterexample"] = None
+        return response
+
+    async def _solve(self, premises, conclusion, options: Dict) -> Dict:
+        token = CancelToken()
+        record = {"index": 0, "premises": premises, "conclusion": conclusion, "cancel": token, **options}
+        future = asyncio.get_running_loop().run_in_executor(self.executor, _evaluate, record, token)
+        try:
+            record = await future
+        except asyncio.CancelledError:
+            token.cancel()
+            raise
+        solvable = bool(record.get("solvable"))
+        error = record.get("error")
+        if not solvable and error is None:
+            error = "not solvable: quantified argument with a domain of fewer than two constants"
+        return {
+            "valid": record.get("is_valid") if solvable else None,
+            "label": record.get("computed_label") if solvable else None,
+            "solvable": solvable,
+            "counterexample": record.get("counterexample") or None,
+            "error": error,
+        }
+
+    # ==========================================================
+    # --- Transports ---
+    # ==========================================================
+
+    async def serve_lines(self, read_line: Callable[[], Awaitable[str]],
+                          write_line: Callable[[str], Awaitable[None]], drain: bool = True) -> None:
+        """
+        Answers request lines until `read_line` returns "" (end of input). Then, with
+        `drain`, waits for the requests still in flight; without it, end of input means
+        the client is gone and they are cancelled. Cancelling this cancels them too.
+        """
+        slots = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+
+        async def respond(line: str) -> None:
+            try:
+                await write_line(json.dumps(await self.handle_line(line), ensure_ascii=False))
+            except ConnectionError:
+                logger.info("Client disconnected before its answer was written")
+            finally:
+                slots.release()
+
+        try:
+            while True:
+                await slots.acquire()
+                line = await read_line()
+                if not line:
+                    slots.release()
+                    break
+                if not line.strip():
+                    slots.release()
+                    continue
+                task = asyncio.ensure_future(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks and drain:
+                await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        async def read_line() -> str:
+            return (await reader.readline()).decode("utf-8")
+
+        async def write_line(text: str) -> None:
+            writer.write(text.encode("utf-8") + b"\n")
+            await writer.drain()
+
+        # A socket client that closes its end has gone: its unanswered requests are cancelled
+        try:
+            await self.serve_lines(read_line, write_line, drain=False)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            logger.info("Client disconnected")
+        finally:
+            writer.close()
+
+    async def serve_unix(self, path: str, ready: Optional[asyncio.Event] = None) -> None:
+        """Serves clients on a Unix socket at `path` until cancelled; sets `ready` once listening."""
+        if os.path.exists(path):
+            os.remove(path)
+        old_umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self._serve_connection, path, limit=2 ** 24)
+        finally:
+            os.umask(old_umask)
+        logger.info("Listening on %s", path)
+        try:
+            async with server:
+                if ready is not None:
+                    ready.set()
+                await server.serve_forever()
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def serve_stdio(self, stdin=None, stdout=None) -> None:
+        """Serves one client on stdin/stdout (or the given text streams) until end of input."""
+        stdin = stdin or sys.stdin
+        stdout = stdout or sys.stdout
+        loop = asyncio.get_running_loop()
+
+        async def read_line() -> str:
+            return await loop.run_in_executor(None, stdin.readline)
+
+        async def write_line(text: str) -> None:
+            stdout.write(text + "\n")
+            stdout.flush()
+
+        await self.serve_lines(read_line, write_line)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Serve validity queries as JSON lines with warm caches.")
+    transport = parser.add_mutually_exclusive_group()
+    transport.add_argument("--socket", metavar="PATH", help="listen on a Unix socket at PATH")
+    transport.add_argument("--stdio", action="store_true", help="serve one client on stdin/stdout (default)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="solver threads")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="requests in flight per connection")
+    parser.add_argument("--result-cache-size", type=int, default=DEFAULT_RESULT_CACHE_SIZE,
+                        help="finished answers kept in memory")
+    parser.add_argument("--max-clauses", type=int, default=None,
+                        help="default CNF ceiling; larger arguments are answered with an error")
+    parser.add_argument("--encoding", choices=ENCODINGS, default=AUTO_ENCODING, help="default CNF encoding")
+    args = parser.parse_args(argv)
+
+    server = QueryServer(workers=args.workers, concurrency=args.concurrency,
+                         result_cache_size=args.result_cache_size, max_clauses=args.max_clauses,
+                         encoding=args.encoding)
+    try:
+        if args.socket:
+            asyncio.run(server.serve_unix(args.socket))
+        else:
+            asyncio.run(server.serve_stdio())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
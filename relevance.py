@@ -0,0 +1,80 @@
+"""
+relevance.py
+
+Premise relevance filtering, run before grounding.
+
+Builds a predicate co-occurrence graph over the premises and the negated
+conclusion. Premises outside the conclusion's connected component share no
+atoms with it, so (Premises ∧ ¬Conclusion) is satisfiable iff the connected
+part is satisfiable and every other component is satisfiable on its own.
+
+A disconnected component is dropped only when it is trivially satisfiable:
+every predicate occurs with a single polarity, so making each predicate's
+literals true satisfies the whole component.
+"""
+
+from typing import List, Tuple
+
+from WFFs.strictWFFs import StrictWFF
+
+
+def _find(parent: dict, pred: str) -> str:
+    """Union-find root lookup with path halving."""
+    while parent[pred] != pred:
+        parent[pred] = parent[parent[pred]]
+        pred = parent[pred]
+    return pred
+
+
+def _union(parent: dict, a: str, b: str) -> None:
+    root_a, root_b = _find(parent, a), _find(parent, b)
+    if root_a != root_b:
+        parent[root_b] = root_a
+
+
+def filter_relevant_premises(premises: List[StrictWFF],
+                             negated_conclusion: StrictWFF) -> Tuple[List[StrictWFF], List[StrictWFF]]:
+    """
+    Splits premises into (kept, dropped).
+
+    Kept premises are those connected to the negated conclusion through shared
+    predicates, plus any disconnected premises whose component is not trivially
+    satisfiable. Order of the kept premises is preserved.
+    """
+    polarities = [p.get_predicate_polarities() for p in premises]
+    conclusion_preds = negated_conclusion.get_predicates()
+
+    # --- Build the co-occurrence graph ---
+    parent = {}
+    for preds in [conclusion_preds] + [set(p) for p in polarities]:
+        for pred in preds:
+            parent.setdefault(pred, pred)
+        preds = list(preds)
+        for other in preds[1:]:
+            _union(parent, preds[0], other)
+
+    relevant_roots = {_find(parent, pred) for pred in conclusion_preds}
+
+    # --- Merge polarities per disconnected component ---
+    component_polarities = {}
+    for prem_polarities in polarities:
+        for pred, signs in prem_polarities.items():
+            root = _find(parent, pred)
+            if root in relevant_roots:
+                continue
+            component_polarities.setdefault(root, {}).setdefault(pred, set()).update(signs)
+
+    droppable_roots = {
+        root for root, preds in component_polarities.items()
+        if all(len(signs) == 1 for signs in preds.values())
+    }
+
+    kept, dropped = [], []
+    for premise, prem_polarities in zip(premises, polarities):
+        roots = {_find(parent, pred) for pred in prem_polarities}
+        if roots and roots <= droppable_roots:
+            dropped.append(premise)
+        else:
+            kept.append(premise)
+
+    return kept, dropped
@@ -0,0 +1,144 @@
+"""
+result_cache.py
+
+Persistent on-disk cache of solved arguments for dataset runs.
+
+- Results live in a SQLite file (default `.sat_cache/results.sqlite`), keyed by a
+  hash of the argument's canonical form and the pipeline configuration.
+- Each entry stores the validity result, the counterexample and the stage timings.
+- The file records constants.CNF_ENCODING_VERSION; opening it with a different
+  version drops every stored result.
+- `lookup_stage` / `store_stage` wrap the pipeline so re-runs only solve new or
+  changed arguments. Only the process that owns the cache touches the file.
+- Records that went through pipeline.canonicalize_stage are keyed by their
+  fingerprint, and their counterexamples are stored in canonical letters.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+from constants import CNF_ENCODING_VERSION, VALID, INVALID, AUTO_ENCODING, DIRECT_CLAUSE_LIMIT, DEFAULT_CACHE_PATH
+
+
+# Record keys that change the result or how it is computed
+CONFIG_KEYS = ["encoding", "max_clauses", "direct_clause_limit"]
+
+
+def canonical_formula(formula: str) -> str:
+    """Formula text with parsing-irrelevant differences (spaces, redundant parentheses) removed."""
+    from WFFs.strictWFFs import string_to_frozen_WFF
+    try:
+        wff = string_to_frozen_WFF(formula)
+    except (ValueError, AssertionError, TypeError, RecursionError):
+        wff = None
+    return wff.canonical_text() if wff else formula.replace(" ", "")
+
+
+def argument_key(premises: List[str], conclusion: str, config: Optional[Dict] = None,
+                 fingerprint: Optional[str] = None) -> str:
+    """
+    SHA-256 of the argument and the pipeline configuration.
+    With a canonical.py `fingerprint`, isomorphic arguments share one key.
+    """
+    payload = {
+        "premises": [canonical_formula(p) for p in premises] if fingerprint is None else fingerprint,
+        "conclusion": canonical_formula(conclusion) if fingerprint is None else None,
+        "config": {k: v for k, v in sorted((config or {}).items())},
+    }
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def record_config(record: Dict) -> Dict:
+    config = {key: record.get(key) for key in CONFIG_KEYS}
+    config["encoding"] = config["encoding"] or AUTO_ENCODING
+    config["direct_clause_limit"] = config["direct_clause_limit"] or DIRECT_CLAUSE_LIMIT
+    return config
+
+
+class ResultCache:
+    """A SQLite-backed store of argument results. Use as a context manager or call `close()`."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, version: int = CNF_ENCODING_VERSION):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._db = sqlite3.connect(path)
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.execute("""CREATE TABLE IF NOT EXISTS results (
+                                key TEXT PRIMARY KEY, is_valid INTEGER, counterexample TEXT,
+                                timings TEXT, created REAL)""")
+        self._check_version()
+
+    def _check_version(self) -> None:
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or int(row[0]) != self.version:
+            with self._db:
+                self._db.execute("DELETE FROM results")
+                self._db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(self.version),))
+
+    def get(self, key: str) -> Optional[Dict]:
+        row = self._db.execute(
+            "SELECT is_valid, counterexample, timings FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {"is_valid": bool(row[0]), "counterexample": json.loads(row[1]), "timings": json.loads(row[2])}
+
+    def put(self, key: str, is_valid: bool, counterexample: Optional[Dict], timings: Optional[Dict] = None) -> None:
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                             (key, int(is_valid), json.dumps(counterexample), json.dumps(timings or {}),
+                              time.time()))
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ==========================================================
+# --- Pipeline stages ---
+# ==========================================================
+
+def lookup_stage(cache: ResultCache, record: Dict) -> Dict:
+    """Fills in a stored result and marks the record `cached`, so the solving stages skip it."""
+    record["cache_key"] = argument_key(record["premises"], record["conclusion"], record_config(record),
+                                       record.get("fingerprint"))
+    hit = cache.get(record["cache_key"])
+    if hit is not None:
+        record["cached"] = True
+        record["solvable"] = True
+        record["is_valid"] = hit["is_valid"]
+        record["counterexample"] = hit["counterexample"]
+        record["computed_label"] = VALID if hit["is_valid"] else INVALID
+        record["timings"] = hit["timings"]
+    return record
+
+
+def store_stage(cache: ResultCache, record: Dict) -> Dict:
+    """Saves a freshly solved record's result and stage timings."""
+    if record.get("cached") or record.get("duplicate") or not record.get("solvable") or "is_valid" not in record:
+        return record
+    metrics = record.get("metrics")
+    timings = dict(metrics.stages) if metrics is not None else {}
+    cache.put(record["cache_key"], record["is_valid"], record["counterexample"], timings)
+    return record
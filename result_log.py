@@ -0,0 +1,138 @@
+"""
+result_log.py
+
+Streaming JSON-lines log of per-argument results, for analysing runs afterwards.
+
+- `result_row` turns a finished pipeline record into one flat JSON object:
+  id, expected/computed label, match, stage timings, counts (clauses, variables, ...),
+  solver stats, memory per stage (when traced) and, optionally, the counterexample.
+- `ResultLog` buffers rows and writes them a batch at a time (one write, flush
+  and fsync per batch). A batch that would take a non-empty file past `max_bytes`
+  goes to a fresh file (results.jsonl → results.jsonl.1 → results.jsonl.2 ...,
+  like logging's RotatingFileHandler), so files only split between batches.
+- Rows are written by the process that consumes the pipeline, in the order records
+  come out (the parallel driver keeps input order), so lines never interleave.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+
+DEFAULT_BATCH_SIZE = 256
+
+
+def result_row(record: Dict, counterexample: bool = True) -> Dict:
+    """The log row for one finished record."""
+    metrics = record.get("metrics")
+    row = {
+        "id": record["index"] + 1,
+        "expected": record.get("label"),
+        "computed": record.get("computed_label"),
+        "match": record.get("label") is None or record.get("computed_label") == record.get("label"),
+        "solvable": record.get("solvable"),
+        "cached": bool(record.get("cached")),
+        "duplicate": bool(record.get("duplicate")),
+        "error": record.get("error"),
+        "timings": dict(metrics.stages) if metrics is not None else record.get("timings", {}),
+        "counts": dict(metrics.counts) if metrics is not None else {},
+        "solver": dict(metrics.solver) if metrics is not None else {},
+    }
+    if metrics is not None and metrics.memory:
+        row["memory"] = {name: dict(entry) for name, entry in metrics.memory.items()}
+    if counterexample:
+        row["counterexample"] = record.get("counterexample")
+    return row
+
+
+class ResultLog:
+    """
+    Appends result rows to a JSONL file in fsynced batches.
+    Use as a context manager or call `close()` (which writes the last partial batch).
+
+    batch_size:      rows per write + fsync
+    max_bytes:       rotate before a batch would make the file larger than this (None: never)
+    backup_count:    rotated files kept (None: keep all)
+    counterexample:  include counterexamples in the rows
+    """
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE, max_bytes: Optional[int] = None,
+                 backup_count: Optional[int] = None, counterexample: bool = True):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.counterexample = counterexample
+        self.rows_written = 0
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, record: Dict) -> None:
+        line = json.dumps(result_row(record, self.counterexample), ensure_ascii=False)
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.batch_size:
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        data = "\n".join(self._buffer) + "\n"
+        size = self._file.tell()
+        if self.max_bytes is not None and size and size + len(data.encode("utf-8")) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.rows_written += len(self._buffer)
+        self._buffer.clear()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        backups = 1
+        while os.path.exists(f"{self.path}.{backups}"):
+            backups += 1
+        for i in range(backups - 1, 0, -1):
+            if self.backup_count is not None and i >= self.backup_count:
+                os.remove(f"{self.path}.{i}")
+            else:
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backup_count != 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush()
+            self._file.close()
+
+    def __enter__(self) -> "ResultLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ==========================================================
+# --- Pipeline stage ---
+# ==========================================================
+
+def log_stage(log: ResultLog, record: Dict) -> Dict:
+    """Writes the record's row and passes the record on."""
+    log.write(record)
+    return record
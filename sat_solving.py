@@ -8,12 +8,12 @@ Provides SAT-based reasoning utilities and the Argument.solve() interface.
 - Returns countermodels for invalid arguments
 """
 
-from pysat.solvers import Glucose3
 from itertools import chain
-from typing import Tuple, Dict, List
+from threading import Lock
+from typing import Tuple, Dict, List, Optional
 
 from WFFs.cnfWFFs import CnfWFF
-from constants import AND, OR, NOT
+from constants import AND, OR, NOT, DEFINITION_PREFIX
 
 
 # ==========================================================
@@ -56,27 +56,90 @@ def cnf_to_clauses(cnf: CnfWFF) -> Tuple[List[List[int]], Dict[str, int]]:
     return clauses, varmap
 
 
+# ==========================================================
+# --- Cancellation ---
+# ==========================================================
+
+class SolverInterrupted(Exception):
+    """Raised when a solve is cancelled through its CancelToken."""
+
+
+class CancelToken:
+    """
+    Thread-safe cancellation flag for one solve.
+    Calling `cancel()` from any thread interrupts the native solver if it is running,
+    and makes the next `check()` raise SolverInterrupted.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._solver = None
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled = True
+            if self._solver is not None:
+                self._solver.interrupt()
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise SolverInterrupted("Solve was cancelled.")
+
+    def _attach(self, solver) -> None:
+        with self._lock:
+            self.check()
+            self._solver = solver
+
+    def _detach(self) -> None:
+        with self._lock:
+            self._solver = None
+
+
 # ==========================================================
 # --- SAT solving ---
 # ==========================================================
 
-def solve_cnf(cnf: CnfWFF) -> Tuple[bool, Dict[str, bool]]:
+def solve_cnf(cnf: CnfWFF, token: Optional[CancelToken] = None, metrics=None) -> Tuple[bool, Dict[str, bool]]:
     """
     Solves a CNF WFF using Glucose3.
+    With a CancelToken the solver runs interruptibly (and releases the GIL),
+    raising SolverInterrupted if the token is cancelled.
+    Pass an instrumentation.Metrics to record clause/variable counts and solver stats
+    (and, while tracemalloc is tracing, the solver's native memory under the "solve" stage).
     Returns:
         (is_satisfiable, model_dict)
     """
-    clauses, varmap = cnf_to_clauses(cnf)
+    from pysat.solvers import Glucose3  # loaded on first solve, so parsing and CNF never import the backend
+    from instrumentation import stage, native_memory
+
+    with stage(metrics, "solve.clauses"):
+        clauses, varmap = cnf_to_clauses(cnf)
+    if metrics is not None:
+        metrics.counts["clauses"] = len(clauses)
+        metrics.counts["variables"] = len(varmap)
+        metrics.counts["literals"] = sum(len(c) for c in clauses)
+
+    with native_memory(metrics, "solve"), Glucose3(bootstrap_with=clauses) as solver, stage(metrics, "solve.sat"):
+        if token is None:
+            is_sat = solver.solve()
+        else:
+            token._attach(solver)
+            try:
+                is_sat = solver.solve_limited(expect_interrupt=True)
+            finally:
+                token._detach()
+            if is_sat is None:
+                raise SolverInterrupted("Solve was cancelled.")
+
+        if metrics is not None:
+            metrics.solver.update(solver.accum_stats())
 
-    solver = Glucose3()
-    for c in clauses:
-        solver.add_clause(c)
+        if not is_sat:
+            return False, {}
 
-    is_sat = solver.solve()
-    if not is_sat:
-        return False, {}
+        model = solver.get_model()
 
-    model = solver.get_model()
     invmap = {v: k for k, v in varmap.items()}
     named_model = {invmap[abs(l)]: (l > 0) for l in model if abs(l) in invmap}
 
@@ -88,7 +151,7 @@ def solve_cnf(cnf: CnfWFF) -> Tuple[bool, Dict[str, bool]]:
 # ==========================================================
 
 
-def solve_argument(cnf_wff: CnfWFF):
+def solve_argument(cnf_wff: CnfWFF, token: Optional[CancelToken] = None, metrics=None):
     """
     Solves a CNF WFF that represents (Premises ∧ ¬Conclusion).
     
@@ -96,6 +159,7 @@ def solve_argument(cnf_wff: CnfWFF):
         (is_valid, counterexample)
         
     The argument is valid ⇔ (Premises ∧ ¬Conclusion) is unsatisfiable.
+    Definitional (Tseitin) variables are left out of the counterexample.
     """
 
     # --- Step 1: Get clauses directly from CNF WFF ---
@@ -115,14 +179,14 @@ def solve_argument(cnf_wff: CnfWFF):
         else:
             clause_nodes.append(CnfWFF(operator=OR, operands=lits))
 
-    # --- Step 3: Combine clauses into one CNF conjunction ---
-    flat_cnf = CnfWFF(operator=AND, operands=clause_nodes)
+    # --- Step 3: Combine clauses into one CNF conjunction (∧ needs two operands) ---
+    flat_cnf = clause_nodes[0] if len(clause_nodes) == 1 else CnfWFF(operator=AND, operands=clause_nodes)
 
     # --- Step 4: Solve with SAT solver ---
-    is_sat, model = solve_cnf(flat_cnf)
+    is_sat, model = solve_cnf(flat_cnf, token, metrics)
 
     # --- Step 5: Interpret results ---
     is_valid = not is_sat
-    counterexample = model if is_sat else None
+    counterexample = {k: v for k, v in model.items() if not k.startswith(DEFINITION_PREFIX)} if is_sat else None
 
     return is_valid, counterexample
@@ -0,0 +1,133 @@
+"""
+snapshot.py
+
+Precompiled binary snapshot of the FOLIO split.
+
+Loading the TSV runs ast.literal_eval and compress_fol on every line at every
+start. `build_snapshot` does that once and writes the compressed entries
+(premises, conclusion, label, abbreviation map) to a single file:
+
+    header   magic, format version, entry count, index offset,
+             source mtime and size (to detect a changed TSV)
+    entries  one compact UTF-8 JSON object per example
+    index    count + 1 little-endian uint64 entry offsets
+
+`Snapshot` mmaps the file and reads the index in place, so opening is O(1) and
+`snapshot[example_id]` decodes only that entry. Example IDs are 1-based non-blank
+record numbers, the same ids get_data.stream_folio gives its FolioRecords (they match
+load_folio_data's line-number keys only when the split has no blank lines).
+"""
+
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Iterator, Optional
+
+from constants import DEFAULT_SNAPSHOT_PATH
+from get_data import FOLIO_FILE_PATH, FolioRecord, stream_folio
+
+
+SNAPSHOT_MAGIC = b"FOLSNAP\0"
+SNAPSHOT_VERSION = 2  # bump when compression output changes
+
+_HEADER = struct.Struct("<8sIIQqQ")
+_OFFSET = struct.Struct("<Q")
+
+
+def _source_stamp(source: str) -> tuple:
+    stat = os.stat(source)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def build_snapshot(source: Optional[str] = None, path: str = DEFAULT_SNAPSHOT_PATH) -> int:
+    """Compresses every entry of the TSV at `source` into a snapshot at `path`. Returns the entry count."""
+    source = source or FOLIO_FILE_PATH
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    offsets = []
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(b"\0" * _HEADER.size)
+        for record in stream_folio(source):
+            offsets.append(out.tell())
+            out.write(json.dumps(record.as_dict(), ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        index_offset = out.tell()
+        offsets.append(index_offset)
+        out.write(b"".join(_OFFSET.pack(o) for o in offsets))
+        out.seek(0)
+        out.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(offsets) - 1, index_offset,
+                               *_source_stamp(source)))
+    os.replace(tmp_path, path)
+    return len(offsets) - 1
+
+
+class Snapshot:
+    """
+    Read-only, memory-mapped view of a snapshot, indexed by 1-based non-blank record
+    number. Use as a context manager or call `close()`.
+    """
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < _HEADER.size:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a FOLIO snapshot")
+        magic, version, count, index_offset, mtime_ns, size = _HEADER.unpack_from(self._mmap)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a version {SNAPSHOT_VERSION} FOLIO snapshot")
+        self.source_stamp = (mtime_ns, size)
+        self._count = count
+        self._index = memoryview(self._mmap)[index_offset:index_offset + (count + 1) * _OFFSET.size].cast("Q")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, example_id: int) -> Dict:
+        if not 1 <= example_id <= self._count:
+            raise KeyError(example_id)
+        start, end = self._index[example_id - 1], self._index[example_id]
+        return json.loads(self._mmap[start:end])
+
+    def __iter__(self) -> Iterator[Dict]:
+        for example_id in range(1, self._count + 1):
+            yield self[example_id]
+
+    def records(self, start: int = 1, stop: Optional[int] = None) -> Iterator[FolioRecord]:
+        """get_data.FolioRecords with id in [start, stop), like get_data.stream_folio."""
+        stop = self._count + 1 if stop is None else min(stop, self._count + 1)
+        for example_id in range(max(start, 1), stop):
+            yield FolioRecord.from_dict(example_id, self[example_id])
+
+    def is_stale(self, source: Optional[str] = None) -> bool:
+        """True if the TSV changed since the snapshot was built."""
+        return _source_stamp(source or FOLIO_FILE_PATH) != self.source_stamp
+
+    def close(self) -> None:
+        self._index.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_snapshot(source: Optional[str] = None, path: str = DEFAULT_SNAPSHOT_PATH) -> Snapshot:
+    """Opens the snapshot at `path`, (re)building it first if it is missing, unreadable or stale."""
+    try:
+        snapshot = Snapshot(path)
+    except (OSError, ValueError):
+        snapshot = None
+    if snapshot is not None and not snapshot.is_stale(source):
+        return snapshot
+    if snapshot is not None:
+        snapshot.close()
+    build_snapshot(source, path)
+    return Snapshot(path)
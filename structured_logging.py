@@ -0,0 +1,91 @@
+"""
+structured_logging.py
+
+Levelled, lazily formatted logging for the solver, on top of the standard `logging` module.
+
+- Each module logs through `get_logger("<module>")`, its file name without .py
+  ("argument", "init", "query_server"), giving loggers "fol_sat.<module>" that can
+  be filtered one by one. The name is written out rather than taken from __name__,
+  which is "__main__" for entry points run as scripts.
+- Formulas are passed as arguments, `logger.debug("validity WFF: %r", wff)`, so a
+  WFF's recursive __repr__ only runs when a handler actually emits the record.
+- `lazy(fn, *args)` defers any other expensive message part the same way.
+- `extra=fields(key=value, ...)` attaches structured data to a record;
+  `JsonFormatter` writes each record as one JSON object including those fields.
+- Library code adds no handlers; entry points call `configure`.
+"""
+
+import logging
+import sys
+from typing import Callable, Dict, Optional, TextIO
+
+
+LOGGER_ROOT = "fol_sat"
+
+# Levels: DEBUG formulas, CNFs and models; INFO one line per argument; WARNING problems only
+DEBUG, INFO, WARNING = logging.DEBUG, logging.INFO, logging.WARNING
+
+logging.getLogger(LOGGER_ROOT).addHandler(logging.NullHandler())
+
+
+def get_logger(name: str) -> logging.Logger:
+    """The logger "fol_sat.<name>"; `name` is the calling module's file name without .py."""
+    return logging.getLogger(f"{LOGGER_ROOT}.{name}")
+
+
+class lazy:
+    """
+    A message argument rendered by calling `fn(*args)` only if the record is emitted
+    (once, however many handlers format it).
+    """
+
+    __slots__ = ("fn", "args", "_text")
+
+    def __init__(self, fn: Callable[..., object], *args):
+        self.fn = fn
+        self.args = args
+        self._text = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = str(self.fn(*self.args))
+        return self._text
+
+
+def fields(**values) -> Dict[str, Dict]:
+    """`extra=` for a log call, attaching structured key/value data to the record."""
+    return {"fields": values}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message and any `fields`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        import json
+        entry = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure(level: int = INFO, stream: Optional[TextIO] = None, json_format: bool = False) -> logging.Handler:
+    """
+    Sends fol_sat records at `level` and above to `stream` (default stdout), as plain
+    messages or JSON lines. Replaces any handler a previous call installed.
+    """
+    root = logging.getLogger(LOGGER_ROOT)
+    for handler in [h for h in root.handlers if getattr(h, "_fol_sat", False)]:
+        root.removeHandler(handler)
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(JsonFormatter() if json_format else logging.Formatter("%(message)s"))
+    handler._fol_sat = True
+    root.addHandler(handler)
+    root.setLevel(level)
+    root.propagate = False
+    return handler
@@ -0,0 +1,265 @@
+"""
+synthetic.py
+
+Synthetic workloads for scaling tests of grounding, CNF conversion and solving.
+
+Every family returns a case dict in the same shape as a pipeline record:
+    {"premises": [...], "conclusion": str, "label": VALID | INVALID | None,
+     "family": str, "params": {...}}
+so cases can go straight through `pipeline.Pipeline` or be turned into
+Arguments with `as_argument`.
+
+Labels are known by construction where possible; random families get theirs
+from an independent oracle (brute-force evaluation or a direct SAT call on
+the integer clauses), never from the pipeline under test.
+
+Symbol conventions (the parser's atoms are one uppercase predicate followed by
+lowercase terms):
+    predicates  A..Y      ('Z' is reserved for disconnected conclusions)
+    constants   a..t
+    variables   x y z w v u
+"""
+
+import random
+from itertools import combinations, product
+from typing import Dict, List, Optional
+
+from argument import Argument
+from constants import AND, OR, NOT, IMPLIES, XOR, UNIVERSAL_Q, VALID, INVALID, ATOMIC_WFF, UNARY_WFF
+from WFFs.strictWFFs import string_to_WFF
+
+
+PREDICATES = "ABCDEFGHIJKLMNOPQRSTUVWXY"
+VARIABLES = "xyzwvu"
+CONSTANTS = "abcdefghijklmnopqrst"
+FRESH_CONCLUSION = "Za"
+
+# Largest atom count the brute-force oracle will enumerate
+MAX_BRUTE_FORCE_ATOMS = 16
+
+
+def _case(family: str, premise_strs: List[str], conclusion_str: str, label: Optional[str], **params) -> Dict:
+    return {"premises": premise_strs, "conclusion": conclusion_str, "label": label,
+            "family": family, "params": params}
+
+
+def _check_range(name: str, value: int, low: int, high: int) -> None:
+    if not low <= value <= high:
+        raise ValueError(f"{name} must be between {low} and {high}, got {value}.")
+
+
+def ground_atom(index: int) -> str:
+    """The index-th propositional atom: Aa, Ab, ..., At, Ba, ..."""
+    _check_range("atom index", index, 0, len(PREDICATES) * len(CONSTANTS) - 1)
+    return PREDICATES[index // len(CONSTANTS)] + CONSTANTS[index % len(CONSTANTS)]
+
+
+def as_argument(case: Dict, **kwargs) -> Argument:
+    """Builds the Argument for a case (kwargs go to Argument)."""
+    return Argument(case["premises"], case["conclusion"], **kwargs)
+
+
+# ==========================================================
+# --- Quantified families (grounding stress) ---
+# ==========================================================
+
+def implication_chain(premises: int = 5, domain_size: int = 3, valid: bool = True) -> Dict:
+    """
+    ∀x(Ax→Bx), ∀x(Bx→Cx), ..., Aa, ..., A<c>  ⊢  <last>a   (valid)
+    The invalid variant asks for the chain's start from its end.
+    """
+    _check_range("premises", premises, 1, len(PREDICATES) - 1)
+    _check_range("domain_size", domain_size, 1, len(CONSTANTS))
+
+    rules = [f"∀x({PREDICATES[i]}x→{PREDICATES[i + 1]}x)" for i in range(premises)]
+    facts = [f"{PREDICATES[0]}{c}" for c in CONSTANTS[:domain_size]]
+    if valid:
+        return _case("implication_chain", rules + facts, f"{PREDICATES[premises]}a", VALID,
+                     premises=premises, domain_size=domain_size)
+    facts = [f"{PREDICATES[premises]}{c}" for c in CONSTANTS[:domain_size]]
+    return _case("implication_chain", rules + facts, f"{PREDICATES[0]}a", INVALID,
+                 premises=premises, domain_size=domain_size)
+
+
+def nested_quantifiers(depth: int = 2, domain_size: int = 3, valid: bool = True) -> Dict:
+    """
+    ∀x∀y..(Axy..→Bxy..), ∀x∀y..(Axy..)  ⊢  Baa..   (valid)
+    Without the second premise the argument is invalid. Grounding size grows
+    as (domain + depth) ** depth, since variable letters join the domain.
+    """
+    _check_range("depth", depth, 1, len(VARIABLES))
+    _check_range("domain_size", domain_size, 1, len(CONSTANTS))
+
+    variables = VARIABLES[:depth]
+    quantifiers = "".join(f"{UNIVERSAL_Q}{v}" for v in variables)
+    rule = f"{quantifiers}(A{variables}→B{variables})"
+    facts = [f"A{c * depth}" for c in CONSTANTS[1:domain_size]]
+    premises = [rule] + facts + ([f"{quantifiers}(A{variables})"] if valid else [])
+    return _case("nested_quantifiers", premises, "B" + "a" * depth, VALID if valid else INVALID,
+                 depth=depth, domain_size=domain_size)
+
+
+# ==========================================================
+# --- Connective mixes (CNF conversion stress) ---
+# ==========================================================
+
+def or_of_ands(terms: int = 4, width: int = 2) -> Dict:
+    """
+    (A1a∧A1b..)∨(A2a∧A2b..)∨..  ⊢  A1b∨A2b∨..   (valid)
+    Naive distribution produces width ** terms clauses.
+    """
+    _check_range("width", width, 2, len(CONSTANTS))
+    _check_range("terms", terms, 1, len(PREDICATES))
+
+    conjunctions = ["(" + AND.join(f"{PREDICATES[t]}{CONSTANTS[i]}" for i in range(width)) + ")"
+                    for t in range(terms)]
+    conclusion = OR.join(f"{PREDICATES[t]}{CONSTANTS[width - 1]}" for t in range(terms))
+    return _case("or_of_ands", [OR.join(conjunctions)], conclusion, VALID, terms=terms, width=width)
+
+
+def connective_mix(premises: int = 4, atoms: int = 6, depth: int = 3,
+                   weights: Optional[Dict[str, float]] = None, seed: int = 0) -> Dict:
+    """
+    Random propositional premises over `atoms` ground atoms, built from
+    binary connectives drawn with `weights` (default: equal ∧ ∨ → ⊕) plus
+    occasional negation. The conclusion is another random formula.
+    Labelled by brute-force evaluation when atoms <= MAX_BRUTE_FORCE_ATOMS.
+    """
+    _check_range("atoms", atoms, 2, len(PREDICATES) * len(CONSTANTS))
+    _check_range("premises", premises, 1, 1000)
+    rng = random.Random(seed)
+    weights = weights or {AND: 1, OR: 1, IMPLIES: 1, XOR: 1}
+    operators, op_weights = zip(*weights.items())
+    pool = [ground_atom(i) for i in range(atoms)]
+
+    def formula(level: int) -> str:
+        if level == 0:
+            atom = rng.choice(pool)
+            return f"{NOT}{atom}" if rng.random() < 0.3 else atom
+        op = rng.choices(operators, op_weights)[0]
+        return f"({formula(level - 1)}{op}{formula(level - 1)})"
+
+    premise_strs = [formula(depth) for _ in range(premises)]
+    conclusion = formula(max(1, depth - 1))
+    label = None
+    if atoms <= MAX_BRUTE_FORCE_ATOMS:
+        label = brute_force_label(premise_strs, conclusion)
+    return _case("connective_mix", premise_strs, conclusion, label,
+                 premises=premises, atoms=atoms, depth=depth, weights=dict(weights), seed=seed)
+
+
+# ==========================================================
+# --- SAT families (solver stress) ---
+# ==========================================================
+
+def _clause_string(clause: List[int]) -> str:
+    return OR.join(f"{NOT}{ground_atom(-lit - 1)}" if lit < 0 else ground_atom(lit - 1) for lit in clause)
+
+
+def random_kcnf(variables: int = 20, ratio: float = 4.26, k: int = 3, seed: int = 0) -> Dict:
+    """
+    Random k-CNF with round(ratio * variables) clauses, one premise per clause,
+    against a fresh conclusion: valid iff the clauses are unsatisfiable.
+    ratio ≈ 4.26 is the 3-SAT phase transition. Labelled by a direct SAT call.
+    """
+    _check_range("variables", variables, k, len(PREDICATES) * len(CONSTANTS))
+    rng = random.Random(seed)
+    clauses = []
+    for _ in range(max(1, round(ratio * variables))):
+        chosen = rng.sample(range(1, variables + 1), k)
+        clauses.append([v if rng.random() < 0.5 else -v for v in chosen])
+
+    from pysat.solvers import Glucose3
+    with Glucose3(bootstrap_with=clauses) as solver:
+        label = INVALID if solver.solve() else VALID
+
+    return _case("random_kcnf", [_clause_string(c) for c in clauses], FRESH_CONCLUSION, label,
+                 variables=variables, ratio=ratio, k=k, seed=seed)
+
+
+def pigeonhole(holes: int = 4, extra_pigeons: int = 1) -> Dict:
+    """
+    holes + extra_pigeons pigeons into `holes` holes, atom P<pigeon><hole>.
+    One premise per pigeon (it sits somewhere) and one per hole (no two share it),
+    against a fresh conclusion: valid iff extra_pigeons > 0.
+    """
+    _check_range("holes", holes, 1, len(CONSTANTS) // 2)
+    _check_range("extra_pigeons", extra_pigeons, 0, len(CONSTANTS) - 2 * holes)
+    pigeon_names = CONSTANTS[:holes + extra_pigeons]
+    hole_names = CONSTANTS[len(pigeon_names):len(pigeon_names) + holes]
+
+    premises = [OR.join(f"P{p}{h}" for h in hole_names) for p in pigeon_names]
+    for h in hole_names:
+        exclusions = [f"{NOT}(P{p}{h}{AND}P{q}{h})" for p, q in combinations(pigeon_names, 2)]
+        if exclusions:
+            premises.append(AND.join(exclusions))
+    return _case("pigeonhole", premises, FRESH_CONCLUSION, VALID if extra_pigeons > 0 else INVALID,
+                 holes=holes, extra_pigeons=extra_pigeons)
+
+
+FAMILIES = {
+    "implication_chain": implication_chain,
+    "nested_quantifiers": nested_quantifiers,
+    "or_of_ands": or_of_ands,
+    "connective_mix": connective_mix,
+    "random_kcnf": random_kcnf,
+    "pigeonhole": pigeonhole,
+}
+
+
+def generate(family: str, **params) -> Dict:
+    """Builds one case of the named family."""
+    if family not in FAMILIES:
+        raise ValueError(f"Unknown family '{family}'. Choose from {sorted(FAMILIES)}.")
+    return FAMILIES[family](**params)
+
+
+# ==========================================================
+# --- Brute-force oracle ---
+# ==========================================================
+
+def evaluate(wff, assignment: Dict[str, bool]) -> bool:
+    """Truth value of a quantifier-free StrictWFF under an atom assignment."""
+    if wff.type == ATOMIC_WFF:
+        return assignment[wff.atom]
+    if wff.type == UNARY_WFF:
+        return not evaluate(wff.operand1, assignment)
+    a = evaluate(wff.operand1, assignment)
+    b = evaluate(wff.operand2, assignment)
+    if wff.operator == AND:
+        return a and b
+    if wff.operator == OR:
+        return a or b
+    if wff.operator == IMPLIES:
+        return (not a) or b
+    if wff.operator == XOR:
+        return a != b
+    raise ValueError(f"Cannot evaluate operator {wff.operator}")
+
+
+def _atoms(wff, found: set) -> set:
+    if wff.type == ATOMIC_WFF:
+        found.add(wff.atom)
+    else:
+        for operand in (wff.operand1, wff.operand2):
+            if operand is not None:
+                _atoms(operand, found)
+    return found
+
+
+def brute_force_label(premises: List[str], conclusion: str) -> str:
+    """VALID iff every assignment making all premises true makes the conclusion true."""
+    premise_wffs = [string_to_WFF(p) for p in premises]
+    conclusion_wff = string_to_WFF(conclusion)
+    atoms = set()
+    for wff in premise_wffs + [conclusion_wff]:
+        _atoms(wff, atoms)
+    atoms = sorted(atoms)
+    if len(atoms) > MAX_BRUTE_FORCE_ATOMS:
+        raise ValueError(f"Too many atoms for brute force: {len(atoms)}")
+
+    for values in product([False, True], repeat=len(atoms)):
+        assignment = dict(zip(atoms, values))
+        if all(evaluate(p, assignment) for p in premise_wffs) and not evaluate(conclusion_wff, assignment):
+            return INVALID
+    return VALID
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+
+from argument import Argument
+from async_solving import solve_stream
+from instrumentation import ListSink
+from sat_solving import CancelToken, SolverInterrupted, solve_cnf
+from WFFs.cnfWFFs import CnfWFF
+from constants import AND, OR, NOT
+
+
+PIGEONS = "abcdefghij"
+HOLES = "klmnopqrs"
+
+
+def pigeonhole_argument():
+    """10 pigeons, 9 holes: unsatisfiable premises, hard for Glucose (tens of seconds)."""
+    premises = ["∨".join(f"P{p}{h}" for h in HOLES) for p in PIGEONS]
+    premises += ["∧".join(f"~(P{p}{h}∧P{q}{h})" for p, q in combinations(PIGEONS, 2)) for h in HOLES]
+    return Argument(premises, "Qa")
+
+
+def pigeonhole_cnf():
+    def lit(atom, negated=False):
+        return CnfWFF(operator=NOT, operands=[CnfWFF(atom=atom)]) if negated else CnfWFF(atom=atom)
+
+    clauses = [CnfWFF(operator=OR, operands=[lit(f"P{p}{h}") for h in HOLES]) for p in PIGEONS]
+    clauses += [CnfWFF(operator=OR, operands=[lit(f"P{p}{h}", True), lit(f"P{q}{h}", True)])
+                for h in HOLES for p, q in combinations(PIGEONS, 2)]
+    return CnfWFF(operator=AND, operands=clauses)
+
+
+class TestCancelToken(unittest.TestCase):
+
+    def test_cancel_interrupts_native_solver(self):
+        token = CancelToken()
+        outcome = {}
+
+        def run():
+            try:
+                outcome["result"] = solve_cnf(pigeonhole_cnf(), token)
+            except SolverInterrupted:
+                outcome["interrupted"] = True
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        time.sleep(0.3)
+        token.cancel()
+        thread.join(timeout=10)
+        self.assertFalse(thread.is_alive())
+        self.assertTrue(outcome.get("interrupted"))
+
+    def test_cancelled_token_raises_before_solving(self):
+        token = CancelToken()
+        token.cancel()
+        with self.assertRaises(SolverInterrupted):
+            solve_cnf(CnfWFF(atom="P"), token)
+
+
+class TestAsyncSolving(unittest.TestCase):
+
+    def test_solve_async(self):
+        arg = Argument(["∀x(Px→Qx)", "Pa"], "Qa")
+        self.assertEqual(asyncio.run(arg.solve_async()), (True, None))
+
+    def test_solve_async_is_instrumented(self):
+        sink = ListSink()
+        argument = Argument(["∀x(Px→Qx)", "Pa"], "Qa", sink=sink)
+        self.assertEqual(asyncio.run(argument.solve_async())[0], True)
+        self.assertEqual(sink.metrics, [argument.metrics])
+        self.assertIn("solve", argument.metrics.stages)
+        self.assertGreater(argument.metrics.counts["clauses"], 0)
+
+    def test_solve_stream_in_order(self):
+        arguments = [
+            Argument(["∀x(Px→Qx)", "Pa"], "Qa"),
+            Argument(["∀x(Px→Qx)", "Qa"], "Pa"),
+            Argument(["P→Q", "P"], "Q"),
+            Argument(["∀x(Px→Qx)", "∀x(Qx→Rx)", "Pb"], "Rb"),
+        ]
+
+        async def collect():
+            return [valid async for valid, _ in solve_stream(arguments, concurrency=2)]
+
+        self.assertEqual(asyncio.run(collect()), [True, False, True, True])
+
+    def test_solve_stream_rejects_bad_concurrency(self):
+        async def collect():
+            return [r async for r in solve_stream([], concurrency=0)]
+
+        with self.assertRaises(ValueError):
+            asyncio.run(collect())
+
+    def test_cancellation_frees_the_worker(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        async def run():
+            task = asyncio.ensure_future(pigeonhole_argument().solve_async(executor))
+            await asyncio.sleep(0.5)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # The single worker thread is only free again once the solve was interrupted
+            loop = asyncio.get_running_loop()
+            return await asyncio.wait_for(loop.run_in_executor(executor, lambda: "free"), timeout=15)
+
+        try:
+            self.assertEqual(asyncio.run(run()), "free")
+        finally:
+            executor.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from formula_cache import cache_stats
+from benchmarks.stage_benchmarks import (
+    STAGES, run_benchmarks, compare_results, synthetic_inputs, _percentile
+)
+
+
+class TestStageBenchmarks(unittest.TestCase):
+
+    def test_percentile_nearest_rank(self):
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(_percentile(values, 50), 50.0)
+        self.assertEqual(_percentile(values, 95), 95.0)
+        self.assertEqual(_percentile(values, 99), 99.0)
+        self.assertEqual(_percentile([], 50), 0.0)
+
+    def test_run_reports_every_stage(self):
+        results = run_benchmarks(synthetic_inputs(count=4), repeat=1)
+        self.assertEqual(set(results["stages"]), set(STAGES))
+        for stats in results["stages"].values():
+            self.assertEqual(stats["count"], 4)
+            self.assertLessEqual(stats["p50_ms"], stats["p99_ms"])
+            self.assertGreater(stats["peak_alloc_kib"], 0)
+
+    def test_stages_are_not_served_from_cache(self):
+        before = cache_stats()
+        run_benchmarks(synthetic_inputs(count=4), repeat=2)
+        after = cache_stats()
+        for name in ("grounding", "cnf"):
+            self.assertEqual((after[name]["hits"], after[name]["misses"]),
+                             (before[name]["hits"], before[name]["misses"]), name)
+
+    def test_compare_flags_regressions(self):
+        def result(p50):
+            return {"stages": {"cnf": {"p50_ms": p50, "p95_ms": 1.0, "peak_alloc_kib": 1.0}}}
+
+        rows = compare_results(result(1.0), result(1.5), threshold=0.10)
+        flagged = [(r["stage"], r["metric"]) for r in rows if r["regression"]]
+        self.assertEqual(flagged, [("cnf", "p50_ms")])
+
+        rows = compare_results(result(1.0), result(1.05), threshold=0.10)
+        self.assertFalse(any(r["regression"] for r in rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
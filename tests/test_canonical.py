@@ -0,0 +1,72 @@
+import unittest
+
+from argument import Argument
+from canonical import canonicalize, fingerprint
+from pipeline import Pipeline, Stage, default_stages, records_from_arguments, canonicalize_stage, restore_stage, deduplicated
+
+
+ARGUMENT = (["∀x(Ax→Bx)", "Aa", "Cb∨¬Bb"], "Ba")
+# ARGUMENT with predicates and constants renamed and premises shuffled
+RENAMED = (["Pk∨¬Qk", "∀y(Ry→Qy)", "Rm"], "Qm")
+
+
+def solve(premises, conclusion):
+    argument = Argument(premises, conclusion)
+    argument.expand_quantifiers()
+    return argument.solve()
+
+
+class TestCanonical(unittest.TestCase):
+
+    def test_renamed_arguments_share_fingerprint(self):
+        self.assertEqual(fingerprint(*ARGUMENT), fingerprint(*RENAMED))
+        self.assertEqual(canonicalize(*ARGUMENT).premises, canonicalize(*RENAMED).premises)
+
+    def test_different_arguments_differ(self):
+        self.assertNotEqual(fingerprint(*ARGUMENT), fingerprint(["∀x(Ax→Bx)", "Aa", "Cb∨¬Bb"], "Bb"))
+        self.assertNotEqual(fingerprint(["Aa", "Bb"], "Aa"), fingerprint(["Aa", "Ab"], "Aa"))
+
+    def test_formatting_is_ignored(self):
+        self.assertEqual(fingerprint(["∀x((Ax → Bx))", "Aa"], "Ba"), fingerprint(["∀x(Ax→Bx)", "Aa"], "Ba"))
+
+    def test_validity_is_preserved(self):
+        for premises, conclusion in [ARGUMENT, (["∀x(Ax→Bx)", "Ab"], "Ba"), (["Aa∨Bb", "¬Aa"], "Bb")]:
+            canonical = canonicalize(premises, conclusion)
+            original = solve(premises, conclusion)[0]
+            self.assertEqual(solve(canonical.premises, canonical.conclusion)[0], original)
+
+    def test_counterexample_round_trip(self):
+        canonical = canonicalize(["∀x(Ax→Bx)", "Ab"], "Ba")
+        is_valid, model = solve(canonical.premises, canonical.conclusion)
+        self.assertFalse(is_valid)
+        original = canonical.original_model(model)
+        self.assertEqual(canonical.canonical_model(original), model)
+        self.assertTrue(original["Ab"])
+        self.assertFalse(original["Ba"])
+
+
+class TestDeduplication(unittest.TestCase):
+
+    def run_deduplicated(self, arguments):
+        records = Stage("canonicalize", canonicalize_stage).run(records_from_arguments(arguments))
+        results = deduplicated(records, Pipeline(default_stages()).run)
+        return list(Stage("restore", restore_stage).run(results))
+
+    def test_duplicates_reuse_results_in_order(self):
+        arguments = [ARGUMENT, (["∀x(Ax→Bx)", "Ab"], "Ba"), RENAMED]
+        results = self.run_deduplicated(arguments)
+        self.assertEqual([r["index"] for r in results], [0, 1, 2])
+        self.assertEqual([bool(r.get("duplicate")) for r in results], [False, False, True])
+        self.assertEqual([r["is_valid"] for r in results], [True, False, True])
+        self.assertEqual([r["premises"] for r in results], [a[0] for a in arguments])
+        self.assertNotIn("canonical", results[2])
+
+    def test_duplicate_counterexample_in_own_letters(self):
+        results = self.run_deduplicated([(["∀x(Ax→Bx)", "Ab"], "Ba"), (["∀x(Px→Qx)", "Pm"], "Qk")])
+        self.assertTrue(results[1]["duplicate"])
+        self.assertTrue(results[1]["counterexample"]["Pm"])
+        self.assertFalse(results[1]["counterexample"]["Qk"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import pickle
+import unittest
+
+from argument import Argument
+from cnf_diagnostics import CnfBlowupError, estimate_clauses, grounded_nodes, diagnose
+from pipeline import Pipeline, default_stages, records_from_arguments
+from synthetic import connective_mix, nested_quantifiers, or_of_ands, as_argument
+from instrumentation import count_nodes
+from WFFs.strictWFFs import string_to_WFF
+from WFFs.WFF_conversion import strict_to_cnf
+
+
+class TestEstimates(unittest.TestCase):
+
+    def test_matches_naive_conversion(self):
+        for seed in range(40):
+            argument = as_argument(connective_mix(premises=3, atoms=5, depth=3, seed=seed), filter_premises=False)
+            wff = argument.validity_wff
+            self.assertEqual(estimate_clauses(wff), len(strict_to_cnf(wff, encoding="direct").get_clauses()))
+
+    def test_or_of_ands(self):
+        self.assertEqual(estimate_clauses(string_to_WFF(or_of_ands(terms=6, width=3)["premises"][0])), 3 ** 6)
+
+    def test_quantifiers_use_domain(self):
+        argument = as_argument(nested_quantifiers(depth=2, domain_size=4), filter_premises=False)
+        nodes = grounded_nodes(argument.validity_wff, argument.domain)
+        argument.expand_quantifiers()
+        self.assertEqual(nodes, count_nodes(argument.validity_wff))
+        self.assertEqual(estimate_clauses(string_to_WFF("∀x(Ax∨Bx)"), ["a", "b", "x"]), 2)
+        self.assertEqual(estimate_clauses(string_to_WFF("∃x(Ax∧Bx)"), ["a", "b", "c", "x"]), 8)
+
+
+class TestDiagnose(unittest.TestCase):
+
+    def setUp(self):
+        self.premises = ["Aa", "∀x∀y((Ax∧Bx∧Cx)∨(Ay∧By∧Cy))", "Ab→Bb"]
+
+    def test_ranks_offending_premise_first(self):
+        report = diagnose(Argument(self.premises, "Ca", filter_premises=False))
+        worst = report.worst()
+        self.assertEqual(worst["source"], "premise 2")
+        self.assertGreater(worst["share"], 0.9)
+        self.assertEqual(worst["quantifiers"][0]["quantifier"], "∀x")
+        self.assertIn("premise 2", report.format())
+        self.assertAlmostEqual(sum(e["share"] for e in report.entries), 1.0)
+
+    def test_ceiling_aborts_before_grounding(self):
+        argument = Argument(self.premises, "Ca", filter_premises=False, max_clauses=50)
+        ungrounded = argument.validity_wff
+        with self.assertRaises(CnfBlowupError) as ctx:
+            argument.expand_quantifiers()
+        self.assertTrue(ctx.exception.report.exceeded)
+        self.assertEqual(ctx.exception.report.worst()["source"], "premise 2")
+        self.assertIs(argument.validity_wff, ungrounded)
+        pickle.loads(pickle.dumps(ctx.exception.report))
+
+    def test_strict_to_cnf_ceiling(self):
+        wff = string_to_WFF(or_of_ands(terms=8, width=2)["premises"][0])
+        with self.assertRaises(CnfBlowupError):
+            strict_to_cnf(wff, max_clauses=100, encoding="direct")
+        self.assertEqual(len(strict_to_cnf(wff, max_clauses=256, encoding="direct").get_clauses()), 256)
+        self.assertLess(len(strict_to_cnf(wff, max_clauses=100).get_clauses()), 100)
+
+    def test_pipeline_marks_blowups_unsolvable(self):
+        records = records_from_arguments([(self.premises, "Ca"), (["Aa", "∀x(Ax→Bx)"], "Ba")], max_clauses=50)
+        first, second = list(Pipeline(default_stages()).run(records))
+        self.assertFalse(first["solvable"])
+        self.assertTrue(first["error"].startswith("ground:"))
+        self.assertEqual(first["blowup"].worst()["source"], "premise 2")
+        self.assertTrue(second["is_valid"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+
+from argument import Argument
+from constants import VALID, DEFINITION_PREFIX
+from instrumentation import Metrics
+from synthetic import connective_mix, or_of_ands, as_argument
+from WFFs.strictWFFs import string_to_WFF
+from WFFs.WFF_conversion import strict_to_cnf, definitional_clauses, clauses_to_cnf
+
+
+def solve(premises, conclusion, **kwargs):
+    argument = Argument(premises, conclusion, **kwargs)
+    argument.expand_quantifiers()
+    return argument.solve()
+
+
+class TestDefinitionalEncoding(unittest.TestCase):
+
+    def test_clause_shapes(self):
+        clauses = definitional_clauses([string_to_WFF("Pa∧Qa")])
+        self.assertEqual(clauses, [["~_d1", "Pa"], ["~_d1", "Qa"], ["_d1", "~Pa", "~Qa"], ["_d1"]])
+        # Negation reuses the child's literal instead of a fresh variable
+        self.assertEqual(definitional_clauses([string_to_WFF("~Pa")]), [["~Pa"]])
+
+    def test_shared_subformulas_defined_once(self):
+        shared = string_to_WFF("Pa∨Qa")
+        clauses = definitional_clauses([shared, shared])
+        self.assertEqual(len(clauses), 3 + 2)
+
+    def test_linear_size(self):
+        for terms in (4, 8, 12):
+            wff = string_to_WFF(or_of_ands(terms=terms, width=2)["premises"][0])
+            cnf = strict_to_cnf(wff, encoding="definitional")
+            # one ∧ per term, an ∨ between terms, plus the unit clause
+            self.assertEqual(len(cnf.get_clauses()), 3 * (2 * terms - 1) + 1)
+
+    def test_clauses_to_cnf_round_trip(self):
+        clauses = [["Pa", "~Qa"], ["Ra"]]
+        self.assertEqual(clauses_to_cnf(clauses).get_clauses(), clauses)
+        self.assertEqual(clauses_to_cnf([["Pa"]]).get_clauses(), [["Pa"]])
+
+
+class TestMixedEncoding(unittest.TestCase):
+
+    def test_small_formulas_stay_direct(self):
+        wff = string_to_WFF("(Pa→Qa)∧(Qa∨Ra)")
+        self.assertEqual(strict_to_cnf(wff).get_clauses(), strict_to_cnf(wff, encoding="direct").get_clauses())
+
+    def test_large_conjuncts_are_definitional(self):
+        big = or_of_ands(terms=10, width=2)["premises"][0]
+        metrics = Metrics()
+        cnf = strict_to_cnf(string_to_WFF(f"({big})∧(Pa∨Qa)"), metrics)
+        self.assertEqual(metrics.counts["direct_conjuncts"], 1)
+        self.assertEqual(metrics.counts["definitional_conjuncts"], 1)
+        self.assertIn(["Pa", "Qa"], cnf.get_clauses())
+        self.assertLess(len(cnf.get_clauses()), 2 ** 10)
+
+    def test_encodings_agree_on_validity(self):
+        for seed in range(15):
+            case = connective_mix(premises=4, atoms=6, depth=3, seed=seed)
+            for encoding in ("direct", "definitional", "auto"):
+                is_valid, counterexample = as_argument(case, encoding=encoding, direct_clause_limit=4).solve()
+                self.assertEqual(VALID if is_valid else "invalid", case["label"], (seed, encoding))
+                if counterexample:
+                    self.assertFalse(any(k.startswith(DEFINITION_PREFIX) for k in counterexample))
+
+    def test_quantified_argument_routes_after_grounding(self):
+        premises = ["∀x((Ax∧Bx)∨(Cx∧Dx)∨(Ex∧Fx)∨(Gx∧Hx))", "∀x(~Ax∨~Bx)", "∀x(~Cx∨~Dx)", "∀x(~Ex∨~Fx)"]
+        is_valid, _ = solve(premises, "Ga", direct_clause_limit=8)
+        self.assertTrue(is_valid)
+        is_valid, _ = solve(premises[:-1], "Ga", direct_clause_limit=8)
+        self.assertFalse(is_valid)
+
+
+if __name__ == "__main__":
+    unittest.main()
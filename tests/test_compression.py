@@ -0,0 +1,67 @@
+import unittest
+
+from argument import Argument
+from canonical import fingerprint
+from get_data import SymbolCompressor, compress_fol, compress_folio_entry
+from WFFs.strictWFFs import string_to_WFF, atom_predicate, atom_terms, substitute_term, symbol_names
+
+
+class TestCompressFol(unittest.TestCase):
+
+    def test_compresses_predicates_and_constants(self):
+        compressed, abbr_map = compress_fol("∀x (Dog(x) → Animal(x)) ∧ Likes(rex, tom)")
+        self.assertEqual(compressed, "∀x (Ax → Bx) ∧ Cab")
+        self.assertEqual(abbr_map, {"A": "Dog", "B": "Animal", "C": "Likes", "a": "rex", "b": "tom"})
+
+    def test_existing_map_is_extended(self):
+        _, abbr_map = compress_fol("Dog(rex)")
+        compressed, abbr_map = compress_fol("Cat(tom) ∧ Dog(rex)", abbr_map)
+        self.assertEqual(compressed, "Bb ∧ Aa")
+        self.assertEqual(abbr_map["b"], "tom")
+
+    def test_more_than_26_symbols(self):
+        formula = " ∧ ".join(f"P{i}(c{i})" for i in range(30))
+        compressed, abbr_map = compress_fol(formula)
+        self.assertEqual(len(abbr_map), 60)
+        self.assertTrue(compressed.endswith("D1d1"))
+        self.assertEqual(abbr_map["D1"], "P29")
+
+    def test_bound_variable_never_clashes_with_constant(self):
+        compressor = SymbolCompressor()
+        compressor.compress(" ∧ ".join(f"P(k{i})" for i in range(23)))  # uses up a..w
+        self.assertEqual(compressor.compress("∀x (P(x))"), "∀x (Ax)")
+        self.assertEqual(compressor.compress("Q(k99)"), "By")
+        self.assertEqual(compressor.compress("∃y (Q(y))"), "∃z (Bz)")
+
+    def test_entry_with_many_symbols_solves(self):
+        premises = [f"∀x (P{i}(x) → P{i + 1}(x))" for i in range(30)] + ["P0(rex)"]
+        entry = compress_folio_entry({"premises-FOL": premises, "conclusion-FOL": "P30(rex)", "label": "True"})
+        argument = Argument(entry["premises"], entry["conclusion"])
+        argument.expand_quantifiers()
+        self.assertTrue(argument.solve()[0])
+
+
+class TestMultiCharacterSymbols(unittest.TestCase):
+
+    def test_symbol_names(self):
+        names = symbol_names("ab")
+        self.assertEqual([next(names) for _ in range(5)], ["a", "b", "a1", "b1", "a2"])
+
+    def test_atoms(self):
+        self.assertEqual(atom_predicate("P2a1b"), "P2")
+        self.assertEqual(atom_terms("P2a1b"), ["a1", "b"])
+        self.assertEqual(substitute_term("Pa1ab", "a", "c2"), "Pa1c2b")
+
+    def test_parse_and_ground(self):
+        wff = string_to_WFF("∀x1(P2x1→Qa10)")
+        self.assertEqual(wff.quantifier, ("∀", "x1"))
+        self.assertEqual(sorted(wff.get_domain()), ["a10", "x1"])
+        self.assertEqual(repr(wff.expanded(["a10", "x1"])), "(P2a10 → Qa10)")
+
+    def test_canonical_form_renames_whole_symbols(self):
+        self.assertEqual(fingerprint(["∀x(A1x→B2x)", "A1c3"], "B2c3"), fingerprint(["∀x(Ax→Bx)", "Aa"], "Ba"))
+        self.assertNotEqual(fingerprint(["Pa1"], "Pa"), fingerprint(["Pa"], "Pa"))
+
+
+if __name__ == "__main__":
+    unittest.main()
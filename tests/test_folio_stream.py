@@ -0,0 +1,86 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from get_data import FolioRecord, folio_shards, iter_folio_data, stream_folio
+from pipeline import prefetched, records_from_folio
+
+
+HEADER = "premises\tpremises-FOL\tconclusion\tconclusion-FOL\tlabel\n"
+ROWS = [
+    "['x']\t['∀x (Dog(x) → Animal(x))', 'Dog(rex)']\tc\tAnimal(rex)\tTrue\n",
+    "\n",
+    "['x']\t['∀x (Cat(x) → Pet(x))', 'Cat(tom)']\tc\tPet(rex)\tFalse\n",
+    "['x']\t['Likes(ann, bob)']\tc\tLikes(bob, ann)\tUnknown\n",
+    "['x']\t['Tall(ann)']\tc\tTall(ann)\tTrue\n",
+]
+
+
+class TestFolioStream(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as f:
+            f.write(HEADER + "".join(ROWS))
+            cls.path = f.name
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.path)
+
+    def test_typed_records(self):
+        records = list(stream_folio(self.path))
+        self.assertEqual([r.id for r in records], [1, 2, 3, 4])
+        self.assertIsInstance(records[0], FolioRecord)
+        self.assertEqual(records[0].premises, ["∀x (Ax → Bx)", "Aa"])
+        self.assertEqual(records[2].map, {"A": "Likes", "a": "ann", "b": "bob"})
+        self.assertEqual([r.as_dict() for r in records], list(iter_folio_data(self.path)))
+
+    def test_shards_cover_split_once(self):
+        full = list(stream_folio(self.path))
+        shards = folio_shards(3, self.path)
+        self.assertEqual(len(shards), 3)
+        self.assertEqual([r for start, stop in shards for r in stream_folio(self.path, start, stop)], full)
+        self.assertEqual([r.id for r in stream_folio(self.path, 2, 4)], [2, 3])
+
+    def test_records_keep_global_index(self):
+        records = list(records_from_folio(self.path, start=3, prefetch=2))
+        self.assertEqual([r["index"] for r in records], [2, 3])
+        self.assertEqual(records[0]["premises"], ["Aab"])
+
+
+class TestPrefetched(unittest.TestCase):
+
+    def test_order_is_preserved(self):
+        self.assertEqual(list(prefetched(range(100), 3)), list(range(100)))
+
+    def test_errors_reach_consumer(self):
+        def failing():
+            yield 1
+            raise ValueError("bad line")
+
+        stream = prefetched(failing(), 2)
+        self.assertEqual(next(stream), 1)
+        with self.assertRaisesRegex(ValueError, "bad line"):
+            next(stream)
+
+    def test_early_close_stops_thread(self):
+        closed = threading.Event()
+
+        def endless():
+            try:
+                while True:
+                    yield 0
+            finally:
+                closed.set()
+
+        stream = prefetched(endless(), 4)
+        next(stream)
+        stream.close()
+        self.assertTrue(closed.is_set())
+        self.assertFalse(any(t.name == "prefetch" for t in threading.enumerate()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+from argument import Argument
+from formula_cache import FormulaCache, CNF_CACHE, cache_stats, clear_caches
+from synthetic import or_of_ands
+
+
+STORY = ["∀x(Ax→Bx)", "∀x(Bx→Cx)", "Aa", "Ab"]
+
+
+def solved(premises, conclusion, **kwargs):
+    argument = Argument(premises, conclusion, **kwargs)
+    argument.expand_quantifiers()
+    return argument, argument.solve()
+
+
+class TestFormulaCache(unittest.TestCase):
+
+    def test_lru_bound_and_stats(self):
+        cache = FormulaCache(maxsize=2)
+        calls = []
+        for key in ["a", "b", "a", "c", "b"]:
+            cache.get(key, lambda key=key: calls.append(key) or key.upper())
+        self.assertEqual(calls, ["a", "b", "c", "b"])
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"], stats["size"]), (1, 4, 2, 2))
+        with self.assertRaises(ValueError):
+            FormulaCache(maxsize=0)
+
+
+class TestArgumentCaching(unittest.TestCase):
+
+    def setUp(self):
+        clear_caches()
+
+    def test_shared_premises_are_reused(self):
+        solved(STORY, "Ca")
+        misses = CNF_CACHE.stats()["misses"]
+        solved(STORY, "Cb")
+        self.assertEqual(CNF_CACHE.stats()["misses"], misses)
+        self.assertEqual(CNF_CACHE.stats()["hits"], len(STORY))
+        self.assertGreater(cache_stats()["grounding"]["hits"], 0)
+
+    def test_domain_is_part_of_the_key(self):
+        solved(STORY, "Ca")
+        misses = CNF_CACHE.stats()["misses"]
+        solved(STORY, "Cc")  # a new constant changes the domain, so nothing is reused
+        self.assertEqual(CNF_CACHE.stats()["misses"], misses + len(STORY))
+
+    def test_domain_order_does_not_matter(self):
+        argument, _ = solved(["∀x(Bx→Cx)", "Ab", "∀x(Ax→Bx)", "Ac", "Aa"], "Ca")
+        self.assertEqual(argument.domain, sorted(argument.domain))
+        misses = CNF_CACHE.stats()["misses"]
+        solved(["Ac", "Aa", "∀x(Ax→Bx)", "Ab", "∀x(Bx→Cx)"], "Cb")
+        self.assertEqual(CNF_CACHE.stats()["misses"], misses)
+
+    def test_counts_do_not_depend_on_the_cache(self):
+        keys = ["direct_conjuncts", "definitional_conjuncts"]
+        plain, _ = solved(STORY, "Ca", instrument=True, cache=False)
+        expected = {key: plain.metrics.counts.get(key) for key in keys}
+        for hits, misses in [(0, len(STORY)), (len(STORY), 0)]:
+            cached, _ = solved(STORY, "Ca", instrument=True)
+            counts = cached.metrics.counts
+            self.assertEqual({key: counts.get(key) for key in keys}, expected)
+            self.assertEqual((counts.get("cnf_cache_hits", 0), counts.get("cnf_cache_misses", 0)), (hits, misses))
+            self.assertIn("cnf.convert", cached.metrics.stages)
+
+    def test_matches_monolithic_conversion(self):
+        for conclusion in ["Ca", "~Ca", "Cc"]:
+            cached, result = solved(STORY + ["Aa"], conclusion, encoding="direct")
+            plain, expected = solved(STORY + ["Aa"], conclusion, encoding="direct", cache=False)
+            self.assertEqual(result, expected)
+            self.assertEqual(sorted(map(sorted, cached.to_cnf().get_clauses())),
+                             sorted(map(sorted, set(map(tuple, plain.to_cnf().get_clauses())))))
+
+    def test_definitional_blocks_do_not_collide(self):
+        big = or_of_ands(terms=8, width=2)
+        other = or_of_ands(terms=7, width=3)
+        premises = big["premises"] + other["premises"]
+        _, (is_valid, _) = solved(premises, big["conclusion"])
+        self.assertTrue(is_valid)
+        _, (is_valid, _) = solved(premises, "~" + big["conclusion"].split("∨")[0])
+        self.assertFalse(is_valid)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from WFFs.strictWFFs import StrictWFF, FrozenStrictWFF, string_to_WFF, string_to_frozen_WFF, freeze
+from argument import Argument
+
+
+class TestFrozenStrictWFF(unittest.TestCase):
+
+    def test_freeze_is_immutable(self):
+        wff = freeze(string_to_WFF("∀x(Px→Qx)"))
+        self.assertIsInstance(wff, FrozenStrictWFF)
+        with self.assertRaises(AttributeError):
+            wff.operator = "∧"
+        with self.assertRaises(AttributeError):
+            wff.operand1.operand1.atom = "Ra"
+
+    def test_expand_returns_new_tree(self):
+        wff = freeze(string_to_WFF("∀x(Px→Qx)"))
+        before = repr(wff)
+        expanded = wff.expand_quantifiers(["a", "b", "x"])
+        self.assertEqual(repr(wff), before)
+        self.assertEqual(repr(expanded), "((Pa → Qa) ∧ (Pb → Qb))")
+
+    def test_matches_mutating_expansion(self):
+        s = "∀x(Px→∃y(Rxy∧Qy))"
+        domain = ["a", "b", "x", "y"]
+        mutable = string_to_WFF(s)
+        frozen = string_to_frozen_WFF(s)
+        self.assertEqual(repr(frozen.expand_quantifiers(domain)), repr(mutable.expand_quantifiers(domain)))
+
+    def test_unchanged_subtrees_are_shared(self):
+        wff = freeze(string_to_WFF("(Pa∧∀x(Qx))"))
+        expanded = wff.expanded(["a", "b", "x"])
+        self.assertIs(expanded.operand1, wff.operand1)
+
+        no_quantifiers = freeze(string_to_WFF("(Pa∧Qb)"))
+        self.assertIs(no_quantifiers.expanded(["a", "b"]), no_quantifiers)
+
+    def test_structural_equality_and_hash(self):
+        a = freeze(string_to_WFF("(Pa→Qa)"))
+        b = freeze(string_to_WFF("(Pa→Qa)"))
+        self.assertIsNot(a, b)
+        self.assertEqual(a, b)
+        self.assertEqual(len({a, b}), 1)
+
+
+class TestArgumentOnFrozenWFFs(unittest.TestCase):
+
+    def test_parse_cache_shared_between_arguments(self):
+        first = Argument(["∀x(Px→Qx)", "Pa"], "Qa")
+        second = Argument(["∀x(Px→Qx)", "Qb"], "Pb")
+        self.assertIs(first.premises[0], second.premises[0])
+
+    def test_expansion_does_not_touch_shared_premises(self):
+        first = Argument(["∀x(Px→Qx)", "Pa"], "Qa")
+        second = Argument(["∀x(Px→Qx)", "Pa", "Pb"], "Qb")
+        first.expand_quantifiers()
+        self.assertEqual(repr(second.premises[0]), "∀x((Px → Qx))")
+        second.expand_quantifiers()
+        self.assertTrue(first.solve()[0])
+        self.assertTrue(second.solve()[0])
+
+    def test_input_strict_wffs_are_not_mutated(self):
+        premise = string_to_WFF("∀x(Px→Qx)")
+        arg = Argument([premise, "Pa"], "Qa")
+        arg.expand_quantifiers()
+        self.assertEqual(premise.type, "quantifier_wff")
+
+    def test_cnf_is_cached_until_regrounding(self):
+        arg = Argument(["∀x(Px→Qx)", "Pa"], "Qa")
+        arg.expand_quantifiers()
+        self.assertIs(arg.to_cnf(), arg.to_cnf())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+from benchmarks.import_time import (heavy_imports, loaded_modules, format_results, run_benchmarks,
+                                   startup_imports)
+
+
+class TestLazyImports(unittest.TestCase):
+    """Heavy modules are loaded on first use, not when the library or CLI is imported."""
+
+    def test_library_imports_are_light(self):
+        for module in ["WFFs.strictWFFs", "WFFs.WFF_conversion", "argument", "pipeline"]:
+            self.assertEqual(loaded_modules(module), [], module)
+
+    def test_cli_import_is_light(self):
+        self.assertEqual(loaded_modules("init", "init.parse_args([])"), [])
+
+    def test_entry_point_startup_imports_are_light(self):
+        # Every module imported on the way, however indirectly, not just the entry point itself
+        for module, code in [("init", "init.parse_args([])"), ("pipeline", ""), ("argument", "")]:
+            imports = startup_imports(module, code)
+            self.assertIn(module, imports)
+            self.assertGreater(len(imports), 1)
+            self.assertEqual(heavy_imports(imports), [], module)
+
+    def test_startup_imports_see_indirect_heavy_imports(self):
+        imports = startup_imports("argument", "argument.Argument(['P→Q', 'P'], 'Q').solve()")
+        self.assertIn("pysat.solvers", heavy_imports(imports))
+
+    def test_parse_and_cnf_do_not_load_the_solver(self):
+        code = "a = argument.Argument(['∀x(Px→Qx)', 'Pa'], 'Qa'); a.expand_quantifiers(); a.to_cnf()"
+        self.assertNotIn("pysat", loaded_modules("argument", code))
+
+    def test_solving_loads_the_solver(self):
+        code = "argument.Argument(['P→Q', 'P'], 'Q').solve()"
+        self.assertIn("pysat", loaded_modules("argument", code))
+
+    def test_benchmark_reports_every_module(self):
+        results = run_benchmarks(["argument"], repeat=1)
+        self.assertEqual(results["modules"]["argument"]["loads"], [])
+        self.assertGreaterEqual(results["modules"]["argument"]["ms"], 0.0)
+        self.assertIn("argument", format_results(results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import io
+import json
+import logging
+import os
+import tempfile
+import tracemalloc
+import unittest
+from contextlib import redirect_stdout
+
+from argument import Argument
+import init
+from instrumentation import Metrics, MetricsSink, ListSink, ChromeTraceSink, MemorySummary, allocation_sites, count_nodes
+from result_log import result_row
+from structured_logging import configure
+from pipeline import Pipeline, default_stages, records_from_arguments
+from WFFs.strictWFFs import string_to_WFF
+from WFFs.WFF_conversion import strict_to_cnf
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_stage_accumulates(self):
+        metrics = Metrics("m")
+        with metrics.stage("a"):
+            pass
+        with metrics.stage("a"):
+            pass
+        self.assertIn("a", metrics.stages)
+        self.assertEqual(len(metrics.events), 2)
+
+    def test_sinks_must_implement_emit(self):
+        with self.assertRaises(TypeError):
+            MetricsSink()
+
+        class Incomplete(MetricsSink):
+            pass
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_count_nodes(self):
+        self.assertEqual(count_nodes(string_to_WFF("(Pa→~Qa)")), 4)
+
+    def test_strict_to_cnf_steps(self):
+        metrics = Metrics()
+        strict_to_cnf(string_to_WFF("(P→(Q∧R))"), metrics)
+        self.assertIn("cnf.distribute", metrics.stages)
+        self.assertIn("cnf.convert", metrics.stages)
+
+
+class TestInstrumentedArgument(unittest.TestCase):
+
+    def test_uninstrumented_by_default(self):
+        arg = Argument(["∀x(Px→Qx)", "Pa"], "Qa")
+        self.assertIsNone(arg.metrics)
+
+    def test_metrics_and_sink(self):
+        sink = ListSink()
+        arg = Argument(["∀x(Px→Qx)", "Pa", "Pb"], "Qa", sink=sink, label="ex")
+        arg.expand_quantifiers()
+        self.assertTrue(arg.solve()[0])
+
+        self.assertEqual(sink.metrics, [arg.metrics])
+        metrics = arg.metrics
+        for name in ["parse", "expand", "cnf", "solve"]:
+            self.assertIn(name, metrics.stages)
+        self.assertLess(metrics.counts["nodes_before_grounding"], metrics.counts["nodes_after_grounding"])
+        self.assertEqual(metrics.counts["variables"], 4)
+        self.assertIn("propagations", metrics.solver)
+
+    def test_pipeline_records_carry_metrics(self):
+        records = records_from_arguments([(["∀x(Px→Qx)", "Pa"], "Qa")], instrument=True)
+        result = next(Pipeline(default_stages()).run(records))
+        self.assertIn("solve", result["metrics"].stages)
+        self.assertEqual(result["metrics"].label, 0)
+
+
+class TestChromeTrace(unittest.TestCase):
+
+    def test_trace_file(self):
+        sink = ChromeTraceSink()
+        for i in range(2):
+            arg = Argument(["∀x(Px→Qx)", "Pa"], "Qa", sink=sink, label=f"arg{i}")
+            arg.expand_quantifiers()
+            arg.solve()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            sink.write(path)
+            with open(path, encoding="utf-8") as f:
+                trace = json.load(f)
+
+        events = trace["traceEvents"]
+        self.assertEqual({e["tid"] for e in events}, {1, 2})
+        complete = [e for e in events if e["ph"] == "X"]
+        self.assertTrue(all(e["dur"] >= 0 for e in complete))
+        self.assertIn("expand", {e["name"] for e in complete})
+
+
+class TestMemoryAccounting(unittest.TestCase):
+
+    def setUp(self):
+        self.was_tracing = tracemalloc.is_tracing()
+        tracemalloc.start()
+
+    def tearDown(self):
+        if not self.was_tracing:
+            tracemalloc.stop()
+
+    def test_peak_and_retained(self):
+        metrics = Metrics()
+        with metrics.stage("cnf"):
+            kept = [0] * 100_000
+            temporary = [0] * 200_000
+            del temporary
+        with metrics.stage("solve"):
+            [0] * 100_000
+        with metrics.stage("parse"):
+            [0] * 100_000
+        self.assertGreaterEqual(metrics.memory["cnf"]["peak"], 1_600_000)
+        self.assertGreaterEqual(metrics.memory["cnf"]["retained"], 700_000)
+        self.assertLess(metrics.memory["solve"]["retained"], 100_000)
+        self.assertGreaterEqual(metrics.memory["solve"]["peak"], 700_000)
+        self.assertNotIn("parse", metrics.memory)
+        self.assertEqual(metrics.to_dict()["memory"], metrics.memory)
+        del kept
+
+    def test_off_without_tracing(self):
+        tracemalloc.stop()
+        metrics = Metrics()
+        with metrics.stage("cnf"):
+            [0] * 1000
+        self.assertEqual(metrics.memory, {})
+        tracemalloc.start()
+
+    def test_pipeline_records_and_summary(self):
+        records = records_from_arguments([(["∀x(Px→Qx)", "Pa", "Pb"], "Qa"), (["P→Q", "P"], "Q")], instrument=True)
+        results = list(Pipeline(default_stages()).run(records))
+        self.assertEqual(set(results[0]["metrics"].memory), {"expand", "cnf", "solve"})
+        self.assertIn("native", results[0]["metrics"].memory["solve"])
+        self.assertNotIn("expand", results[1]["metrics"].memory)
+        self.assertEqual(result_row(results[0])["memory"], results[0]["metrics"].memory)
+
+        summary = MemorySummary()
+        for result in results:
+            summary.emit(result["metrics"], label=f"#{result['index'] + 1}")
+        self.assertEqual(summary.stages["cnf"]["arguments"], 2)
+        self.assertEqual(summary.stages["expand"]["peak_label"], "#1")
+        table = summary.table().splitlines()
+        self.assertEqual([line.split()[0] for line in table[1:]], ["expand", "cnf", "solve"])
+
+    def test_allocation_sites(self):
+        baseline = tracemalloc.take_snapshot()
+        kept = [str(i) * 10 for i in range(5000)]
+        sites = allocation_sites(baseline, n=3)
+        self.assertTrue(sites[0][0].startswith("test_instrumentation.py:"))
+        self.assertGreater(sites[0][1], 100_000)
+        del kept
+
+    def test_init_memory_flag(self):
+        tracemalloc.stop()
+        with tempfile.TemporaryDirectory() as tmp:
+            data = os.path.join(tmp, "folio.txt")
+            with open(data, "w", encoding="utf-8") as f:
+                f.write("premises\tpremises-FOL\tconclusion\tconclusion-FOL\tlabel\n")
+                f.write("['x']\t['∀x (Dog(x) → Animal(x))', 'Dog(rex)']\tc\tAnimal(rex)\tTrue\n" * 2)
+            with redirect_stdout(io.StringIO()) as out:
+                init.main(["--data", data, "--quiet", "--memory"])
+        configure(logging.WARNING, stream=io.StringIO())
+        self.assertIn("Memory per stage", out.getvalue())
+        self.assertIn("Top allocation sites", out.getvalue())
+        self.assertFalse(tracemalloc.is_tracing())
+        tracemalloc.start()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+from argument import Argument
+from constants import VALID, INVALID
+from get_data import (SYMBOL_SET, le_symbol_set, swap_symbols, iter_logical_entailment_data,
+                      count_logical_entailment_records)
+from parallel import evaluate_parallel
+from pipeline import records_from_logical_entailment
+
+
+ROWS = [
+    "(p>q),(~q>~p),1,0,0,0\n",
+    "(p|q),p,0,0,0,0\n",
+    "\n",
+    "(a&(a>b)),b,1,1,1,1\n",
+    "a,b,0,0,0,0\n",
+]
+
+
+class TestLogicalEntailmentData(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as f:
+            f.write("".join(ROWS))
+            cls.path = f.name
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.path)
+
+    def test_swap_symbols(self):
+        self.assertEqual(swap_symbols("(~p>(q&r))|s", le_symbol_set, SYMBOL_SET), "(~p→(q∧r))∨s")
+
+    def test_rows_are_translated(self):
+        rows = list(iter_logical_entailment_data(self.path))
+        self.assertEqual(count_logical_entailment_records(self.path), 4)
+        self.assertEqual(rows[0], (1, ["(P→Q)"], "(~Q→~P)", VALID))
+        self.assertEqual([row[0] for row in rows], [1, 2, 3, 4])
+        self.assertEqual([row[3] for row in rows], [VALID, INVALID, VALID, INVALID])
+
+    def test_line_range(self):
+        self.assertEqual([row[0] for row in iter_logical_entailment_data(self.path, 2, 4)], [2, 3])
+        self.assertEqual(list(iter_logical_entailment_data(self.path, 9)), [])
+
+    def test_parallel_path_matches_labels(self):
+        records = records_from_logical_entailment(self.path, prefetch=2)
+        results = list(evaluate_parallel(records, workers=2, chunksize=1))
+        self.assertEqual([r["index"] for r in results], [0, 1, 2, 3])
+        self.assertEqual([r["computed_label"] for r in results], [r["label"] for r in results])
+
+
+class TestPropositionalArguments(unittest.TestCase):
+
+    def test_no_domain_needed(self):
+        argument = Argument(["P→Q", "P"], "Q")
+        self.assertTrue(argument.solvable())
+        argument.expand_quantifiers()
+        self.assertEqual(argument.solve(), (True, None))
+
+    def test_single_clause_cnf(self):
+        # The unrelated premise is filtered out, leaving only ¬Q
+        argument = Argument(["P"], "Q")
+        is_valid, counterexample = argument.solve()
+        self.assertFalse(is_valid)
+        self.assertEqual(counterexample, {"Q": False})
+
+    def test_quantified_argument_still_needs_domain(self):
+        self.assertFalse(Argument(["∀x(Px)"], "Px").solvable())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import threading
+import unittest
+
+from argument import Argument
+from instrumentation import ListSink
+from parallel import evaluate_parallel, solve_many, summarize
+from pipeline import records_from_arguments
+from constants import VALID, INVALID
+
+
+ARGUMENTS = [
+    (["∀x(Px→Qx)", "Pa"], "Qa"),
+    (["∀x(Px→Qx)", "Qa"], "Pa"),
+    (["P→Q", "P"], "Q"),
+    (["∀x(Px→Qx)", "∀x(Qx→Rx)", "Pb"], "Rb"),
+    (["∃x(Px)", "Pa"], "Pb"),
+]
+LABELS = [VALID, INVALID, VALID, VALID, VALID]
+
+
+class TestEvaluateParallel(unittest.TestCase):
+
+    def test_results_in_input_order(self):
+        records = records_from_arguments(ARGUMENTS, LABELS)
+        results = list(evaluate_parallel(records, workers=2, chunksize=2))
+        self.assertEqual([r["index"] for r in results], list(range(len(ARGUMENTS))))
+        self.assertEqual([r.get("computed_label") for r in results], [VALID, INVALID, VALID, VALID, INVALID])
+        self.assertNotIn("argument", results[0])
+        self.assertNotIn("cnf", results[0])
+
+    def test_summary_matches_serial_counting(self):
+        records = records_from_arguments(ARGUMENTS, LABELS)
+        summary = summarize(evaluate_parallel(records, workers=2, chunksize=1))
+        self.assertEqual(summary["total"], 5)
+        self.assertEqual(summary["correct"], 4)
+
+    def test_keep_cnf(self):
+        records = records_from_arguments(ARGUMENTS[:1])
+        result = next(evaluate_parallel(records, workers=1, keep_cnf=True))
+        self.assertIn("cnf", result)
+
+
+class TestSolveMany(unittest.TestCase):
+
+    def test_solve_many_ordered(self):
+        arguments = [Argument(p, c) for p, c in ARGUMENTS]
+        results = solve_many(arguments, workers=2, chunksize=1)
+        self.assertEqual([valid for valid, _ in results], [True, False, True, True, False])
+        self.assertIsNotNone(results[1][1])
+
+    def test_solve_many_keeps_metrics_and_emits_sinks_in_parent(self):
+        sink = ListSink()
+        sink.lock = threading.Lock()  # not picklable: the sink must stay in the parent
+        arguments = [Argument(p, c, sink=sink, label=str(i)) for i, (p, c) in enumerate(ARGUMENTS)]
+        solve_many(arguments, workers=2, chunksize=1)
+        self.assertEqual(sorted(m.label for m in sink.metrics), [str(i) for i in range(len(ARGUMENTS))])
+        for argument in arguments:
+            self.assertIs(argument.sink, sink)
+            self.assertIn("solve", argument.metrics.stages)
+            self.assertGreater(argument.metrics.counts["clauses"], 0)
+
+    def test_solve_many_empty(self):
+        self.assertEqual(solve_many([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
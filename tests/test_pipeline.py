@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from pipeline import Pipeline, Stage, default_stages, records_from_arguments, records_from_folio
+from constants import VALID, INVALID
+
+
+ARGUMENTS = [
+    (["∀x(Px→Qx)", "Pa"], "Qa"),
+    (["∀x(Px→Qx)", "Qa"], "Pa"),
+    (["∀x(Px→Qx)", "∀x(Qx→Rx)", "Pb"], "Rb"),
+]
+
+
+class TestStage(unittest.TestCase):
+
+    def test_inline_stage_is_lazy(self):
+        seen = []
+
+        def source():
+            for i in range(5):
+                seen.append(i)
+                yield {"index": i}
+
+        stream = Stage("noop", lambda r: r).run(source())
+        next(stream)
+        self.assertEqual(seen, [0])
+
+    def test_executor_stage_preserves_order(self):
+        def slow_double(record):
+            record["value"] = record["index"] * 2
+            return record
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            stage = Stage("double", slow_double, executor=pool, batch_size=2, max_pending=2)
+            out = list(stage.run({"index": i} for i in range(9)))
+        self.assertEqual([r["value"] for r in out], [i * 2 for i in range(9)])
+
+    def test_invalid_batch_size(self):
+        with self.assertRaises(ValueError):
+            Stage("bad", lambda r: r, batch_size=0)
+
+
+class TestPipeline(unittest.TestCase):
+
+    def test_default_pipeline_labels(self):
+        records = records_from_arguments(ARGUMENTS)
+        labels = [r["computed_label"] for r in Pipeline(default_stages()).run(records)]
+        self.assertEqual(labels, [VALID, INVALID, VALID])
+
+    def test_threaded_solve_stage_matches_inline(self):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            stages = default_stages(executors={"cnf": pool, "solve": pool}, batch_sizes={"solve": 2})
+            results = list(Pipeline(stages).run(records_from_arguments(ARGUMENTS)))
+        self.assertEqual([r["index"] for r in results], [0, 1, 2])
+        self.assertEqual([r["is_valid"] for r in results], [True, False, True])
+
+    def test_unsolvable_record_passes_through(self):
+        results = list(Pipeline(default_stages()).run(records_from_arguments([(["∀x(Px)"], "Px")])))
+        self.assertFalse(results[0]["solvable"])
+        self.assertNotIn("cnf", results[0])
+
+    def test_records_from_folio_streams_file(self):
+        header = "premises\tpremises-FOL\tconclusion\tconclusion-FOL\tlabel\n"
+        row = "['x']\t['∀x (Dog(x) → Animal(x))', 'Dog(rex)']\tc\tAnimal(rex)\tTrue\n"
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as f:
+            f.write(header + row)
+            path = f.name
+        try:
+            records = list(records_from_folio(path))
+        finally:
+            os.remove(path)
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["label"], VALID)
+        self.assertEqual(records[0]["premises"], ["∀x (Ax → Bx)", "Aa"])
+        self.assertEqual(records[0]["conclusion"], "Ba")
+
+
+if __name__ == "__main__":
+    unittest.main()
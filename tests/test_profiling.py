@@ -0,0 +1,105 @@
+import io
+import logging
+import os
+import pstats
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+import init
+import profiling
+from pipeline import Pipeline, default_stages, records_from_arguments
+from profiling import StageProfiler, COLLAPSED_FILE
+from structured_logging import configure
+
+
+def busy(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def outer_work() -> int:
+    return busy(20000)
+
+
+class TestStageProfiler(unittest.TestCase):
+
+    def function_names(self, profiler, stage):
+        return {func[2] for func in profiler.stats(stage).stats}
+
+    def test_sections_nest_without_double_counting(self):
+        profiler = StageProfiler()
+        with profiler.section("outer"):
+            outer_work()
+            with profiler.section("inner"):
+                busy(20000)
+        self.assertIn("outer_work", self.function_names(profiler, "outer"))
+        self.assertNotIn("outer_work", self.function_names(profiler, "inner"))
+        self.assertIn("busy", self.function_names(profiler, "inner"))
+        calls = {func[2]: entry[1] for func, entry in profiler.stats("outer").stats.items()}
+        self.assertEqual(calls["busy"], 1)
+
+    def test_profiler_bookkeeping_is_dropped(self):
+        profiler = StageProfiler()
+        profiler.wrap("work", busy)(1000)
+        files = {func[0] for func in profiler.stats("work").stats}
+        self.assertNotIn(profiling.__file__, files)
+        self.assertFalse(any("disable" in func[2] for func in profiler.stats("work").stats))
+
+    def test_iterate_profiles_the_source(self):
+        profiler = StageProfiler()
+
+        def source():
+            for n in (1000, 2000):
+                yield busy(n)
+
+        self.assertEqual(list(profiler.iterate("load", source())), [busy(1000), busy(2000)])
+        self.assertIn("busy", self.function_names(profiler, "load"))
+
+    def test_pipeline_stages_and_outputs(self):
+        profiler = StageProfiler()
+        records = profiler.iterate("load", records_from_arguments([(["∀x(Px→Qx)", "Pa", "Pb"], "Qa")] * 3))
+        results = list(Pipeline(default_stages(profiler=profiler)).run(records))
+        self.assertTrue(all(r["is_valid"] for r in results))
+        self.assertEqual(list(profiler.profiles), ["load", "parse", "ground", "cnf", "solve"])
+        self.assertIn("assign_and_enforce_type", {name.split(" ")[0] for name, *_ in profiler.top_functions(50)})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = profiler.write(tmp)
+            for stage in ["parse", "ground", "cnf", "solve"]:
+                self.assertIn(os.path.join(tmp, f"{stage}.pstats"), paths)
+                self.assertGreater(pstats.Stats(os.path.join(tmp, f"{stage}.pstats")).total_calls, 0)
+            with open(os.path.join(tmp, COLLAPSED_FILE), encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        self.assertTrue(lines)
+        for line in lines:
+            stack, micros = line.rsplit(" ", 1)
+            self.assertIn(stack.split(";")[0], profiler.profiles)
+            self.assertGreater(int(micros), 0)
+        self.assertTrue(any(line.startswith("cnf;cnf_stage (pipeline.py") for line in lines))
+
+
+class TestProfileFlag(unittest.TestCase):
+
+    def tearDown(self):
+        configure(logging.WARNING, stream=io.StringIO())
+
+    def test_init_profile(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data = os.path.join(tmp, "folio.txt")
+            with open(data, "w", encoding="utf-8") as f:
+                f.write("premises\tpremises-FOL\tconclusion\tconclusion-FOL\tlabel\n")
+                f.write("['x']\t['∀x (Dog(x) → Animal(x))', 'Dog(rex)']\tc\tAnimal(rex)\tTrue\n" * 2)
+            out_dir = os.path.join(tmp, "profile")
+            with redirect_stdout(io.StringIO()) as out:
+                init.main(["--data", data, "--quiet", "--profile", out_dir])
+            self.assertTrue(os.path.exists(os.path.join(out_dir, "solve.pstats")))
+            self.assertTrue(os.path.exists(os.path.join(out_dir, COLLAPSED_FILE)))
+        self.assertIn("Top 15 functions by self time", out.getvalue())
+
+    def test_profile_needs_inline_run(self):
+        with self.assertRaises(SystemExit), redirect_stderr(io.StringIO()):
+            init.parse_args(["--profile", "--workers", "2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from itertools import combinations
+
+from query_client import QueryClient
+from query_server import QueryServer
+
+
+PIGEONS = "abcdefghij"
+HOLES = "klmnopqrs"
+
+
+def pigeonhole_request():
+    """10 pigeons, 9 holes: unsatisfiable premises, tens of seconds for Glucose."""
+    premises = ["∨".join(f"P{p}{h}" for h in HOLES) for p in PIGEONS]
+    premises += ["∧".join(f"~(P{p}{h}∧P{q}{h})" for p, q in combinations(PIGEONS, 2)) for h in HOLES]
+    return {"id": "hard", "premises": premises, "conclusion": "Qa"}
+
+
+class TestQueryServerRequests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = QueryServer(workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.close()
+
+    def ask(self, request):
+        line = request if isinstance(request, str) else json.dumps(request)
+        return asyncio.run(self.server.handle_line(line))
+
+    def test_valid_argument(self):
+        response = self.ask({"id": 1, "premises": ["∀x(Px→Qx)", "Pa"], "conclusion": "Qa"})
+        self.assertEqual(response["id"], 1)
+        self.assertTrue(response["valid"])
+        self.assertEqual(response["label"], "valid")
+        self.assertIsNone(response["counterexample"])
+        self.assertIsNone(response["error"])
+
+    def test_invalid_argument_has_counterexample(self):
+        response = self.ask({"id": 2, "premises": ["Pa"], "conclusion": "Qa"})
+        self.assertFalse(response["valid"])
+        self.assertEqual(response["counterexample"], {"Qa": False})
+
+        response = self.ask({"id": 3, "premises": ["Pa"], "conclusion": "Qa", "counterexample": False})
+        self.assertFalse(response["valid"])
+        self.assertIsNone(response["counterexample"])
+
+    def test_repeated_query_is_cached(self):
+        request = {"premises": ["Ra∧Rb", "∀x(Rx→Sx)"], "conclusion": "Sb"}
+        first = self.ask(dict(request, id="a"))
+        second = self.ask(dict(request, id="b"))
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        self.assertEqual(second["id"], "b")
+        self.assertEqual(first["valid"], second["valid"])
+
+    def test_options_are_part_of_the_cache_key(self):
+        request = {"premises": ["Ta→Ua", "Ta"], "conclusion": "Ua"}
+        self.ask(dict(request, encoding="definitional"))
+        self.assertFalse(self.ask(dict(request, encoding="direct"))["cached"])
+        self.assertTrue(self.ask(dict(request, encoding="definitional"))["cached"])
+
+    def test_argument_errors_are_reported(self):
+        response = self.ask({"id": 4, "premises": ["Pa→"], "conclusion": "Qa"})
+        self.assertFalse(response["solvable"])
+        self.assertIn("parse", response["error"])
+
+        response = self.ask({"id": 5, "premises": ["(Pa∨Pb)∧(Pc∨Pd)∧(Pe∨Pf)"], "conclusion": "Pa",
+                             "encoding": "direct", "max_clauses": 2})
+        self.assertFalse(response["solvable"])
+        self.assertIsNotNone(response["error"])
+
+    def test_bad_requests(self):
+        for line in ["not json", "[1, 2]",
+                     json.dumps({"id": 6, "premises": "Pa", "conclusion": "Qa"}),
+                     json.dumps({"id": 7, "premises": ["Pa"]}),
+                     json.dumps({"id": 8, "premises": ["Pa"], "conclusion": "Qa", "encoding": "nope"}),
+                     json.dumps({"id": 9, "op": "shutdown"})]:
+            with self.subTest(line=line):
+                self.assertTrue(self.ask(line)["error"].startswith("bad request"))
+
+    def test_ping_and_stats(self):
+        self.assertTrue(self.ask({"id": 10, "op": "ping"})["ok"])
+        stats = self.ask({"id": 11, "op": "stats"})["stats"]
+        self.assertGreater(stats["requests"], 0)
+        self.assertIn("results", stats)
+        self.assertIn("grounding", stats)
+
+
+class TestQueryServerCancellation(unittest.TestCase):
+
+    def test_cancelled_request_interrupts_solver(self):
+        server = QueryServer(workers=1)
+        try:
+            async def run():
+                task = asyncio.ensure_future(server.handle(pigeonhole_request()))
+                await asyncio.sleep(0.5)
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+                return await server.handle({"id": 1, "premises": ["Pa"], "conclusion": "Pa"})
+
+            start = time.perf_counter()
+            response = asyncio.run(run())
+            # The single worker was freed by the interrupt, not by the solve finishing
+            self.assertLess(time.perf_counter() - start, 10)
+            self.assertTrue(response["valid"])
+        finally:
+            server.close()
+
+
+class TestQueryServerTransports(unittest.TestCase):
+
+    def serve_unix(self, server):
+        """Serves `server` on a fresh socket in a background event loop; returns its path."""
+        path = os.path.join(tempfile.mkdtemp(), "query.sock")
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        async def serve():
+            listening = asyncio.Event()
+            task = asyncio.ensure_future(server.serve_unix(path, listening))
+            await listening.wait()
+            ready.set()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        thread = threading.Thread(target=lambda: loop.run_until_complete(serve()), daemon=True)
+        thread.start()
+
+        def stop():
+            for task in asyncio.all_tasks(loop):
+                loop.call_soon_threadsafe(task.cancel)
+            thread.join(30)
+            loop.close()
+            server.close()
+        self.addCleanup(stop)
+        self.assertTrue(ready.wait(30))
+        return path
+
+    def test_unix_socket_round_trip(self):
+        path = self.serve_unix(QueryServer(workers=2, concurrency=4))
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+        arguments = [([f"P{c}", "∀x(Px→Qx)"], f"Q{c}") for c in "abcdefgh"]
+        arguments += [([f"P{c}"], f"Q{c}") for c in "abcdefgh"]
+        with QueryClient.connect(path, timeout=30) as client:
+            self.assertTrue(client.ping())
+            results = client.check_many(arguments, window=5)
+            self.assertEqual([r["valid"] for r in results], [True] * 8 + [False] * 8)
+            self.assertTrue(client.check(["Pa", "∀x(Px→Qx)"], "Qa")["cached"])
+            self.assertGreaterEqual(client.stats()["results"]["hits"], 1)
+        self.doCleanups()
+        self.assertFalse(os.path.exists(path))
+
+    def test_disconnect_cancels_in_flight_solves(self):
+        path = self.serve_unix(QueryServer(workers=1))
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+            sock.sendall(json.dumps(pigeonhole_request()).encode("utf-8") + b"\n")
+            time.sleep(0.5)
+
+        start = time.perf_counter()
+        with QueryClient.connect(path, timeout=30) as client:
+            self.assertTrue(client.check(["Pa"], "Pa")["valid"])
+        # The single worker was freed by the interrupt, not by the solve finishing
+        self.assertLess(time.perf_counter() - start, 10)
+
+    def test_stdio_round_trip(self):
+        with QueryClient.spawn(["--workers", "2"]) as client:
+            self.assertTrue(client.check(["∀x(Px→Qx)", "Pa"], "Qa")["valid"])
+            self.assertEqual(client.request({"op": "nope"})["error"], "bad request: unknown op 'nope'")
+            self.assertEqual(client.stats()["requests"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
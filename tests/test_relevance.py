@@ -0,0 +1,71 @@
+import unittest
+from WFFs.strictWFFs import StrictWFF, string_to_WFF
+from argument import Argument
+from relevance import filter_relevant_premises
+from constants import NOT
+
+
+def negate(s):
+    return StrictWFF(operator=NOT, operand1=string_to_WFF(s))
+
+
+class TestPredicatePolarities(unittest.TestCase):
+
+    def test_implication_flips_antecedent(self):
+        wff = string_to_WFF("∀x(Px→Qx)")
+        self.assertEqual(wff.get_predicate_polarities(), {"P": {False}, "Q": {True}})
+
+    def test_xor_has_both_polarities(self):
+        wff = string_to_WFF("Pa⊕Qa")
+        self.assertEqual(wff.get_predicate_polarities(), {"P": {True, False}, "Q": {True, False}})
+
+    def test_negation_flips(self):
+        wff = string_to_WFF("~(Pa∧~Qa)")
+        self.assertEqual(wff.get_predicate_polarities(), {"P": {False}, "Q": {True}})
+
+
+class TestFilterRelevantPremises(unittest.TestCase):
+
+    def test_disconnected_pure_premise_dropped(self):
+        premises = [string_to_WFF("∀x(Px→Qx)"), string_to_WFF("Pa"), string_to_WFF("∀x(Rx→Sx)")]
+        kept, dropped = filter_relevant_premises(premises, negate("Qa"))
+        self.assertEqual([repr(p) for p in kept], [repr(premises[0]), repr(premises[1])])
+        self.assertEqual(dropped, [premises[2]])
+
+    def test_connected_through_chain_kept(self):
+        premises = [string_to_WFF("∀x(Px→Qx)"), string_to_WFF("∀x(Rx→Px)"), string_to_WFF("Ra")]
+        kept, dropped = filter_relevant_premises(premises, negate("Qa"))
+        self.assertEqual(len(kept), 3)
+        self.assertEqual(dropped, [])
+
+    def test_disconnected_contradiction_kept(self):
+        """R and ~R together are unsatisfiable, so they must stay (explosion)."""
+        premises = [string_to_WFF("Pa"), string_to_WFF("Ra"), string_to_WFF("~Rb")]
+        kept, dropped = filter_relevant_premises(premises, negate("Qa"))
+        self.assertEqual(kept, premises[1:])
+        self.assertEqual(dropped, [premises[0]])
+
+
+class TestArgumentFiltering(unittest.TestCase):
+
+    def test_filtered_argument_keeps_result(self):
+        premises = ["∀x(Px→Qx)", "Pa", "∀x(Rx→Sx)", "Sb"]
+        filtered = Argument(premises, "Qa")
+        unfiltered = Argument(premises, "Qa", filter_premises=False)
+        self.assertEqual(len(filtered.dropped_premises), 2)
+        self.assertEqual(sorted(filtered.domain), sorted(unfiltered.domain))
+
+        filtered.expand_quantifiers()
+        unfiltered.expand_quantifiers()
+        self.assertEqual(filtered.solve()[0], unfiltered.solve()[0])
+        self.assertTrue(filtered.solve()[0])
+
+    def test_explosion_still_valid(self):
+        arg = Argument(["Ra", "~Ra", "Pb"], "Qa")
+        arg.expand_quantifiers()
+        self.assertEqual([repr(p) for p in arg.dropped_premises], ["Pb"])
+        self.assertTrue(arg.solve()[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+from functools import partial
+
+from pipeline import Pipeline, Stage, default_stages, records_from_arguments
+from result_cache import ResultCache, argument_key, lookup_stage, store_stage
+
+
+ARGUMENTS = [(["∀x(Ax→Bx)", "Aa"], "Ba"), (["∀x(Ax→Bx)", "Ab"], "Ba")]
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache", "results.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_cached(self, cache, arguments=ARGUMENTS, **kwargs):
+        records = records_from_arguments(arguments, instrument=True, **kwargs)
+        records = Stage("lookup", partial(lookup_stage, cache)).run(records)
+        results = Pipeline(default_stages()).run(records)
+        return list(Stage("store", partial(store_stage, cache)).run(results))
+
+    def test_key_ignores_formatting_but_not_config(self):
+        key = argument_key(["∀x(Ax→Bx)", "Aa"], "Ba")
+        self.assertEqual(key, argument_key(["∀x((Ax → Bx))", "(Aa)"], "Ba"))
+        self.assertNotEqual(key, argument_key(["∀x(Ax→Bx)", "Aa"], "Bb"))
+        self.assertNotEqual(key, argument_key(["∀x(Ax→Bx)", "Aa"], "Ba", {"encoding": "direct"}))
+
+    def test_rerun_reuses_stored_results(self):
+        with ResultCache(self.path) as cache:
+            first = self.run_cached(cache)
+            self.assertEqual(len(cache), 2)
+        with ResultCache(self.path) as cache:
+            second = self.run_cached(cache)
+            self.assertEqual(cache.stats()["hits"], 2)
+        self.assertTrue(all(r.get("cached") for r in second))
+        self.assertEqual([r["is_valid"] for r in first], [r["is_valid"] for r in second])
+        self.assertEqual(second[1]["counterexample"], first[1]["counterexample"])
+        self.assertIn("solve", second[0]["timings"])
+        self.assertNotIn("argument", second[0])
+
+    def test_changed_config_is_solved_again(self):
+        with ResultCache(self.path) as cache:
+            self.run_cached(cache)
+            results = self.run_cached(cache, encoding="definitional")
+        self.assertFalse(any(r.get("cached") for r in results))
+
+    def test_version_change_invalidates(self):
+        with ResultCache(self.path, version=1) as cache:
+            self.run_cached(cache)
+        with ResultCache(self.path, version=1) as cache:
+            self.assertEqual(len(cache), 2)
+        with ResultCache(self.path, version=2) as cache:
+            self.assertEqual(len(cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
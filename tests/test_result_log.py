@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+import unittest
+from functools import partial
+
+from parallel import evaluate_parallel
+from pipeline import Pipeline, Stage, default_stages, records_from_arguments
+from result_log import ResultLog, log_stage, result_row
+from constants import VALID, INVALID
+
+
+ARGUMENTS = [(["∀x(Ax→Bx)", "Aa"], "Ba"), (["∀x(Ax→Bx)", "Ab"], "Ba"), (["P→Q", "P"], "Q")]
+LABELS = [VALID, VALID, VALID]
+
+
+def read_rows(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestResultLog(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "logs", "results.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def solved(self):
+        records = records_from_arguments(ARGUMENTS, LABELS, instrument=True)
+        return list(Pipeline(default_stages()).run(records))
+
+    def test_row_contents(self):
+        row = result_row(self.solved()[1])
+        self.assertEqual((row["id"], row["expected"], row["computed"], row["match"]), (2, VALID, INVALID, False))
+        self.assertIn("solve", row["timings"])
+        self.assertGreater(row["counts"]["clauses"], 0)
+        self.assertGreater(row["counts"]["variables"], 0)
+        self.assertFalse(row["counterexample"]["Ba"])
+        self.assertNotIn("counterexample", result_row(self.solved()[1], counterexample=False))
+
+    def test_rows_written_in_batches(self):
+        log = ResultLog(self.path, batch_size=2)
+        for record in self.solved():
+            log.write(record)
+        self.assertEqual(len(read_rows(self.path)), 2)
+        log.close()
+        self.assertEqual([row["id"] for row in read_rows(self.path)], [1, 2, 3])
+        self.assertEqual(log.rows_written, 3)
+
+    def test_rotation_splits_between_batches(self):
+        with ResultLog(self.path, batch_size=1, max_bytes=1) as log:
+            for record in self.solved():
+                log.write(record)
+        self.assertEqual([row["id"] for row in read_rows(self.path)], [3])
+        self.assertEqual([row["id"] for row in read_rows(self.path + ".1")], [2])
+        self.assertEqual([row["id"] for row in read_rows(self.path + ".2")], [1])
+
+    def test_backup_count(self):
+        with ResultLog(self.path, batch_size=1, max_bytes=1, backup_count=1) as log:
+            for record in self.solved():
+                log.write(record)
+        self.assertFalse(os.path.exists(self.path + ".2"))
+        self.assertEqual([row["id"] for row in read_rows(self.path + ".1")], [2])
+
+    def test_parallel_driver_keeps_order(self):
+        arguments = ARGUMENTS * 5
+        records = records_from_arguments(arguments, LABELS * 5, instrument=True)
+        with ResultLog(self.path, batch_size=4) as log:
+            results = evaluate_parallel(records, workers=2, chunksize=1)
+            list(Stage("log", partial(log_stage, log)).run(results))
+        rows = read_rows(self.path)
+        self.assertEqual([row["id"] for row in rows], list(range(1, len(arguments) + 1)))
+        self.assertTrue(all(row["timings"] for row in rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
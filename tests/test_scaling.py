@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+
+from benchmarks.scaling import fit_growth, run_sweep, main
+
+
+class TestFitGrowth(unittest.TestCase):
+
+    def test_recovers_power_law(self):
+        xs = [10, 20, 40, 80, 160]
+        fit = fit_growth(xs, [3 * x ** 2 for x in xs])
+        self.assertAlmostEqual(fit["power_exponent"], 2.0, places=6)
+        self.assertEqual(fit["best"], "power")
+
+    def test_recovers_exponential(self):
+        xs = [1, 2, 3, 4, 5, 6, 7, 8]
+        fit = fit_growth(xs, [2 ** x for x in xs])
+        self.assertAlmostEqual(fit["exp_base"], 2.0, places=6)
+        self.assertEqual(fit["best"], "exponential")
+
+    def test_needs_two_points(self):
+        with self.assertRaises(ValueError):
+            fit_growth([1], [1])
+
+
+class TestComplexityBounds(unittest.TestCase):
+
+    # Growth is asserted on the exact node/clause counts; wall-clock fits on inputs this
+    # small are too noisy on shared machines and are only reported
+
+    def assertAffine(self, result):
+        """Sizes lie exactly on a line through the sweep's points: linear growth."""
+        xs = [p[result["param"]] for p in result["points"]]
+        sizes = [p["size"] for p in result["points"]]
+        slopes = {(b - a) / (x1 - x0) for x0, x1, a, b in zip(xs, xs[1:], sizes, sizes[1:])}
+        self.assertEqual(len(slopes), 1, sizes)
+        self.assertIn("time", result["fits"])
+
+    def test_parser_is_linear(self):
+        result = run_sweep("parse_length", values=[60, 120, 240, 480], repeat=1, memory=False)
+        self.assertAffine(result)
+        self.assertAlmostEqual(result["fits"]["size"]["power_exponent"], 1.0, places=2)
+
+    def test_grounding_size_is_polynomial_in_domain(self):
+        # nested_quantifiers grounds to (domain + depth) ** depth instances: depth 2 here
+        result = run_sweep("ground_domain", values=[4, 8, 16], repeat=1, memory=False)
+        self.assertLess(result["fits"]["size"]["power_exponent"], 2.1)
+
+    def test_grounding_size_is_exponential_in_depth(self):
+        result = run_sweep("ground_depth", values=[1, 2, 3, 4], repeat=1, memory=False)
+        sizes = [p["size"] for p in result["points"]]
+        self.assertTrue(all(b > 4 * a for a, b in zip(sizes, sizes[1:])), sizes)
+        self.assertEqual(result["fits"]["size"]["best"], "exponential")
+
+    def test_distribution_clause_count(self):
+        result = run_sweep("distribute_terms", values=[2, 3, 4, 5], repeat=1, memory=False)
+        self.assertEqual([p["size"] for p in result["points"]], [4, 8, 16, 32])
+
+    def test_definitional_cnf_is_linear(self):
+        result = run_sweep("definitional_terms", values=[3, 6, 12, 24], repeat=1, memory=False)
+        self.assertAffine(result)
+
+    def test_chain_cnf_is_linear(self):
+        result = run_sweep("cnf_length", values=[4, 8, 12, 16], repeat=1, memory=False)
+        self.assertLess(result["fits"]["size"]["power_exponent"], 1.1)
+
+
+class TestScalingCli(unittest.TestCase):
+
+    def test_writes_table_and_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            main(["--output-dir", tmp, "--sweep", "distribute_terms", "--repeat", "1", "--no-memory"])
+            self.assertTrue(os.path.exists(os.path.join(tmp, "scaling.json")))
+            with open(os.path.join(tmp, "scaling.md"), encoding="utf-8") as f:
+                self.assertIn("distribute_terms", f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from constants import AND, IMPLIES, NOT
+from WFFs.strictWFFs import StrictWFF, FrozenStrictWFF, string_to_WFF, freeze, serialize
+from WFFs.cnfWFFs import CnfWFF
+from WFFs.WFF_conversion import strict_to_cnf
+
+
+def chain(depth: int, cls=StrictWFF) -> StrictWFF:
+    """(P0 → (P1 → ... (Pn-1 → ~Q)...)) built bottom-up, without the recursive parser."""
+    wff = cls(operator=NOT, operand1=cls(atom="Q"))
+    for i in reversed(range(depth)):
+        wff = cls(operator=IMPLIES, operand1=cls(atom=f"P{i}"), operand2=wff)
+    return wff
+
+
+class TestSerialization(unittest.TestCase):
+
+    def test_readable_form(self):
+        self.assertEqual(repr(string_to_WFF("∀x(Px→~Qx)")), "∀x((Px → (~Qx)))")
+        self.assertEqual(repr(string_to_WFF("(~Pa∧∃y1(Ray1))")), "((~Pa) ∧ ∃y1(Ray1))")
+        self.assertEqual(repr(chain(2)), "(P0 → (P1 → (~Q)))")
+
+    def test_compact_form(self):
+        wff = string_to_WFF("∀x ( Px → ~ Qx )")
+        self.assertEqual(wff.canonical_text(), "∀x((Px→~Qx))")
+        self.assertEqual(serialize(wff, compact=True), wff.canonical_text())
+
+    def test_compact_form_parses_back(self):
+        for s in ["∀x(Px→∃y(Rxy∧~Qy))", "~~Pa", "~(Pa⊕Qb)", "(~∀x(Px)∨Qa)", "((Pa∧Qb)∧Rc)"]:
+            wff = string_to_WFF(s)
+            self.assertEqual(repr(string_to_WFF(wff.canonical_text())), repr(wff), s)
+
+    def test_deep_chain(self):
+        wff = chain(20000)
+        text = repr(wff)
+        self.assertTrue(text.startswith("(P0 → (P1 → "))
+        self.assertTrue(text.endswith("(~Q)" + ")" * 20000))
+        self.assertEqual(wff.canonical_text(), text.replace(" ", "").replace("(~Q)", "~Q"))
+
+        frozen = chain(20000, FrozenStrictWFF)
+        self.assertEqual(repr(frozen), text)
+        self.assertEqual(frozen, chain(20000, FrozenStrictWFF))
+        self.assertNotEqual(frozen, chain(19999, FrozenStrictWFF))
+        self.assertEqual(len({frozen, chain(20000, FrozenStrictWFF)}), 1)
+
+    def test_frozen_text_is_cached(self):
+        wff = freeze(string_to_WFF("(Pa→(Qb∧Rc))"))
+        self.assertIs(repr(wff), repr(wff))
+        self.assertIs(wff.canonical_text(), wff.canonical_text())
+        self.assertNotIn("_cached_repr", wff.operand1.__dict__)
+
+    def test_cached_subtrees_are_reused(self):
+        shared = freeze(string_to_WFF("(Qb∧Rc)"))
+        object.__setattr__(shared, "_cached_repr", "<shared>")
+        wff = FrozenStrictWFF(operator=AND, operand1=FrozenStrictWFF(atom="Pa"), operand2=shared)
+        self.assertEqual(repr(wff), "(Pa ∧ <shared>)")
+
+    def test_mutable_wff_is_not_cached(self):
+        wff = string_to_WFF("∀x(Px)")
+        before = repr(wff)
+        wff.expand_quantifiers(["a", "b"])
+        self.assertNotEqual(repr(wff), before)
+        self.assertEqual(repr(wff), "(Pa ∧ Pb)")
+
+    def test_cnf_forms(self):
+        cnf = strict_to_cnf(string_to_WFF("(Pa⊕Qb)"))
+        self.assertEqual(repr(cnf), "((Pa ∨ Qb) ∧ (~Pa ∨ ~Qb))")
+        self.assertEqual(cnf.canonical_text(), "((Pa∨Qb)∧(~Pa∨~Qb))")
+        self.assertEqual(repr(CnfWFF(operator=NOT, operands=[CnfWFF(atom="Pa")])), "~Pa")
+
+
+if __name__ == "__main__":
+    unittest.main()
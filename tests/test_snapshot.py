@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+
+from get_data import iter_folio_data
+from pipeline import records_from_folio
+from snapshot import Snapshot, build_snapshot, open_snapshot
+
+
+HEADER = "premises\tpremises-FOL\tconclusion\tconclusion-FOL\tlabel\n"
+ROWS = [
+    "['x']\t['∀x (Dog(x) → Animal(x))', 'Dog(rex)']\tc\tAnimal(rex)\tTrue\n",
+    "['x']\t['∀x (Cat(x) → Pet(x))', 'Cat(tom)']\tc\tPet(rex)\tFalse\n",
+    "\n",
+    "['x']\t['Likes(ann, bob)']\tc\tLikes(bob, ann)\tUnknown\n",
+]
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "folio.txt")
+        self.path = os.path.join(self.tmp.name, "cache", "folio.snapshot")
+        self.write_source(ROWS)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_source(self, rows):
+        with open(self.source, "w", encoding="utf-8") as f:
+            f.write(HEADER + "".join(rows))
+
+    def test_snapshot_matches_streamed_entries(self):
+        self.assertEqual(build_snapshot(self.source, self.path), 3)
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(list(snapshot), list(iter_folio_data(self.source)))
+
+    def test_random_access_by_example_id(self):
+        build_snapshot(self.source, self.path)
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 3)
+            self.assertEqual(snapshot[3]["premises"], ["Aab"])
+            self.assertEqual(snapshot[1]["map"], {"A": "Dog", "B": "Animal", "a": "rex"})
+            with self.assertRaises(KeyError):
+                snapshot[4]
+
+    def test_changed_source_is_rebuilt(self):
+        open_snapshot(self.source, self.path).close()
+        self.write_source(ROWS[:1])
+        os.utime(self.source, ns=(0, 0))
+        with open_snapshot(self.source, self.path) as snapshot:
+            self.assertFalse(snapshot.is_stale(self.source))
+            self.assertEqual(len(snapshot), 1)
+
+    def test_rejects_other_files(self):
+        with self.assertRaises(ValueError):
+            Snapshot(self.source)
+
+    def test_records_from_snapshot(self):
+        streamed = list(records_from_folio(self.source))
+        self.assertEqual(list(records_from_folio(self.source, snapshot=self.path)), streamed)
+
+
+if __name__ == "__main__":
+    unittest.main()
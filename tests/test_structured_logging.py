@@ -0,0 +1,113 @@
+import io
+import json
+import logging
+import os
+import tempfile
+import unittest
+from contextlib import ExitStack, redirect_stdout
+from unittest import mock
+
+import init
+from argument import Argument
+from pipeline import Pipeline, default_stages, records_from_arguments
+from structured_logging import LOGGER_ROOT, JsonFormatter, configure, fields, get_logger, lazy, DEBUG, INFO
+from WFFs.cnfWFFs import CnfWFF
+from WFFs.strictWFFs import FrozenStrictWFF, StrictWFF
+
+
+HEADER = "premises\tpremises-FOL\tconclusion\tconclusion-FOL\tlabel\n"
+ROW = "['x']\t['∀x (Dog(x) → Animal(x))', 'Dog(rex)']\tc\tAnimal(rex)\tTrue\n"
+
+
+class TestStructuredLogging(unittest.TestCase):
+
+    def setUp(self):
+        self.stream = io.StringIO()
+
+    def tearDown(self):
+        configure(logging.WARNING, stream=io.StringIO())
+
+    def test_lazy_is_only_rendered_when_emitted(self):
+        configure(INFO, stream=self.stream)
+        render = mock.Mock(return_value="rendered")
+        get_logger("test").debug("%s", lazy(render))
+        render.assert_not_called()
+        get_logger("test").info("%s", lazy(render))
+        render.assert_called_once()
+        self.assertEqual(self.stream.getvalue(), "rendered\n")
+
+    def test_module_loggers_are_named_after_their_files(self):
+        import argument
+        import query_server
+        for module in (init, argument, query_server):
+            name = os.path.splitext(os.path.basename(module.__file__))[0]
+            self.assertEqual(module.logger.name, f"{LOGGER_ROOT}.{name}")
+
+    def test_json_fields(self):
+        configure(INFO, stream=self.stream, json_format=True)
+        get_logger("test").info("solved %d", 3, extra=fields(id=3, match=True))
+        entry = json.loads(self.stream.getvalue())
+        self.assertEqual((entry["message"], entry["id"], entry["match"]), ("solved 3", 3, True))
+        self.assertEqual(entry["logger"], f"{LOGGER_ROOT}.test")
+
+    def test_debug_logs_formulas(self):
+        configure(DEBUG, stream=self.stream)
+        Argument(["P→Q", "P"], "Q").solve()
+        self.assertIn("Validity WFF: (((P → Q) ∧ P) ∧ (~Q))", self.stream.getvalue())
+
+    def test_debug_cnf_clauses_are_logged_not_printed(self):
+        argument = Argument(["P→Q", "P"], "Q")
+        configure(INFO, stream=self.stream)
+        with redirect_stdout(io.StringIO()) as out:
+            argument.to_cnf(debug=True)
+        self.assertEqual((out.getvalue(), self.stream.getvalue()), ("", ""))
+
+        configure(DEBUG, stream=self.stream)
+        with redirect_stdout(io.StringIO()) as out:
+            argument.to_cnf(debug=True)
+        self.assertEqual(out.getvalue(), "")
+        self.assertIn("CNF conversion result:\n  ", self.stream.getvalue())
+
+
+def patch_reprs(stack: ExitStack) -> list:
+    """Makes __repr__ of every formula class (frozen ones override it) raise; returns the mocks."""
+    return [stack.enter_context(mock.patch.object(cls, "__repr__", side_effect=AssertionError("repr called")))
+            for cls in (StrictWFF, FrozenStrictWFF, CnfWFF)]
+
+
+class TestNoFormattingWhenQuiet(unittest.TestCase):
+    """The non-verbose path must never build formula strings."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data = os.path.join(self.tmp.name, "folio.txt")
+        with open(self.data, "w", encoding="utf-8") as f:
+            f.write(HEADER + ROW * 3)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        configure(logging.WARNING, stream=io.StringIO())
+
+    def test_pipeline_never_calls_repr(self):
+        configure(INFO, stream=io.StringIO())
+        with ExitStack() as stack:
+            reprs = patch_reprs(stack)
+            records = records_from_arguments([(["∀x(Ax→Bx)", "Aa"], "Ba"), (["P→Q", "P"], "Q")])
+            results = list(Pipeline(default_stages()).run(records))
+        for wff_repr in reprs:
+            wff_repr.assert_not_called()
+        self.assertEqual([r["is_valid"] for r in results], [True, True])
+
+    def test_init_non_verbose_never_calls_repr(self):
+        with ExitStack() as stack:
+            stack.enter_context(mock.patch.object(init, "VERBOSE_MODE", False))
+            reprs = patch_reprs(stack)
+            out = stack.enter_context(redirect_stdout(io.StringIO()))
+            init.main(["--data", self.data, "--all"])
+        for wff_repr in reprs:
+            wff_repr.assert_not_called()
+        self.assertIn("Argument #03", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+from pipeline import Pipeline, default_stages
+from synthetic import (
+    generate, as_argument, brute_force_label, ground_atom,
+    implication_chain, nested_quantifiers, or_of_ands, connective_mix, random_kcnf, pigeonhole,
+)
+from constants import VALID, INVALID
+
+
+def pipeline_label(case):
+    result = next(Pipeline(default_stages()).run([dict(case)]))
+    return result.get("computed_label")
+
+
+class TestFamiliesMatchGroundTruth(unittest.TestCase):
+
+    def assertPipelineAgrees(self, case):
+        self.assertIsNotNone(case["label"])
+        self.assertEqual(pipeline_label(case), case["label"], msg=f"{case['family']} {case['params']}")
+
+    def test_quantified_families(self):
+        for valid in (True, False):
+            self.assertPipelineAgrees(implication_chain(premises=4, domain_size=2, valid=valid))
+            self.assertPipelineAgrees(nested_quantifiers(depth=2, domain_size=2, valid=valid))
+
+    def test_or_of_ands(self):
+        self.assertPipelineAgrees(or_of_ands(terms=3, width=3))
+
+    def test_connective_mix_seeds(self):
+        for seed in range(5):
+            self.assertPipelineAgrees(connective_mix(premises=3, atoms=5, depth=2, seed=seed))
+
+    def test_random_kcnf_seeds(self):
+        for seed in range(3):
+            self.assertPipelineAgrees(random_kcnf(variables=10, seed=seed))
+
+    def test_pigeonhole(self):
+        self.assertPipelineAgrees(pigeonhole(holes=3, extra_pigeons=1))
+        self.assertPipelineAgrees(pigeonhole(holes=3, extra_pigeons=0))
+
+
+class TestGenerator(unittest.TestCase):
+
+    def test_parameters_recorded(self):
+        case = generate("random_kcnf", variables=8, ratio=3.0, seed=7)
+        self.assertEqual(case["params"], {"variables": 8, "ratio": 3.0, "k": 3, "seed": 7})
+        self.assertEqual(len(case["premises"]), 24)
+
+    def test_seeded_generation_is_deterministic(self):
+        self.assertEqual(connective_mix(seed=3), connective_mix(seed=3))
+
+    def test_unknown_family(self):
+        with self.assertRaises(ValueError):
+            generate("nope")
+
+    def test_out_of_range_parameter(self):
+        with self.assertRaises(ValueError):
+            nested_quantifiers(depth=7)
+
+    def test_ground_atoms(self):
+        self.assertEqual(ground_atom(0), "Aa")
+        self.assertEqual(ground_atom(21), "Bb")
+
+    def test_as_argument(self):
+        self.assertEqual(len(as_argument(pigeonhole(holes=2)).premises), 5)
+
+    def test_brute_force_label(self):
+        self.assertEqual(brute_force_label(["(Aa→Ba)", "Aa"], "Ba"), VALID)
+        self.assertEqual(brute_force_label(["(Aa→Ba)", "Ba"], "Aa"), INVALID)
+
+
+if __name__ == "__main__":
+    unittest.main()